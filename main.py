@@ -1,15 +1,22 @@
-from src.gui.app import WhiteboardApp
+import time
+# Taken before the heavy imports so the startup log covers them
+LAUNCH_TIME = time.perf_counter()
+
+from src.gui.app import StartupTimer, WhiteboardApp
 from PyQt6.QtWidgets import QApplication
 import sys
 
 
 def launch_whiteboard_gui():
+    timer = StartupTimer(LAUNCH_TIME)
+    timer.mark("imports")
     existing = QApplication.instance()
     app = existing if existing is not None else QApplication(sys.argv)
-    window = WhiteboardApp()
+    window = WhiteboardApp(timer)
+    timer.mark("window built")
     window.run()
     return app.exec()
 
 
 if __name__ == "__main__":
-    sys.exit(launch_whiteboard_gui())
\ No newline at end of file
+    sys.exit(launch_whiteboard_gui())
@@ -0,0 +1,203 @@
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.detection.defaults import DEFAULT_DEDUP_RADIUS, MAX_DEDUP_RADIUS
+from src.detection.organizer import ORGANIZE_MODES
+
+# Exit codes, so cron jobs and scripts can tell failures apart
+EXIT_OK = 0
+EXIT_SCAN_FAILED = 1
+EXIT_USAGE = 2
+EXIT_FOLDER_NOT_FOUND = 3
+EXIT_MODEL_FAILED = 4
+EXIT_INTERRUPTED = 130
+
+DEFAULT_MODEL = "./runs/detect/train19/weights/best.pt"
+
+
+def _emit(record, stream):
+    stream.write(json.dumps(record) + "\n")
+    stream.flush()
+
+
+def _image_record(record):
+    return {
+        "type": "image",
+        "path": record["image_path"],
+        "detected": bool(record["confidences"]),
+        "max_confidence": round(record["max_confidence"], 4),
+        "confidences": [round(conf, 4) for conf in record["confidences"]],
+        "boxes": [[round(float(v), 1) for v in box] for box in record["boxes"]],
+        "cached": record["cached"],
+        "stage": record["stage"],
+        "duplicate_of": record["duplicate_of"],
+    }
+
+
+def _dedup_radius(value):
+    try:
+        radius = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a number of bits, got {value!r}") from None
+    if not 0 <= radius <= MAX_DEDUP_RADIUS:
+        raise argparse.ArgumentTypeError(f"must be between 0 and {MAX_DEDUP_RADIUS} (bits of 64)")
+    return radius
+
+
+def _fraction(value):
+    try:
+        fraction = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a fraction, got {value!r}") from None
+    if not 0.0 <= fraction <= 1.0:
+        raise argparse.ArgumentTypeError("must be between 0 and 1")
+    return fraction
+
+
+def _check_scan_args(parser, args):
+    """Reject option combinations argparse cannot express (exits with a usage error)."""
+    if args.dedup_verify is not None and args.dedup is None:
+        parser.error("--dedup-verify needs --dedup")
+    if args.adaptive is not None and args.workers:
+        parser.error("--adaptive runs in process only and cannot be combined with --workers")
+
+
+def _error(message, code, stream):
+    _emit({"type": "error", "message": message, "exit_code": code}, stream)
+    return code
+
+
+def scan(args, stream=sys.stdout):
+    """Run detection on a folder, streaming one JSON line per image and a final summary line."""
+    start = time.perf_counter()
+    if not os.path.isdir(args.folder):
+        return _error(f"Folder not found: {args.folder}", EXIT_FOLDER_NOT_FOUND, stream)
+    if not os.path.exists(args.model):
+        return _error(f"Model not found: {args.model}", EXIT_MODEL_FAILED, stream)
+    if not os.access(args.model, os.R_OK):
+        return _error(f"Model not readable: {args.model}", EXIT_MODEL_FAILED, stream)
+
+    # stdout carries only the JSON lines; library messages (and ultralytics, imported from
+    # here on, which logs to the stdout it sees) go to stderr
+    with contextlib.redirect_stdout(sys.stderr):
+        return _scan(args, stream, start)
+
+
+def _scan(args, stream, start):
+    # Detection modules are imported only once the arguments are known to be valid
+    from src.detection.backends import ModelLoadError
+    from src.detection.detection_module import DetectionSummary, iter_detections, organize_detected_images
+
+    kwargs = {
+        "model_path": args.model,
+        "conf_threshold": args.conf,
+        "batch_size": args.batch,
+        "imgsz": args.imgsz,
+        "prefetch_workers": args.prefetch,
+        "reduced_decode": args.reduced_decode,
+        "recursive": not args.no_recursive,
+        "workers": args.workers,
+        "threads_per_worker": args.threads,
+        "backend": args.backend,
+    }
+    if args.cache or args.cache_in_folder:
+        from src.detection.result_cache import DetectionCache, folder_cache_path
+        kwargs["cache"] = DetectionCache(args.cache or folder_cache_path(args.folder))
+    if args.cascade:
+        from src.detection.cascade import Cascade
+        kwargs["cascade"] = Cascade(args.cascade)
+    if args.dedup is not None:
+        from src.detection.dedup import DuplicateFilter
+        kwargs["dedup"] = DuplicateFilter(args.dedup, args.dedup_verify or 0.0)
+    if args.adaptive is not None:
+        from src.detection.adaptive import AdaptiveResolution
+        kwargs["adaptive"] = AdaptiveResolution.for_model(args.model, args.adaptive or None)
+
+    summary = DetectionSummary()
+    try:
+        for record in iter_detections(args.folder, summary=summary, **kwargs):
+            _emit(_image_record(record), stream)
+    except ModelLoadError as e:
+        # Models load on the first cache miss (in each worker with --workers), so this can come mid-scan
+        return _error(f"Model failed to load: {e}", EXIT_MODEL_FAILED, stream)
+    except Exception as e:
+        return _error(f"Scan failed: {e}", EXIT_SCAN_FAILED, stream)
+
+    organized = {"moved": 0, "renamed": {}, "failed": []}
+    if args.move and summary.detected_images:
+        try:
+            organized = organize_detected_images(summary.detected_images, args.folder, args.organize)
+        except Exception as e:
+            return _error(f"Moving detected photos failed: {e}", EXIT_SCAN_FAILED, stream)
+    stats = summary.stats()
+    _emit({"type": "summary", "stats": stats, "moved": organized["moved"], "renamed": organized["renamed"],
+           "failed": [{"path": path, "error": str(error)} for path, error in organized["failed"]],
+           "elapsed": round(time.perf_counter() - start, 3)}, stream)
+    return EXIT_OK
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="whiteboard-detect",
+                                     description="Detect whiteboard photos without the GUI.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    scan_parser = commands.add_parser("scan", help="Scan a folder and print one JSON line per image")
+    scan_parser.add_argument("folder", help="Folder of photos to scan")
+    scan_parser.add_argument("--model", default=DEFAULT_MODEL, help="Detector weights (.pt or .onnx)")
+    scan_parser.add_argument("--conf", type=float, default=0.5, help="Confidence threshold (default 0.5)")
+    scan_parser.add_argument("--batch", type=int, default=8, help="Images per forward pass (default 8)")
+    scan_parser.add_argument("--workers", type=int, default=0,
+                             help="Worker processes with their own model (0 = in process, default)")
+    scan_parser.add_argument("--threads", type=int, default=None, help="Torch threads per worker process")
+    scan_parser.add_argument("--prefetch", type=int, default=0, help="Decode threads ahead of inference")
+    scan_parser.add_argument("--imgsz", type=int, default=None, help="Inference size (default: model's)")
+    scan_parser.add_argument("--backend", choices=("torch", "onnx", "openvino"), default="torch",
+                             help="Inference runtime (exported models are cached next to the weights)")
+    scan_parser.add_argument("--reduced-decode", action="store_true",
+                             help="Decode large JPEGs at reduced scale (faster)")
+    scan_parser.add_argument("--no-recursive", action="store_true", help="Do not scan subfolders")
+    cache_group = scan_parser.add_mutually_exclusive_group()
+    cache_group.add_argument("--cache", metavar="DB", help="SQLite result cache; unchanged photos are not re-inferred")
+    cache_group.add_argument("--cache-in-folder", action="store_true",
+                             help="Keep the result cache beside the photos (.whiteboard-cache.sqlite3)")
+    scan_parser.add_argument("--cascade", metavar="CLASSIFIER", help="Classifier weights used as a prefilter")
+    scan_parser.add_argument("--dedup", type=_dedup_radius, nargs="?", const=DEFAULT_DEDUP_RADIUS, metavar="RADIUS",
+                             help="Near-duplicate shots inherit the result of the first one "
+                                  f"(dHash distance, default {DEFAULT_DEDUP_RADIUS} of 64 bits)")
+    scan_parser.add_argument("--dedup-verify", type=_fraction, metavar="FRACTION",
+                             help="Still infer this fraction of the duplicates and report disagreements")
+    scan_parser.add_argument("--adaptive", type=int, nargs="?", const=0, metavar="LOW_IMGSZ",
+                             help="Infer at low resolution first and only re-infer ambiguous images at full "
+                                  "size (band from 'python -m src.detection.adaptive', default size 320)")
+    scan_parser.add_argument("--move", action="store_true", help="Move detected photos into 'Whiteboards'")
+    scan_parser.add_argument("--organize", choices=ORGANIZE_MODES, default="move",
+                             help="How --move fills 'Whiteboards': move the files (default), link them "
+                                  "(link = hardlink, else reflink, else symlink) or write a manifest")
+    scan_parser.set_defaults(func=scan, check=_check_scan_args)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    try:
+        args = parser.parse_args(argv)
+        args.check(parser, args)
+    except SystemExit as e:
+        # argparse exits 0 for --help and 2 for usage errors
+        return EXIT_USAGE if e.code else EXIT_OK
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        return EXIT_INTERRUPTED
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+import argparse
+import json
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+DEFAULT_LOW_IMGSZ = 320
+# Uncalibrated band: conservative enough that few images are decided wrongly at low resolution
+DEFAULT_REJECT_BELOW = 0.10
+DEFAULT_ACCEPT_ABOVE = 0.85
+DEFAULT_VAL_IMAGES = os.path.join(PROJECT_ROOT, "data", "images", "val")
+DEFAULT_VAL_LABELS = os.path.join(PROJECT_ROOT, "data", "Labels", "Val")
+DEFAULT_CONF = 0.5
+# Calibrated band edges are widened by this much, as the val set never covers every photo
+DEFAULT_MARGIN = 0.05
+# Low floor so every image gets a max confidence, however weak
+_EVAL_CONF = 0.001
+
+
+def band_path(model_path):
+    """Where the calibrated band of ``model_path`` is stored (beside the weights)."""
+    return os.path.splitext(model_path)[0] + "_adaptive.json"
+
+
+class AdaptiveResolution:
+    """
+    Low-resolution first pass run before the full-size detector.
+
+    ``iter_detections`` letterboxes each decoded image to ``low_imgsz`` as well
+    and infers that first. Images whose highest confidence is below
+    ``reject_below`` are reported without detections, images above
+    ``accept_above`` keep their low-resolution boxes, and only the band in
+    between is inferred again at full size. ``calibrate`` picks the band from
+    the val set; ``for_model`` loads it. Set ``low_confidences`` to a dict to
+    collect every image's low-resolution max confidence.
+    """
+
+    def __init__(self, low_imgsz=DEFAULT_LOW_IMGSZ, reject_below=DEFAULT_REJECT_BELOW,
+                 accept_above=DEFAULT_ACCEPT_ABOVE):
+        if not reject_below <= accept_above:
+            raise ValueError("reject_below must not be greater than accept_above")
+        self.low_imgsz = int(low_imgsz)
+        self.reject_below = reject_below
+        self.accept_above = accept_above
+        self.low_images = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.low_time = 0.0
+        self.full_images = 0
+        self.full_time = 0.0
+        self.low_confidences = None
+
+    @classmethod
+    def for_model(cls, model_path, low_imgsz=None):
+        """The band calibrated for ``model_path`` (at ``low_imgsz`` if given), else the defaults."""
+        try:
+            with open(band_path(model_path), "r", encoding="utf-8") as f:
+                band = json.load(f)
+        except (OSError, ValueError):
+            band = None
+        if band is None or (low_imgsz is not None and band.get("low_imgsz") != low_imgsz):
+            return cls(low_imgsz or DEFAULT_LOW_IMGSZ)
+        return cls(band["low_imgsz"], band["reject_below"], band["accept_above"])
+
+    def band(self, conf_threshold):
+        """(reject below, accept above), widened so the threshold itself always falls inside."""
+        return min(self.reject_below, conf_threshold), max(self.accept_above, conf_threshold)
+
+    def cache_tag(self):
+        """Suffix for result cache keys, so results from different bands are kept apart."""
+        return f"adaptive{self.low_imgsz}-{self.reject_below:g}-{self.accept_above:g}"
+
+    def decide(self, image_paths, outputs, conf_threshold):
+        """
+        Decide the confident images from their low-resolution (boxes, confidences).
+
+        ``outputs`` must hold every box down to ``band(conf_threshold)[0]``.
+
+        Returns:
+            dict: {path: (boxes, confidences)} for decided images, filtered at ``conf_threshold``;
+                the rest need the full-size pass
+        """
+        reject_below, accept_above = self.band(conf_threshold)
+        decided = {}
+        for image_path, (boxes, confidences) in zip(image_paths, outputs):
+            max_confidence = float(confidences.max()) if len(confidences) else 0.0
+            if self.low_confidences is not None:
+                self.low_confidences[image_path] = max_confidence
+            if max_confidence < reject_below:
+                decided[image_path] = (boxes[:0], confidences[:0])
+                self.rejected += 1
+            elif max_confidence > accept_above:
+                keep = confidences >= conf_threshold
+                decided[image_path] = (boxes[keep], confidences[keep])
+                self.accepted += 1
+        self.low_images += len(image_paths)
+        return decided
+
+    def add_times(self, low_seconds, full_images, full_seconds):
+        self.low_time += low_seconds
+        self.full_images += full_images
+        self.full_time += full_seconds
+
+    def stats(self):
+        return {
+            "low_res": {
+                "imgsz": self.low_imgsz,
+                "images": self.low_images,
+                "accepted": self.accepted,
+                "rejected": self.rejected,
+                "escalated": self.low_images - self.accepted - self.rejected,
+                "time": self.low_time,
+            },
+            "full_res": {
+                "images": self.full_images,
+                "time": self.full_time,
+            },
+        }
+
+
+def _labelled_positive(labels_dir, image_path):
+    """Whether the YOLO label file of ``image_path`` has any box; None without a label file."""
+    stem = os.path.splitext(os.path.basename(image_path))[0]
+    try:
+        with open(os.path.join(labels_dir, stem + ".txt"), "r", encoding="utf-8") as f:
+            return any(line.strip() for line in f)
+    except OSError:
+        return None
+
+
+def _max_confidences(model_path, image_paths, low_imgsz):
+    """
+    (low-resolution, full-size) max confidence of every image, as the adaptive pass sees them.
+
+    The scan runs with a band that decides nothing, so every image also goes
+    through the full-size pass, and the low-resolution item comes from the same
+    decoded buffer it does at runtime (decoded reduced, as the GUI scans).
+    """
+    from src.detection.detection_module import iter_detections
+
+    probe = AdaptiveResolution(low_imgsz, reject_below=0.0, accept_above=1.0)
+    probe.low_confidences = {}
+    full = {record["image_path"]: record["max_confidence"]
+            for record in iter_detections(None, model_path, _EVAL_CONF, files=image_paths, reduced_decode=True,
+                                          adaptive=probe)}
+    if probe.low_images == 0:
+        raise RuntimeError(f"{model_path} cannot run below its full input size")
+    return {p: probe.low_confidences.get(p, 0.0) for p in image_paths}, full
+
+
+def calibrate(model_path, val_images=DEFAULT_VAL_IMAGES, val_labels=DEFAULT_VAL_LABELS,
+              low_imgsz=DEFAULT_LOW_IMGSZ, conf_threshold=DEFAULT_CONF, recall_tolerance=0.0,
+              margin=DEFAULT_MARGIN):
+    """
+    Pick the widest band that keeps the full-size decisions on the val set.
+
+    Every val image is inferred at ``low_imgsz`` and at full size. ``reject_below``
+    is the lowest low-resolution max confidence of the images the full-size
+    pass detects (skipping those labelled without whiteboards), so none of them
+    is rejected early; ``recall_tolerance`` lets that fraction of them go.
+    ``accept_above`` is the highest low-resolution max confidence of the images
+    the full-size pass does not detect, so none of them is accepted early.
+    Both edges are then moved ``margin`` further apart.
+
+    Returns:
+        dict: {"low_imgsz", "reject_below", "accept_above", "conf_threshold",
+               "images", "escalated" (fraction of val images needing the full pass), ...}
+    """
+    from src.detection.scanner import iter_image_files
+
+    image_paths = list(iter_image_files(val_images))
+    if not image_paths:
+        raise FileNotFoundError(f"No validation images found in {val_images}")
+    low, full = _max_confidences(model_path, image_paths, low_imgsz)
+
+    positives = sorted(low[p] for p in image_paths
+                       if full[p] >= conf_threshold and _labelled_positive(val_labels, p) is not False)
+    negatives = [low[p] for p in image_paths if full[p] < conf_threshold]
+    allowed_misses = int(len(positives) * recall_tolerance)
+    reject_below = positives[allowed_misses] - margin if positives else conf_threshold
+    accept_above = max(negatives) + margin if negatives else conf_threshold
+    reject_below, accept_above = min(reject_below, conf_threshold), max(accept_above, conf_threshold)
+
+    escalated = sum(reject_below <= low[p] <= accept_above for p in image_paths)
+    kept = sum(low[p] >= reject_below for p in image_paths if full[p] >= conf_threshold)
+    full_detected = sum(full[p] >= conf_threshold for p in image_paths)
+    return {
+        "weights": os.path.abspath(model_path),
+        "low_imgsz": low_imgsz,
+        "reject_below": reject_below,
+        "accept_above": accept_above,
+        "conf_threshold": conf_threshold,
+        "recall_tolerance": recall_tolerance,
+        "margin": margin,
+        "images": len(image_paths),
+        "escalated": escalated / len(image_paths),
+        # Share of the full-size detections the band keeps (1.0 = recall preserved)
+        "detections_kept": kept / full_detected if full_detected else 1.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calibrate the low-resolution first pass of a detector.")
+    parser.add_argument("weights", help="Trained detector, e.g. 'src/models/Whiteboard Model4/weights/best.pt'")
+    parser.add_argument("--val-images", default=DEFAULT_VAL_IMAGES, help="Validation images folder")
+    parser.add_argument("--val-labels", default=DEFAULT_VAL_LABELS, help="YOLO txt labels for the val images")
+    parser.add_argument("--low-imgsz", type=int, default=DEFAULT_LOW_IMGSZ, help="First-pass inference size")
+    parser.add_argument("--conf", type=float, default=DEFAULT_CONF, help="Threshold the app runs at")
+    parser.add_argument("--recall-tolerance", type=float, default=0.0,
+                        help="Fraction of full-size detections the first pass may reject")
+    parser.add_argument("--margin", type=float, default=DEFAULT_MARGIN, help="Extra width on each band edge")
+    args = parser.parse_args(argv)
+
+    report = calibrate(args.weights, args.val_images, args.val_labels, args.low_imgsz, args.conf,
+                       args.recall_tolerance, args.margin)
+    with open(band_path(args.weights), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"🎚️ Band at {report['low_imgsz']}px: reject < {report['reject_below']:.3f}, "
+          f"accept > {report['accept_above']:.3f}")
+    print(f"📊 {report['escalated']:.0%} of {report['images']} val images need the full-size pass; "
+          f"{report['detections_kept']:.1%} of full-size detections kept")
+    print(f"✅ Saved {band_path(args.weights)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+import ast
+import importlib
+import os
+import cv2
+import numpy as np
+
+# "torch" runs the weights through ultralytics; the others run an exported copy without PyTorch
+BACKENDS = ("torch", "onnx", "openvino")
+
+# ultralytics predictor defaults, so exported backends return the same boxes
+IOU_THRESHOLD = 0.7
+MAX_DETECTIONS = 300
+_MAX_NMS = 30000
+_MAX_WH = 7680
+
+# Intra-op threads for exported runtimes (0 = runtime default); set per worker process
+_runtime_threads = 0
+
+
+class ModelLoadError(RuntimeError):
+    """A model could not be exported or loaded (unreadable or corrupt weights, missing runtime...)."""
+
+
+def set_runtime_threads(threads):
+    """Limit the threads ONNX Runtime / OpenVINO sessions created afterwards may use."""
+    global _runtime_threads
+    _runtime_threads = max(0, int(threads))
+
+
+def import_runtime(module):
+    """Import an optional runtime module, explaining how to install it when it is missing."""
+    try:
+        return importlib.import_module(module)
+    except ImportError as e:
+        raise ImportError(f"'{module}' is not installed; exported models need the cpu extra "
+                          "(uv sync --extra cpu)") from e
+
+
+def exported_model_path(model_path, backend):
+    """Where the exported copy of ``model_path`` lives (next to the weights, as ultralytics writes it)."""
+    stem = os.path.splitext(model_path)[0]
+    if backend == "onnx":
+        return stem + ".onnx"
+    if backend == "openvino":
+        return stem + "_openvino_model"
+    raise ValueError(f"Unknown export backend '{backend}' (expected one of {', '.join(BACKENDS[1:])})")
+
+
+def export_model(model_path, backend):
+    """
+    Export ``model_path`` for ``backend`` once and return the artifact path.
+
+    The artifact is cached beside the weights and re-exported only when the
+    weights are newer. Exports use dynamic input shapes so the exported model
+    letterboxes images exactly like the PyTorch path.
+
+    Raises:
+        ModelLoadError: if the weights cannot be exported
+    """
+    target = exported_model_path(model_path, backend)
+    if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(model_path):
+        return target
+    try:
+        # Fail here rather than letting ultralytics try to pip install the exporter
+        import_runtime(backend)
+        from ultralytics import YOLO
+
+        exported = YOLO(model_path).export(format=backend, dynamic=True, simplify=False)
+    except Exception as e:
+        raise ModelLoadError(f"Could not export {model_path} for {backend}: {e}") from e
+    if os.path.abspath(exported) != os.path.abspath(target):
+        os.replace(exported, target)
+    return target
+
+
+def is_exported_model(path):
+    return path.endswith(".onnx") or path.endswith("_openvino_model")
+
+
+def load_exported_model(path):
+    """Load an exported artifact with the runtime matching its format."""
+    if path.endswith(".onnx"):
+        return OnnxRuntimeModel(path)
+    if path.endswith("_openvino_model"):
+        return OpenVINOModel(path)
+    raise ValueError(f"Not an exported model: {path}")
+
+
+class Letterbox:
+    """NumPy/OpenCV port of ultralytics' ``LetterBox`` (centered, scale-up, grey 114 padding)."""
+
+    def __init__(self, new_shape, auto, stride=32):
+        self.new_shape = tuple(new_shape)
+        self.auto = auto
+        self.stride = stride
+
+    def __call__(self, image):
+        shape = image.shape[:2]
+        r = min(self.new_shape[0] / shape[0], self.new_shape[1] / shape[1])
+        new_unpad = round(shape[1] * r), round(shape[0] * r)
+        dw, dh = self.new_shape[1] - new_unpad[0], self.new_shape[0] - new_unpad[1]
+        if self.auto:
+            dw, dh = np.mod(dw, self.stride), np.mod(dh, self.stride)
+        dw /= 2
+        dh /= 2
+        if shape[::-1] != new_unpad:
+            image = cv2.resize(image, new_unpad, interpolation=cv2.INTER_LINEAR)
+        top, bottom = round(dh - 0.1), round(dh + 0.1)
+        left, right = round(dw - 0.1), round(dw + 0.1)
+        return cv2.copyMakeBorder(image, top, bottom, left, right, cv2.BORDER_CONSTANT, value=(114, 114, 114))
+
+
+def scale_boxes(img1_shape, boxes, img0_shape):
+    """Map xyxy boxes from a letterboxed frame back to the image it was made from (in place)."""
+    gain = min(img1_shape[0] / img0_shape[0], img1_shape[1] / img0_shape[1])
+    new_h, new_w = round(img0_shape[0] * gain), round(img0_shape[1] * gain)
+    gain_y, gain_x = new_h / img0_shape[0], new_w / img0_shape[1]
+    pad_x, pad_y = round((img1_shape[1] - new_w) / 2 - 0.1), round((img1_shape[0] - new_h) / 2 - 0.1)
+    boxes[:, [0, 2]] = ((boxes[:, [0, 2]] - pad_x) / gain_x).clip(0, img0_shape[1])
+    boxes[:, [1, 3]] = ((boxes[:, [1, 3]] - pad_y) / gain_y).clip(0, img0_shape[0])
+    return boxes
+
+
+def _nms(boxes, scores, iou_threshold):
+    """Greedy NMS; each step compares the best remaining box with all others at once."""
+    x1, y1, x2, y2 = boxes.T
+    areas = (x2 - x1) * (y2 - y1)
+    order = np.argsort(-scores, kind="stable")
+    keep = []
+    while order.size:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+        w = np.clip(np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]), 0, None)
+        h = np.clip(np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]), 0, None)
+        inter = w * h
+        iou = inter / (areas[i] + areas[rest] - inter)
+        order = rest[iou <= iou_threshold]
+    return np.asarray(keep, dtype=np.int64)
+
+
+def non_max_suppression(prediction, conf_threshold, iou_threshold=IOU_THRESHOLD, max_det=MAX_DETECTIONS):
+    """
+    Per-class NMS over raw YOLOv8 output, matching ultralytics' defaults.
+
+    Args:
+        prediction (np.ndarray): (batch, 4 + classes, anchors) raw model output
+        conf_threshold (float): Minimum class score
+
+    Returns:
+        list: (xyxy boxes, confidences) float32 arrays per image
+    """
+    outputs = []
+    for pred in prediction:
+        scores = pred[4:]
+        classes = scores.argmax(0)
+        conf = scores[classes, np.arange(scores.shape[1])]
+        candidates = np.flatnonzero(conf > conf_threshold)
+        if candidates.size > _MAX_NMS:
+            candidates = candidates[np.argsort(-conf[candidates], kind="stable")[:_MAX_NMS]]
+        xy = pred[:2, candidates].T
+        half_wh = pred[2:4, candidates].T / 2
+        boxes = np.concatenate([xy - half_wh, xy + half_wh], axis=1)
+        conf = conf[candidates]
+        # Offset boxes by class so boxes of different classes never suppress each other
+        keep = _nms(boxes + classes[candidates, None] * _MAX_WH, conf, iou_threshold)[:max_det]
+        outputs.append((boxes[keep].astype(np.float32), conf[keep].astype(np.float32)))
+    return outputs
+
+
+class ExportedModel:
+    """
+    Detector running an exported YOLOv8 graph on CPU without PyTorch.
+
+    Subclasses only implement ``_forward``; letterboxing, NMS and box scaling
+    mirror the ultralytics predictor so results match the ``torch`` backend.
+    """
+
+    def __init__(self, stride, imgsz, dynamic, batch_size):
+        self.stride = stride
+        self.imgsz = imgsz
+        self.dynamic = dynamic
+        # Static exports take a fixed batch (usually 1)
+        self.batch_size = batch_size
+
+    def make_letterbox(self, imgsz=None):
+        """Letterbox to ``imgsz`` (dynamic exports) or the fixed export size."""
+        if not self.dynamic or imgsz is None:
+            size = self.imgsz
+        else:
+            size = imgsz if isinstance(imgsz, (list, tuple)) else (imgsz, imgsz)
+            size = [max(self.stride, -(-int(s) // self.stride) * self.stride) for s in size]
+        return Letterbox(size, auto=self.dynamic, stride=self.stride)
+
+    def _forward(self, batch):
+        raise NotImplementedError
+
+    def predict_prepared(self, image_paths, prepared, conf_threshold):
+        """
+        Same contract as ``_predict_prepared`` in the detection module.
+
+        Returns:
+            list: (boxes, confidences) per path, boxes in original image coordinates
+        """
+        outputs = [None] * len(image_paths)
+        groups = {}
+        for index, (image_path, item) in enumerate(zip(image_paths, prepared)):
+            if item is None:
+                raise FileNotFoundError(f"Image Read Error {image_path}")
+            groups.setdefault(item[0].shape, []).append((index, item))
+
+        for shape, members in groups.items():
+            step = len(members) if self.dynamic else self.batch_size
+            for start in range(0, len(members), step):
+                chunk = members[start:start + step]
+                batch = np.stack([item[0] for _, item in chunk])
+                # BGR HWC uint8 -> RGB CHW float32 in [0, 1]
+                batch = np.ascontiguousarray(batch[..., ::-1].transpose(0, 3, 1, 2), dtype=np.float32) / 255.0
+                detections = non_max_suppression(self._forward(batch), conf_threshold)
+                for (index, (_, decoded_shape, orig_shape)), (xyxy, conf) in zip(chunk, detections):
+                    xyxy = scale_boxes(shape[:2], xyxy, decoded_shape)
+                    if decoded_shape != orig_shape:
+                        gain_y = orig_shape[0] / decoded_shape[0]
+                        gain_x = orig_shape[1] / decoded_shape[1]
+                        xyxy *= np.array([gain_x, gain_y, gain_x, gain_y], dtype=np.float32)
+                    outputs[index] = (xyxy, conf)
+        return outputs
+
+
+def _parse_metadata(metadata):
+    stride = int(metadata.get("stride", 32))
+    imgsz = metadata.get("imgsz", [640, 640])
+    if isinstance(imgsz, str):
+        imgsz = ast.literal_eval(imgsz)
+    return stride, [int(s) for s in imgsz]
+
+
+class OnnxRuntimeModel(ExportedModel):
+    def __init__(self, path):
+        onnxruntime = import_runtime("onnxruntime")
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = _runtime_threads
+        self.session = onnxruntime.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        stride, imgsz = _parse_metadata(self.session.get_modelmeta().custom_metadata_map)
+        input_shape = self.session.get_inputs()[0].shape
+        dynamic = not isinstance(input_shape[2], int)
+        batch_size = input_shape[0] if isinstance(input_shape[0], int) else 0
+        super().__init__(stride, imgsz, dynamic, batch_size or 1)
+        self._input_name = self.session.get_inputs()[0].name
+
+    def _forward(self, batch):
+        return self.session.run(None, {self._input_name: batch})[0]
+
+
+class OpenVINOModel(ExportedModel):
+    def __init__(self, path):
+        import yaml
+
+        ov = import_runtime("openvino")
+
+        core = ov.Core()
+        xml_path = next(os.path.join(path, f) for f in os.listdir(path) if f.endswith(".xml"))
+        model = core.read_model(xml_path)
+        config = {"PERFORMANCE_HINT": "LATENCY"}
+        if _runtime_threads:
+            config["INFERENCE_NUM_THREADS"] = _runtime_threads
+        self.compiled = core.compile_model(model, "CPU", config)
+        with open(os.path.join(path, "metadata.yaml"), "r", encoding="utf-8") as f:
+            stride, imgsz = _parse_metadata(yaml.safe_load(f) or {})
+        input_shape = model.input(0).get_partial_shape()
+        dynamic = input_shape[2].is_dynamic
+        batch_size = input_shape[0].get_length() if input_shape[0].is_static else 1
+        super().__init__(stride, imgsz, dynamic, batch_size)
+
+    def _forward(self, batch):
+        return self.compiled([batch])[self.compiled.output(0)]
@@ -0,0 +1,156 @@
+import time
+import numpy as np
+from src.detection.defaults import DEFAULT_CLASSIFIER_PATH
+from src.detection.image_io import read_image
+from src.detection.model_cache import get_model, weights_hash
+
+# Whiteboard probability bands: below REJECT is dropped, above ACCEPT is kept without the detector
+DEFAULT_REJECT_BELOW = 0.05
+DEFAULT_ACCEPT_ABOVE = 0.95
+DEFAULT_CLASSIFIER_IMGSZ = 324
+
+# Class names the classifier scripts treat as "whiteboard"
+_POSITIVE_NAMES = ("whiteboard", "whiteboards", "0")
+
+
+class Cascade:
+    """
+    Cheap classifier stage run before the detector.
+
+    Every image is classified at low resolution (JPEGs are decoded reduced, just
+    above ``imgsz``). Images whose whiteboard probability is below
+    ``reject_below`` are reported without detections, images above
+    ``accept_above`` are reported as detected with one whole-image box scored
+    with that probability, and only the band in between goes to the detector.
+
+    With a result cache, probabilities are stored under the classifier's weights
+    hash, so a rescan only classifies new or modified images (and a changed band
+    still applies to the cached ones).
+    """
+
+    def __init__(self, classifier_path=DEFAULT_CLASSIFIER_PATH, reject_below=DEFAULT_REJECT_BELOW,
+                 accept_above=DEFAULT_ACCEPT_ABOVE, imgsz=DEFAULT_CLASSIFIER_IMGSZ, positive_class=None):
+        if not reject_below <= accept_above:
+            raise ValueError("reject_below must not be greater than accept_above")
+        self.classifier_path = classifier_path
+        self.reject_below = reject_below
+        self.accept_above = accept_above
+        self.imgsz = imgsz
+        self.positive_class = positive_class
+        self.classified = 0
+        self.cached = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.classifier_time = 0.0
+        self.detector_images = 0
+        self.detector_time = 0.0
+
+    def _positive_index(self, model):
+        if self.positive_class is None:
+            names = {index: str(name).lower() for index, name in model.names.items()}
+            matches = [index for index, name in names.items() if name in _POSITIVE_NAMES]
+            if not matches:
+                raise ValueError(f"No whiteboard class in classifier names {model.names}; set positive_class")
+            self.positive_class = matches[0]
+        return self.positive_class
+
+    def classify(self, image_paths):
+        """
+        Classify images in one batch.
+
+        Returns:
+            list: (whiteboard probability, original (h, w)) per path, None for unreadable files
+        """
+        model = get_model(self.classifier_path)
+        positive = self._positive_index(model)
+        outputs = [None] * len(image_paths)
+        images = []
+        for index, image_path in enumerate(image_paths):
+            # The classifier resizes the short side to imgsz; 2x on the long side covers up to 2:1 photos
+            img, orig_shape = read_image(image_path, 2 * self.imgsz)
+            if img is not None:
+                images.append((index, img, orig_shape))
+        if images:
+            results = model.predict([img for _, img, _ in images], imgsz=self.imgsz, verbose=False)
+            for (index, _, orig_shape), result in zip(images, results):
+                outputs[index] = float(result.probs.data[positive]), orig_shape
+        return outputs
+
+    def _classify_cached(self, image_paths, cache, file_stats):
+        # A cached row holds the probability as its only confidence and the image size as its box
+        cache_imgsz = f"classifier{self.imgsz}"
+        model_hash = weights_hash(self.classifier_path)
+        found = cache.get_many(image_paths, model_hash, cache_imgsz, 0.0, file_stats)
+        outputs = {image_path: (float(confidences[0]), (int(boxes[0][3]), int(boxes[0][2])))
+                   for image_path, (boxes, confidences) in found.items()}
+        misses = [image_path for image_path in image_paths if image_path not in found]
+        if misses:
+            computed = dict(zip(misses, self.classify(misses)))
+            entries = {}
+            for image_path, output in computed.items():
+                if output is not None:
+                    probability, (height, width) = output
+                    entries[image_path] = (np.array([[0, 0, width, height]], dtype=np.float32),
+                                           np.array([probability], dtype=np.float32))
+            cache.put_many(entries, model_hash, cache_imgsz, 0.0, file_stats)
+            outputs.update(computed)
+        self.cached += len(found)
+        return [outputs[image_path] for image_path in image_paths]
+
+    def split(self, image_paths, cache=None, file_stats=None):
+        """
+        Decide the confident images and return the ones the detector still needs.
+
+        Args:
+            image_paths (list): Images to classify
+            cache (DetectionCache): Optional store of classifier probabilities
+            file_stats (dict): Optional {path: os.stat_result} for cache validation
+
+        Returns:
+            tuple: ({path: (boxes, confidences)} for decided images, list of ambiguous paths)
+        """
+        start = time.perf_counter()
+        decided = {}
+        ambiguous = []
+        if cache is not None:
+            outputs = self._classify_cached(image_paths, cache, file_stats)
+        else:
+            outputs = self.classify(image_paths)
+        for image_path, output in zip(image_paths, outputs):
+            if output is None:
+                # Let the detector report unreadable files as before
+                ambiguous.append(image_path)
+                continue
+            probability, (height, width) = output
+            if probability < self.reject_below:
+                decided[image_path] = (np.zeros((0, 4), dtype=np.float32), np.zeros(0, dtype=np.float32))
+                self.rejected += 1
+            elif probability > self.accept_above:
+                box = np.array([[0, 0, width, height]], dtype=np.float32)
+                decided[image_path] = (box, np.array([probability], dtype=np.float32))
+                self.accepted += 1
+            else:
+                ambiguous.append(image_path)
+        self.classified += len(image_paths)
+        self.classifier_time += time.perf_counter() - start
+        return decided, ambiguous
+
+    def add_detector_time(self, images, seconds):
+        self.detector_images += images
+        self.detector_time += seconds
+
+    def stats(self):
+        return {
+            "classifier": {
+                "images": self.classified,
+                "cached": self.cached,
+                "accepted": self.accepted,
+                "rejected": self.rejected,
+                "ambiguous": self.classified - self.accepted - self.rejected,
+                "time": self.classifier_time,
+            },
+            "detector": {
+                "images": self.detector_images,
+                "time": self.detector_time,
+            },
+        }
@@ -0,0 +1,231 @@
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+import cv2
+import numpy as np
+from src.detection.defaults import DEFAULT_DEDUP_RADIUS, MAX_DEDUP_RADIUS
+from src.detection.image_io import read_image
+from src.detection.pipeline import default_prefetch_workers
+
+# dHash only needs a 9x8 thumbnail; JPEGs are decoded at up to 1/8 scale, just above this
+HASH_DECODE_SIZE = 64
+
+
+def dhash(img):
+    """64-bit difference hash of a BGR image: one bit per horizontally adjacent pixel pair at 9x8."""
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = small[:, 1:] > small[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def image_hash(image_path):
+    """
+    dHash of an image from a tiny decode.
+
+    Returns:
+        tuple: (64-bit hash, original (h, w)), or None if unreadable
+    """
+    img, orig_shape = read_image(image_path, HASH_DECODE_SIZE)
+    if img is None:
+        return None
+    return dhash(img), orig_shape
+
+
+class HashIndex:
+    """
+    Multi-index hash table answering "nearest 64-bit hash within ``radius``".
+
+    Hashes are split into four 16-bit ranges, each with its own dictionary.
+    Two hashes within ``radius`` bits of each other differ in at most
+    ``radius // 4`` bits on at least one range (pigeonhole), so a query only
+    probes the keys that close to each of its ranges and compares against the
+    few hashes stored there instead of scanning them all, which keeps lookups
+    fast with hundreds of thousands of hashes.
+    """
+
+    def __init__(self, radius=DEFAULT_DEDUP_RADIUS):
+        if not 0 <= radius <= MAX_DEDUP_RADIUS:
+            raise ValueError(f"radius must be between 0 and {MAX_DEDUP_RADIUS}")
+        self.radius = radius
+        self._ranges = [(shift, 0xFFFF) for shift in range(0, 64, 16)]
+        self._tables = [{} for _ in self._ranges]
+        # Every 16-bit key within radius // 4 flipped bits of a range
+        self._flips = [sum(1 << bit for bit in bits)
+                       for count in range(radius // 4 + 1) for bits in combinations(range(16), count)]
+        self._hashes = []
+        self._values = []
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def add(self, value_hash, value):
+        entry = len(self._hashes)
+        self._hashes.append(value_hash)
+        self._values.append(value)
+        for table, (shift, mask) in zip(self._tables, self._ranges):
+            table.setdefault((value_hash >> shift) & mask, []).append(entry)
+
+    def nearest(self, value_hash):
+        """
+        Closest stored hash within ``radius``.
+
+        Returns:
+            tuple: (distance, value) of the match (the earliest added on ties), or None
+        """
+        best = None
+        seen = set()
+        for table, (shift, mask) in zip(self._tables, self._ranges):
+            key = (value_hash >> shift) & mask
+            for flip in self._flips:
+                for entry in table.get(key ^ flip, ()):
+                    if entry in seen:
+                        continue
+                    seen.add(entry)
+                    distance = (self._hashes[entry] ^ value_hash).bit_count()
+                    if distance <= self.radius and (best is None or (distance, entry) < best):
+                        best = (distance, entry)
+        if best is None:
+            return None
+        return best[0], self._values[best[1]]
+
+
+class DuplicateFilter:
+    """
+    Near-duplicate stage run before the classifier and detector.
+
+    Each image that needs inference is hashed from a tiny decode. The first
+    image of a scene becomes its representative; later images within
+    ``radius`` bits of one inherit its boxes and confidences (scaled to their
+    own size) instead of being inferred. A deterministic ``verify_fraction`` of
+    the duplicates is inferred anyway and compared with the representative, so
+    ``stats()`` shows whether the radius is safe for a collection.
+
+    Hashing (a decode) runs on ``workers`` threads: ``hash_ahead`` starts it for
+    upcoming images, and ``split`` only matches them against the index, in scan
+    order, so the same images always get the same representatives. ``close``
+    stops the threads (``iter_detections`` calls it when a scan ends); a later
+    ``hash_ahead`` starts them again.
+
+    Keep one instance per scan, or across watch batches to match new shots
+    against earlier ones.
+    """
+
+    def __init__(self, radius=DEFAULT_DEDUP_RADIUS, verify_fraction=0.0, workers=None):
+        if not 0.0 <= verify_fraction <= 1.0:
+            raise ValueError("verify_fraction must be between 0 and 1")
+        self.radius = radius
+        self.verify_fraction = verify_fraction
+        self.workers = max(1, int(workers or default_prefetch_workers()))
+        self._executor = None
+        self._hashing = {}
+        self._index = HashIndex(radius)
+        self._shapes = {}
+        self._representative = {}
+        self._results = {}
+        self.hashed = 0
+        self.duplicates = 0
+        self.verified = 0
+        self.disagreements = 0
+        self.hash_time = 0.0
+
+    def _sampled(self, image_path):
+        digest = hashlib.blake2b(image_path.encode("utf-8", "surrogatepass"), digest_size=8).digest()
+        return int.from_bytes(digest, "big") < self.verify_fraction * 2 ** 64
+
+    def hash_ahead(self, image_paths):
+        """Start hashing ``image_paths`` on the filter's threads; ``split`` picks the hashes up."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="dedup")
+        for image_path in image_paths:
+            if image_path not in self._hashing:
+                self._hashing[image_path] = self._executor.submit(image_hash, image_path)
+
+    def close(self):
+        """Stop the hashing threads and drop hashes that were never picked up."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._hashing.clear()
+
+    def cache_tag(self):
+        """Suffix for result cache keys, so inherited results never pass for detector output."""
+        return f"dedup{self.radius}"
+
+    def split(self, image_paths):
+        """
+        Find the images that can inherit an earlier result.
+
+        Images not passed to ``hash_ahead`` first are hashed here.
+
+        Returns:
+            tuple: ({path: representative path} for duplicates, list of paths still to infer)
+        """
+        start = time.perf_counter()
+        duplicates = {}
+        remaining = []
+        for image_path in image_paths:
+            future = self._hashing.pop(image_path, None)
+            hashed = future.result() if future is not None else image_hash(image_path)
+            if hashed is None:
+                # Let the detector report unreadable files as before
+                remaining.append(image_path)
+                continue
+            value_hash, shape = hashed
+            self._shapes[image_path] = shape
+            match = self._index.nearest(value_hash)
+            if match is None:
+                self._index.add(value_hash, image_path)
+                remaining.append(image_path)
+            elif self.verify_fraction and self._sampled(image_path):
+                self._representative[image_path] = match[1]
+                remaining.append(image_path)
+            else:
+                duplicates[image_path] = match[1]
+        self.hashed += len(image_paths)
+        self.duplicates += len(duplicates)
+        self.hash_time += time.perf_counter() - start
+        return duplicates, remaining
+
+    def record(self, results):
+        """
+        Remember the results of representatives and check the sampled duplicates.
+
+        Args:
+            results (dict): {path: (boxes, confidences)}; paths this filter did not hash are ignored
+        """
+        verifying = []
+        for image_path, result in results.items():
+            if image_path in self._representative:
+                verifying.append((image_path, result))
+            elif image_path in self._shapes and image_path not in self._results:
+                self._results[image_path] = result
+        for image_path, (_, confidences) in verifying:
+            representative = self._representative.pop(image_path)
+            inherited = self._results.get(representative)
+            if inherited is None:
+                continue
+            self.verified += 1
+            if (len(inherited[1]) > 0) != (len(confidences) > 0):
+                self.disagreements += 1
+
+    def inherit(self, image_path, representative):
+        """(boxes, confidences) of ``representative``, scaled to the size of ``image_path``."""
+        boxes, confidences = self._results[representative]
+        (height, width), (rep_height, rep_width) = self._shapes[image_path], self._shapes[representative]
+        if (height, width) != (rep_height, rep_width):
+            gain = np.array([width / rep_width, height / rep_height] * 2, dtype=np.float32)
+            boxes = boxes * gain
+        return boxes, confidences
+
+    def stats(self):
+        return {
+            "hashed": self.hashed,
+            "representatives": len(self._index),
+            "inferences_saved": self.duplicates,
+            "verified": self.verified,
+            "disagreements": self.disagreements,
+            # Time the scan waited for hashes and index lookups
+            "hash_time": self.hash_time,
+        }
@@ -0,0 +1,11 @@
+import os
+
+# Shared defaults, kept free of heavy imports so the CLI and GUI can read them at startup
+
+# Classifier used by the cascade prefilter, relative to the project root
+DEFAULT_CLASSIFIER_PATH = os.path.join("src", "models", "Whiteboard Model Classification5", "weights", "best.pt")
+
+# Hamming distance (out of 64 bits) under which two shots count as the same scene
+DEFAULT_DEDUP_RADIUS = 6
+# The hash index probes radius // 4 flipped bits per 16-bit range, which must stay below 8
+MAX_DEDUP_RADIUS = 31
@@ -1,113 +1,656 @@
 import os
-import cv2
+import sys
+import time
+import warnings
+from collections import deque
 import numpy as np
-import shutil
-from ultralytics import YOLO
+from src.detection.backends import export_model, is_exported_model
+from src.detection.image_io import encode_thumbnail, read_image
+from src.detection.model_cache import get_model, weights_hash
+from src.detection.organizer import link_files, organize_files
+from src.detection.pipeline import PrefetchPipeline
+from src.detection.scanner import scan_images
+from src.detection.sharded import ShardedInference, default_worker_split
 
-def detect_whiteboards(folder_path, model_path="./runs/detect/train19/weights/best.pt", conf_threshold=0.5):
+
+def _iter_batches(items, batch_size):
+    """Yield consecutive chunks of at most ``batch_size`` items."""
+    for start in range(0, len(items), batch_size):
+        yield items[start:start + batch_size]
+
+
+def _predict_batch(model, image_paths, conf_threshold, imgsz=None):
+    """
+    Run YOLO on a batch of images and return one result per path, in order.
+
+    Images are grouped by shape before inference so each group is letterboxed
+    exactly like a single image would be, which keeps batched results identical
+    to the per-image path.
+    """
+    predict_kwargs = {"conf": conf_threshold, "verbose": False}
+    if imgsz is not None:
+        predict_kwargs["imgsz"] = imgsz
+
+    if len(image_paths) == 1:
+        return model.predict(image_paths[0], **predict_kwargs)
+
+    results = [None] * len(image_paths)
+    groups = {}
+    for index, image_path in enumerate(image_paths):
+        # Full-size decode, the same way ultralytics reads file sources
+        img, _ = read_image(image_path)
+        if img is None:
+            # Let ultralytics handle (and report) unreadable files as before
+            results[index] = model.predict(image_path, **predict_kwargs)[0]
+            continue
+        groups.setdefault(img.shape, []).append((index, img))
+
+    for members in groups.values():
+        group_results = model.predict([img for _, img in members], **predict_kwargs)
+        for (index, _), result in zip(members, group_results):
+            results[index] = result
+
+    return results
+
+
+def _result_arrays(result):
+    """Boxes (xyxy) and confidences of one YOLO result as float32 arrays."""
+    boxes = result.boxes
+    return boxes.xyxy.cpu().numpy().astype(np.float32), boxes.conf.cpu().numpy().astype(np.float32)
+
+
+def _make_letterbox(model, imgsz=None):
+    """Build the same LetterBox transform the ultralytics predictor applies for ``model``."""
+    from ultralytics.data.augment import LetterBox
+    from ultralytics.utils.checks import check_imgsz
+
+    module = model.model
+    stride = int(max(module.stride)) if hasattr(module, "stride") else 32
+    size = check_imgsz(imgsz if imgsz is not None else model.overrides.get("imgsz", 640), stride=stride, min_dim=2)
+    # PyTorch weights are letterboxed to the nearest stride multiple, exported ones to a fixed square
+    return LetterBox(new_shape=tuple(size), auto=hasattr(module, "parameters"), stride=stride)
+
+
+def _prepare_image(image_path, letterbox, decode_size=None):
+    """
+    Decode (once, reduced when ``decode_size`` allows) and letterbox one image.
+
+    Returns:
+        tuple: (letterboxed image, decoded (h, w), original (h, w)), or None if unreadable
+    """
+    img, orig_shape = read_image(image_path, decode_size)
+    if img is None:
+        return None
+    return letterbox(image=img), img.shape[:2], orig_shape
+
+
+def _prepare_extras(image_path, letterbox, decode_size, low_letterbox=None, thumbnail_size=None):
+    """
+    Like ``_prepare_image``, also deriving extra inputs from the same decoded buffer.
+
+    Returns:
+        tuple: (``_prepare_image`` result, (item letterboxed by ``low_letterbox`` or None,
+            JPEG thumbnail bytes or None)); (None, (None, None)) if unreadable
+    """
+    img, orig_shape = read_image(image_path, decode_size)
+    if img is None:
+        return None, (None, None)
+    low_item = (low_letterbox(image=img), img.shape[:2], orig_shape) if low_letterbox is not None else None
+    thumbnail = encode_thumbnail(img, orig_shape, thumbnail_size) if thumbnail_size else None
+    return (letterbox(image=img), img.shape[:2], orig_shape), (low_item, thumbnail)
+
+
+def _predict_prepared(model, image_paths, prepared, conf_threshold, imgsz=None):
+    """
+    Run YOLO on already letterboxed images and return (boxes, confidences) per path.
+
+    The predictor's own letterbox is a no-op on these inputs, so boxes only need
+    mapping back from the letterboxed frame to the decoded image, and from there
+    to the original resolution when the image was decoded reduced.
+    """
+    from ultralytics.utils import ops
+
+    predict_kwargs = {"conf": conf_threshold, "verbose": False}
+    if imgsz is not None:
+        predict_kwargs["imgsz"] = imgsz
+
+    outputs = [None] * len(image_paths)
+    groups = {}
+    for index, (image_path, item) in enumerate(zip(image_paths, prepared)):
+        if item is None:
+            # Let ultralytics handle (and report) unreadable files as before
+            outputs[index] = _result_arrays(model.predict(image_path, **predict_kwargs)[0])
+            continue
+        groups.setdefault(item[0].shape, []).append((index, item))
+
+    for shape, members in groups.items():
+        group_results = model.predict([item[0] for _, item in members], **predict_kwargs)
+        for (index, (_, decoded_shape, orig_shape)), result in zip(members, group_results):
+            xyxy = ops.scale_boxes(shape[:2], result.boxes.xyxy.clone(), decoded_shape)
+            xyxy = xyxy.cpu().numpy().astype(np.float32)
+            if decoded_shape != orig_shape:
+                gain_y = orig_shape[0] / decoded_shape[0]
+                gain_x = orig_shape[1] / decoded_shape[1]
+                xyxy *= np.array([gain_x, gain_y, gain_x, gain_y], dtype=np.float32)
+            outputs[index] = (xyxy, result.boxes.conf.cpu().numpy().astype(np.float32))
+
+    return outputs
+
+
+def warm_up_model(model_path, imgsz=None, backend="torch"):
+    """
+    Load a model into the shared cache and run one dummy forward pass.
+
+    The first real batch then skips weight loading, the deferred ultralytics
+    and torch imports and predictor setup, all of which happen on first use.
+
+    Args:
+        model_path (str): Weights (.pt) or an exported model, as passed to ``iter_detections``
+        imgsz (int): Inference size (None uses the size the model was trained at)
+        backend (str): "torch", "onnx" or "openvino"
+    """
+    model = get_model(export_model(model_path, backend) if backend != "torch" else model_path)
+    blank = np.full((480, 640, 3), 114, dtype=np.uint8)
+    if backend != "torch" or is_exported_model(model_path):
+        letterbox = model.make_letterbox(imgsz)
+        predict = model.predict_prepared
+    else:
+        letterbox = _make_letterbox(model, imgsz)
+
+        def predict(paths, items, conf):
+            return _predict_prepared(model, paths, items, conf, imgsz)
+    predict(["<warm-up>"], [(letterbox(image=blank), blank.shape[:2], blank.shape[:2])], 0.5)
+    return model
+
+
+class DetectionSummary:
+    """
+    Running aggregates over per-image detection records.
+
+    Builds the same result dict ``detect_whiteboards`` returns, one record at a
+    time, so callers consuming ``iter_detections`` can show partial results.
+    """
+
+    def __init__(self):
+        self.detected_images = []
+        self.undetected_images = []
+        self.image_confidences = {}
+        self.total_images = 0
+        self.total_detections = 0
+        self._conf_sum = 0.0
+        self._conf_count = 0
+        self._conf_min = 0.0
+        self._conf_max = 0.0
+        # Per-stage utilisation when the prefetch pipeline is used
+        self.pipeline_stats = None
+        # Per-stage counts and timings when a classifier cascade is used
+        self.cascade_stats = None
+        # Hashing counts and inferences saved when near-duplicates are skipped
+        self.dedup_stats = None
+        # Per-resolution counts and timings when the adaptive first pass is used
+        self.adaptive_stats = None
+
+    def add(self, record):
+        """Fold one record from ``iter_detections`` into the aggregates."""
+        self.total_images += 1
+        confidences = record["confidences"]
+        if not confidences:
+            self.undetected_images.append(record["filename"])
+            return
+        self.total_detections += len(confidences)
+        self.detected_images.append(record["image_path"])
+        self.image_confidences[record["image_path"]] = record["max_confidence"]
+        if self._conf_count == 0:
+            self._conf_min = self._conf_max = confidences[0]
+        self._conf_sum += sum(confidences)
+        self._conf_count += len(confidences)
+        self._conf_min = min(self._conf_min, min(confidences))
+        self._conf_max = max(self._conf_max, max(confidences))
+
+    def stats(self):
+        detected_count = len(self.detected_images)
+        stats = {
+            "total_images": self.total_images,
+            "detected_count": detected_count,
+            "undetected_count": len(self.undetected_images),
+            "detection_rate": (detected_count / self.total_images * 100) if self.total_images > 0 else 0,
+            "total_detections": self.total_detections,
+            "avg_detections": self.total_detections / detected_count if detected_count > 0 else 0,
+            "avg_confidence": self._conf_sum / self._conf_count if self._conf_count > 0 else 0,
+            "confidence_range": (self._conf_min, self._conf_max)
+        }
+        if self.pipeline_stats is not None:
+            stats["pipeline"] = self.pipeline_stats
+        if self.cascade_stats is not None:
+            stats["cascade"] = self.cascade_stats
+        if self.dedup_stats is not None:
+            stats["dedup"] = self.dedup_stats
+        if self.adaptive_stats is not None:
+            stats["adaptive"] = self.adaptive_stats
+        return stats
+
+    def as_result(self):
+        return {
+            "detected_images": list(self.detected_images),
+            "undetected_images": list(self.undetected_images),
+            "stats": self.stats(),
+            "image_confidences": dict(self.image_confidences),
+        }
+
+
+def iter_detections(folder_path, model_path="./runs/detect/train19/weights/best.pt", conf_threshold=0.5,
+                    batch_size=1, summary=None, imgsz=None, cache=None, prefetch_workers=0, prefetch_depth=None,
+                    reduced_decode=False, recursive=True, files=None, workers=0, threads_per_worker=None,
+                    backend="torch", cascade=None, thumbnail_size=None, thumbnail_cache=None, dedup=None,
+                    adaptive=None):
+    """
+    Detect whiteboards in a folder, yielding one record per image as soon as it is ready.
+
+    Args:
+        folder_path (str): Path to folder containing images
+        model_path (str): Path to YOLO trained model weights (.pt) or an exported .onnx model
+        conf_threshold (float): Confidence threshold for detection
+        batch_size (int): Number of images sent to the model per forward pass
+        summary (DetectionSummary): Optional accumulator updated before each yield
+        imgsz (int): Inference size (None uses the size the model was trained at)
+        cache (DetectionCache): Optional result cache; only new or modified images are inferred
+        prefetch_workers (int): Threads decoding and letterboxing images ahead of inference (0 = inline)
+        prefetch_depth (int): Maximum number of images decoded ahead of the model
+        reduced_decode (bool): Decode large JPEGs at 1/2, 1/4 or 1/8 scale, just above the
+            inference size, instead of at full resolution
+        recursive (bool): Include images in subfolders (the Whiteboards output folder is skipped)
+        files (list): Explicit image paths to process instead of scanning ``folder_path``
+        workers (int): Worker processes, each with its own model replica, sharing the
+            batches (0 = run in this process; None = ``default_worker_split()``, which stays
+            in this process when it gives a single worker).
+            Workers decode their own images, so ``prefetch_workers`` is ignored.
+        threads_per_worker (int): ``torch.set_num_threads`` budget of each worker
+        backend (str): "torch" (ultralytics), or "onnx" / "openvino" to export the weights
+            once (cached next to them) and run the exported model on CPU
+        cascade (Cascade): Optional classifier prefilter; only images it is unsure about reach
+            the detector (cache hits are still served first, and its probabilities are cached too)
+        thumbnail_size (int): Also encode a JPEG thumbnail fitting this box from the buffer each
+            inferred image was decoded into, so showing it later needs no second decode
+            (in-process inference only; worker processes do not return thumbnails)
+        thumbnail_cache (ThumbnailCache): Optional store the thumbnails are written to, under
+            the same key the GUI looks them up with
+        dedup (DuplicateFilter): Optional near-duplicate stage; images within its radius of an
+            earlier image of the scan inherit that image's result instead of being inferred
+            (checked after the cache, before the cascade); inherited results are cached too, under
+            a key of their own, and its hashing threads are stopped when the scan ends
+        adaptive (AdaptiveResolution): Optional low-resolution first pass; only images it is
+            unsure about are inferred at full size (in-process inference only, and exported
+            models need a dynamic input size; otherwise it is skipped with a RuntimeWarning).
+            The model is then loaded before the first cache lookup, whose key depends on it
+
+    Yields:
+        dict: {
+            "image_path": full path of the image,
+            "filename": image filename,
+            "boxes": float32 array of xyxy boxes,
+            "confidences": confidence of every detection,
+            "max_confidence": highest confidence (0.0 without detections),
+            "cached": whether the result came from the cache,
+            "stage": "cache", "classifier" (decided by the cascade), "duplicate" (inherited),
+                "low-res" (decided by the adaptive first pass) or "detector",
+            "duplicate_of": path of the image the result was inherited from, or None,
+            "index": position of the image in the scan,
+            "total": number of images in the scan,
+            "stats": running summary statistics including this image,
+            "thumbnail": JPEG bytes when ``thumbnail_size`` is set and the image was
+                decoded here, else None
+        }
+    """
+    batch_size = max(1, int(batch_size))
+    if workers is None and default_worker_split()[0] == 1:
+        # A single spawned replica would only add a second torch import
+        workers = 0
+    # Exported artifacts (e.g. an INT8 .onnx) can also be passed directly as model_path
+    exported = backend != "torch" or is_exported_model(model_path)
+    if summary is None:
+        summary = DetectionSummary()
+    # The model is loaded on the first cache miss, so fully cached rescans skip it
+    model = None
+    letterbox = None
+    low_letterbox = None
+    decode_size = None
+    pipeline = None
+    shards = None
+    sharded = workers is None or workers > 1
+    if adaptive is not None and sharded:
+        warnings.warn("The low-resolution pass runs in process only; ignored with worker processes",
+                      RuntimeWarning, stacklevel=2)
+        adaptive = None
+
+    def load_model():
+        nonlocal model, letterbox, low_letterbox, decode_size
+        # Reuse a warm model when the same weights were loaded before
+        model = get_model(export_model(model_path, backend) if backend != "torch" else model_path)
+        if exported:
+            letterbox = model.make_letterbox(imgsz)
+            if reduced_decode:
+                decode_size = max(letterbox.new_shape)
+        elif pipeline is not None or reduced_decode or thumbnail_size or adaptive is not None:
+            letterbox = _make_letterbox(model, imgsz)
+            if reduced_decode:
+                decode_size = max(letterbox.new_shape)
+        if adaptive is not None:
+            if exported:
+                low_letterbox = model.make_letterbox(adaptive.low_imgsz)
+            else:
+                low_letterbox = _make_letterbox(model, adaptive.low_imgsz)
+            if max(low_letterbox.new_shape) >= max(letterbox.new_shape):
+                warnings.warn(f"Model cannot run below {max(letterbox.new_shape)}px; low-resolution pass disabled",
+                              RuntimeWarning, stacklevel=3)
+                low_letterbox = None
+
+    if adaptive is not None:
+        # Whether the low-resolution pass can run decides the cache key, so find out before any lookup
+        load_model()
+        if low_letterbox is None:
+            adaptive = None
+    if cache is not None:
+        model_hash = weights_hash(model_path)
+        cache_imgsz = imgsz if imgsz is not None else "default"
+        if reduced_decode:
+            # Reduced decodes give slightly different pixels, so keep their results apart
+            cache_imgsz = f"{cache_imgsz}-reduced"
+        if backend != "torch":
+            cache_imgsz = f"{cache_imgsz}-{backend}"
+        if adaptive is not None:
+            cache_imgsz = f"{cache_imgsz}-{adaptive.cache_tag()}"
+        if dedup is not None:
+            cache_imgsz = f"{cache_imgsz}-{dedup.cache_tag()}"
+
+    if files is not None:
+        image_paths, file_stats = list(files), None
+    else:
+        # One directory pass; the stat data is reused for cache validation
+        image_paths, file_stats = scan_images(folder_path, recursive)
+    total = len(image_paths)
+
+    def looked_up():
+        # Cache lookups run ``lookahead`` batches early, so the dedup threads hash the
+        # misses of upcoming batches while earlier ones are split and inferred
+        lookahead = -(-2 * dedup.workers // batch_size) if dedup is not None else 0
+        pending = deque()
+        for batch in _iter_batches(image_paths, batch_size):
+            found = {}
+            if cache is not None:
+                found = cache.get_many(batch, model_hash, cache_imgsz, conf_threshold, file_stats)
+            misses = [image_path for image_path in batch if image_path not in found]
+            if dedup is not None and misses:
+                dedup.hash_ahead(misses)
+            pending.append((batch, found, misses))
+            if len(pending) > lookahead:
+                yield pending.popleft()
+        yield from pending
+
+    def plan():
+        # Runs on the consuming thread, just ahead of the prefetch queue
+        for batch, found, misses in looked_up():
+            duplicates = {}
+            if dedup is not None and misses:
+                duplicates, misses = dedup.split(misses)
+            decided = {}
+            if cascade is not None and misses:
+                decided, misses = cascade.split(misses, cache, file_stats)
+                for image_path, (boxes, confidences) in decided.items():
+                    keep = confidences >= conf_threshold
+                    found[image_path] = (boxes[keep], confidences[keep])
+            if misses and model is None and shards is None:
+                load_model()
+            yield (batch, found, misses, decided, duplicates), misses
+
+    def load(image_path):
+        if thumbnail_size or low_letterbox is not None:
+            return _prepare_extras(image_path, letterbox, decode_size, low_letterbox, thumbnail_size)
+        return _prepare_image(image_path, letterbox, decode_size)
+
+    if sharded:
+        if backend != "torch":
+            # Export once here rather than racing in every worker
+            export_model(model_path, backend)
+        shards = ShardedInference(model_path, conf_threshold, imgsz, reduced_decode, workers, threads_per_worker,
+                                  backend)
+        stream = shards.map_batches(plan())
+    elif prefetch_workers:
+        pipeline = PrefetchPipeline(load, prefetch_workers, prefetch_depth)
+        stream = pipeline.map_batches(plan())
+    else:
+        stream = ((key, None) for key, _ in plan())
+
+    index = 0
+    try:
+        for (batch, found, misses, decided, duplicates), prepared in stream:
+            detect_start = time.perf_counter()
+            thumbnails = {}
+            low_decided = {}
+            if misses and shards is not None:
+                # Already inferred by a worker process
+                computed = dict(zip(misses, prepared))
+                if cache is not None:
+                    cache.put_many(computed, model_hash, cache_imgsz, conf_threshold, file_stats)
+                found.update(computed)
+            elif misses:
+                if prepared is None and (reduced_decode or exported or thumbnail_size or low_letterbox is not None):
+                    prepared = [load(image_path) for image_path in misses]
+                if thumbnail_size or low_letterbox is not None:
+                    extras = dict(zip(misses, (extra for _, extra in prepared)))
+                    prepared = [item for item, _ in prepared]
+                    if thumbnail_size:
+                        thumbnails = {image_path: extra[1] for image_path, extra in extras.items()}
+                    if thumbnail_cache is not None:
+                        for image_path, thumbnail in thumbnails.items():
+                            thumbnail_cache.put(image_path, (thumbnail_size, thumbnail_size), thumbnail,
+                                                file_stats.get(image_path) if file_stats else None)
+                # Run YOLO detection
+                if exported:
+                    def predict(paths, items, conf, size=imgsz):
+                        # The items are already letterboxed to the size wanted
+                        return model.predict_prepared(paths, items, conf)
+                else:
+                    def predict(paths, items, conf, size=imgsz):
+                        return _predict_prepared(model, paths, items, conf, size)
+
+                def infer(paths, items, conf, size=imgsz):
+                    if pipeline is None:
+                        return predict(paths, items, conf, size)
+                    with pipeline.timed("inference"):
+                        return predict(paths, items, conf, size)
+
+                full_paths, full_items = misses, prepared
+                if low_letterbox is not None:
+                    # Low-resolution pass first; only the images it cannot decide go on at full size
+                    low_start = time.perf_counter()
+                    low_paths = [image_path for image_path in misses if extras[image_path][0] is not None]
+                    low_outputs = infer(low_paths, [extras[image_path][0] for image_path in low_paths],
+                                        adaptive.band(conf_threshold)[0], adaptive.low_imgsz)
+                    low_decided = adaptive.decide(low_paths, low_outputs, conf_threshold)
+                    full_start = time.perf_counter()
+                    full = [(image_path, item) for image_path, item in zip(misses, prepared)
+                            if image_path not in low_decided]
+                    full_paths, full_items = [p for p, _ in full], [item for _, item in full]
+                if not full_paths:
+                    outputs = []
+                elif full_items is not None:
+                    outputs = infer(full_paths, full_items, conf_threshold)
+                else:
+                    outputs = [_result_arrays(result)
+                               for result in _predict_batch(model, full_paths, conf_threshold, imgsz)]
+                if low_letterbox is not None:
+                    adaptive.add_times(full_start - low_start, len(full_paths), time.perf_counter() - full_start)
+                    summary.adaptive_stats = adaptive.stats()
+                computed = dict(low_decided)
+                computed.update(zip(full_paths, outputs))
+                if cache is not None:
+                    cache.put_many(computed, model_hash, cache_imgsz, conf_threshold, file_stats)
+                found.update(computed)
+            if pipeline is not None:
+                summary.pipeline_stats = pipeline.stats()
+            if cascade is not None:
+                cascade.add_detector_time(len(misses), time.perf_counter() - detect_start if misses else 0.0)
+                summary.cascade_stats = cascade.stats()
+            if dedup is not None:
+                # Representatives come earlier in the scan, so their results are known by now
+                dedup.record(found)
+                inherited = {image_path: dedup.inherit(image_path, representative)
+                             for image_path, representative in duplicates.items()}
+                if cache is not None and inherited:
+                    # Otherwise a rescan would infer one of them per scene, whose representative is a cache hit
+                    cache.put_many(inherited, model_hash, cache_imgsz, conf_threshold, file_stats)
+                found.update(inherited)
+                summary.dedup_stats = dedup.stats()
+
+            for image_path in batch:
+                boxes, confidences = found[image_path]
+                confidences = [float(conf) for conf in confidences]
+                if image_path in low_decided:
+                    stage = "low-res"
+                elif image_path in misses:
+                    stage = "detector"
+                elif image_path in duplicates:
+                    stage = "duplicate"
+                else:
+                    stage = "classifier" if image_path in decided else "cache"
+                record = {
+                    "image_path": image_path,
+                    "filename": os.path.basename(image_path),
+                    "boxes": boxes,
+                    "confidences": confidences,
+                    "max_confidence": max(confidences, default=0.0),
+                    "cached": stage == "cache",
+                    "stage": stage,
+                    "duplicate_of": duplicates.get(image_path),
+                    "index": index,
+                    "total": total,
+                    "thumbnail": thumbnails.get(image_path),
+                }
+                summary.add(record)
+                record["stats"] = summary.stats()
+                index += 1
+                yield record
+    finally:
+        if pipeline is not None:
+            pipeline.close()
+        if shards is not None:
+            shards.close()
+        if dedup is not None:
+            dedup.close()
+
+
+def detect_whiteboards(folder_path, model_path="./runs/detect/train19/weights/best.pt", conf_threshold=0.5,
+                       batch_size=1, imgsz=None, cache=None, prefetch_workers=0, prefetch_depth=None,
+                       reduced_decode=False, recursive=True, files=None, workers=0, threads_per_worker=None,
+                       backend="torch", cascade=None, dedup=None, adaptive=None):
     """
     Detect whiteboards in images from a folder.
 
     Args:
         folder_path (str): Path to folder containing images
-        model_path (str): Path to YOLO trained model weights
+        model_path (str): Path to YOLO trained model weights (.pt) or an exported .onnx model
         conf_threshold (float): Confidence threshold for detection
+        batch_size (int): Number of images sent to the model per forward pass
+        imgsz (int): Inference size (None uses the size the model was trained at)
+        cache (DetectionCache): Optional result cache; only new or modified images are inferred
+        prefetch_workers (int): Threads decoding and letterboxing images ahead of inference (0 = inline)
+        prefetch_depth (int): Maximum number of images decoded ahead of the model
+        reduced_decode (bool): Decode large JPEGs at reduced scale, just above the inference size
+        recursive (bool): Include images in subfolders (the Whiteboards output folder is skipped)
+        files (list): Explicit image paths to process instead of scanning ``folder_path``
+        workers (int): Worker processes with their own model replica (0 = this process,
+            None = ``default_worker_split()``)
+        threads_per_worker (int): ``torch.set_num_threads`` budget of each worker
+        backend (str): "torch", "onnx" or "openvino" (exported once, cached next to the weights)
+        cascade (Cascade): Optional classifier prefilter sending only ambiguous images to the detector
+        dedup (DuplicateFilter): Optional near-duplicate stage letting burst shots inherit results
+        adaptive (AdaptiveResolution): Optional low-resolution first pass escalating only ambiguous images
 
     Returns:
         dict: {
             "detected_images": list of image paths with detections,
             "undetected_images": list of image filenames without detections,
-            "stats": dictionary of summary statistics
+            "stats": dictionary of summary statistics (plus per-stage "pipeline" utilisation when
+                prefetching, "cascade" counts and timings when a cascade is used, "dedup"
+                counts, including inferences saved, when duplicates are skipped and "adaptive"
+                counts and timings per resolution with a low-resolution first pass)
         }
     """
-    model = YOLO(model_path)
+    summary = DetectionSummary()
+    for _ in iter_detections(folder_path, model_path, conf_threshold, batch_size, summary=summary,
+                             imgsz=imgsz, cache=cache, prefetch_workers=prefetch_workers,
+                             prefetch_depth=prefetch_depth, reduced_decode=reduced_decode,
+                             recursive=recursive, files=files, workers=workers,
+                             threads_per_worker=threads_per_worker, backend=backend, cascade=cascade,
+                             dedup=dedup, adaptive=adaptive):
+        pass
+    return summary.as_result()
 
-    detected_images = []
-    undetected_images = []
-    confidence_scores = []
-    image_confidences = {}
-    total_images = 0
-    detected_count = 0
-    total_detections = 0
 
-    for filename in os.listdir(folder_path):
-        if filename.lower().endswith((".jpg", ".jpeg", ".png", ".bmp")):
-            total_images += 1
-            image_path = os.path.join(folder_path, filename)
+def organize_detected_images(detected_image_paths, source_folder, mode="move"):
+    """
+    Move detected whiteboard images into a 'Whiteboards' folder, without printing.
 
-            # Run YOLO detection
-            results = model.predict(image_path, conf=conf_threshold, verbose=False)
+    Same-named files get a free name instead of being overwritten, and the moves
+    are journaled so an interrupted run is finished by the next one
+    (see ``Organizer``). Link modes leave the photos in place and make
+    'Whiteboards' an album of links or a manifest instead (see ``link_files``);
+    calling again with another set of photos only updates what changed.
 
-            # Load image for dimension reference
-            img = cv2.imread(image_path)
-            if img is not None:
-                img_height, img_width = img.shape[:2]
-            else:
-                img_width, img_height = 640, 640
-
-            detections = len(results[0].boxes)
-            if detections > 0:
-                detected_count += 1
-                total_detections += detections
-                detected_images.append(image_path)
-                max_conf = 0.0
-                for box in results[0].boxes:
-                    conf = float(box.conf[0])
-                    confidence_scores.append(conf)
-                    if conf > max_conf:
-                        max_conf = conf
-                image_confidences[image_path] = max_conf
-            else:
-                undetected_images.append(filename)
-
-    # Summary stats
-    detection_rate = (detected_count / total_images * 100) if total_images > 0 else 0
-    avg_detections = total_detections / detected_count if detected_count > 0 else 0
-    avg_confidence = np.mean(confidence_scores) if confidence_scores else 0
-    min_confidence = np.min(confidence_scores) if confidence_scores else 0
-    max_confidence = np.max(confidence_scores) if confidence_scores else 0
-
-    stats = {
-        "total_images": total_images,
-        "detected_count": detected_count,
-        "undetected_count": len(undetected_images),
-        "detection_rate": detection_rate,
-        "total_detections": total_detections,
-        "avg_detections": avg_detections,
-        "avg_confidence": avg_confidence,
-        "confidence_range": (min_confidence, max_confidence)
-    }
+    Args:
+        detected_image_paths (list): List of detected image paths
+        source_folder (str): Original source folder
+        mode (str): "move", or one of ``LINK_MODES`` / "manifest"
+
+    Returns:
+        dict: {
+            "moved": number of files moved (linked or listed ones in the other modes),
+            "renamed": {source: destination} for files moved under a free name,
+            "failed": [(source, error)],
+            "resumed": number of moves of an interrupted run finished first
+        }
+    """
+    whiteboards_folder = os.path.join(source_folder, "Whiteboards")
+    if mode != "move":
+        result = link_files(detected_image_paths, whiteboards_folder, mode)
+        # link_files normalizes the paths, so count what it reports rather than the input
+        moved = result["listed"] if mode == "manifest" else len(result["linked"]) + result["kept"]
+        return {
+            "moved": moved,
+            "renamed": result["renamed"],
+            "failed": result["failed"],
+            "resumed": 0,
+        }
 
+    result = organize_files(detected_image_paths, whiteboards_folder)
     return {
-        "detected_images": detected_images,
-        "undetected_images": undetected_images,
-        "stats": stats,
-        "image_confidences": image_confidences,
+        "moved": len(result["moved"]),
+        "renamed": result["renamed"],
+        "failed": result["failed"],
+        "resumed": len(result["resumed"]["moved"]) if result["resumed"] else 0,
     }
 
 
-def move_detected_images(detected_image_paths, source_folder):
+def move_detected_images(detected_image_paths, source_folder, mode="move"):
     """
-    Move detected whiteboard images into a 'Whiteboards' folder.
+    ``organize_detected_images``, reporting renamed and failed files on stderr.
 
     Args:
         detected_image_paths (list): List of detected image paths
         source_folder (str): Original source folder
+        mode (str): "move", or one of ``LINK_MODES`` / "manifest"
 
     Returns:
-        int: Number of successfully moved files
+        int: Number of successfully moved files (linked or listed ones in the other modes)
     """
-    whiteboards_folder = os.path.join(source_folder, "Whiteboards")
-    os.makedirs(whiteboards_folder, exist_ok=True)
-
-    moved_count = 0
-    for image_path in detected_image_paths:
-        try:
-            filename = os.path.basename(image_path)
-            destination_path = os.path.join(whiteboards_folder, filename)
-            shutil.move(image_path, destination_path)
-            moved_count += 1
-        except Exception as e:
-            print(f"❌ Failed to move {os.path.basename(image_path)}: {e}")
-
-    return moved_count
+    result = organize_detected_images(detected_image_paths, source_folder, mode)
+    if result["resumed"]:
+        print(f"↩️ Finished {result['resumed']} moves of an interrupted run", file=sys.stderr)
+    for src, dst in result["renamed"].items():
+        print(f"⚠️ {os.path.basename(src)} already exists in Whiteboards; moved as {os.path.basename(dst)}",
+              file=sys.stderr)
+    action = "move" if mode == "move" else "link"
+    for src, error in result["failed"]:
+        print(f"❌ Failed to {action} {os.path.basename(src)}: {error}", file=sys.stderr)
+
+    return result["moved"]
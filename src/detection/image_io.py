@@ -0,0 +1,108 @@
+import cv2
+import numpy as np
+from PIL import Image
+
+# JPEG decoders can scale by 1/2, 1/4 or 1/8 in the DCT domain, far cheaper than a full decode
+_REDUCED_FLAGS = {
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+}
+_JPEG_EXTENSIONS = (".jpg", ".jpeg")
+_EXIF_ORIENTATION = 0x0112
+
+
+def probe_size(image_path, oriented=False):
+    """
+    Read image dimensions from the file header without decoding pixels.
+
+    Args:
+        image_path (str): Image file
+        oriented (bool): Swap the sides when the EXIF orientation rotates the image by 90
+            degrees, giving the shape decoders return
+
+    Returns:
+        tuple: (height, width) as stored in the file, or None if unreadable
+    """
+    try:
+        with Image.open(image_path) as im:
+            width, height = im.size
+            if oriented and im.getexif().get(_EXIF_ORIENTATION, 1) in (5, 6, 7, 8):
+                width, height = height, width
+    except (OSError, SyntaxError, ValueError):
+        return None
+    return height, width
+
+
+def reduction_factor(shape, target_size):
+    """Largest JPEG scale-down (1, 2, 4 or 8) that keeps the long side at least ``target_size``."""
+    long_side = max(shape)
+    for factor in (8, 4, 2):
+        # libjpeg rounds scaled dimensions up
+        if -(-long_side // factor) >= target_size:
+            return factor
+    return 1
+
+
+def read_image(image_path, target_size=None):
+    """
+    Decode an image once, at reduced resolution when that is enough for the model.
+
+    Args:
+        image_path (str): Image file
+        target_size (int): Long side the model needs; JPEGs larger than a multiple of
+            this are decoded with DCT scaling. None always decodes at full size.
+
+    Returns:
+        tuple: (BGR image or None, original (height, width))
+    """
+    flags = cv2.IMREAD_COLOR
+    orig_shape = None
+    if target_size and image_path.lower().endswith(_JPEG_EXTENSIONS):
+        orig_shape = probe_size(image_path)
+        if orig_shape is not None:
+            flags = _REDUCED_FLAGS.get(reduction_factor(orig_shape, target_size), cv2.IMREAD_COLOR)
+
+    img = cv2.imdecode(np.fromfile(image_path, np.uint8), flags)
+    if img is None:
+        return None, orig_shape
+    if orig_shape is None:
+        return img, img.shape[:2]
+    # The header reports pre-EXIF-rotation dimensions; follow the decoded orientation
+    if (img.shape[0] > img.shape[1]) != (orig_shape[0] > orig_shape[1]):
+        orig_shape = (orig_shape[1], orig_shape[0])
+    return img, orig_shape
+
+
+def thumbnail_shape(shape, size):
+    """
+    (height, width) of an image of ``shape`` scaled to fit a ``size`` x ``size`` box.
+
+    Rounds like Qt's ``QSize.scaled(..., KeepAspectRatio)``, so thumbnails made
+    here match the ones the GUI reads from the file itself.
+    """
+    height, width = shape
+    scaled_width = size * width // height
+    if scaled_width <= size:
+        return size, max(1, scaled_width)
+    return max(1, size * height // width), size
+
+
+def encode_thumbnail(img, orig_shape, size, quality=90):
+    """
+    JPEG-encode a thumbnail of an already decoded image.
+
+    Args:
+        img (np.ndarray): BGR image, possibly decoded reduced
+        orig_shape (tuple): Full-resolution (height, width), which sets the thumbnail's aspect
+        size (int): Side of the box the thumbnail is scaled into
+        quality (int): JPEG quality
+
+    Returns:
+        bytes: Encoded thumbnail, or None if encoding failed
+    """
+    height, width = thumbnail_shape(orig_shape, size)
+    interpolation = cv2.INTER_AREA if width < img.shape[1] else cv2.INTER_LINEAR
+    thumbnail = cv2.resize(img, (width, height), interpolation=interpolation)
+    ok, data = cv2.imencode(".jpg", thumbnail, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return data.tobytes() if ok else None
@@ -0,0 +1,150 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from src.detection.backends import ModelLoadError, is_exported_model, load_exported_model
+
+# Keep the last few models warm (e.g. when switching between Whiteboard Model1..4)
+DEFAULT_MAX_MODELS = 3
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+
+def _model_key(model_path):
+    """Identify a weights file by resolved path plus size and mtime."""
+    resolved = os.path.realpath(model_path)
+    st = os.stat(resolved)
+    return resolved, st.st_mtime_ns, st.st_size
+
+
+_weights_hashes = {}
+
+
+def weights_hash(model_path):
+    """SHA-256 of a weights file, memoized per (path, mtime, size)."""
+    key = _model_key(model_path)
+    digest = _weights_hashes.get(key)
+    if digest is None:
+        sha = hashlib.sha256()
+        with open(key[0], "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                sha.update(chunk)
+        digest = _weights_hashes[key] = sha.hexdigest()
+    return digest
+
+
+def _estimate_model_bytes(model, file_size):
+    """Approximate resident size of a loaded model from its tensors."""
+    module = getattr(model, "model", None)
+    try:
+        params = sum(p.numel() * p.element_size() for p in module.parameters())
+        buffers = sum(b.numel() * b.element_size() for b in module.buffers())
+        return max(params + buffers, file_size)
+    except AttributeError:
+        # Exported formats (onnx, torchscript...) keep a path here, not a module
+        return file_size
+
+
+def load_model(model_path):
+    """Load PyTorch weights with ultralytics and exported artifacts with their own runtime."""
+    if is_exported_model(model_path):
+        return load_exported_model(model_path)
+    # Imported on first load so importing the detection package stays cheap
+    from ultralytics import YOLO
+
+    return YOLO(model_path)
+
+
+class ModelCache:
+    """
+    Process-wide LRU cache of loaded YOLO models.
+
+    Entries are keyed by (resolved path, mtime, size) so retraining or replacing
+    a weights file is picked up automatically. The cache holds at most
+    ``max_models`` models and evicts least recently used ones once the estimated
+    memory of the resident models exceeds ``max_bytes``. The most recently
+    requested model is always kept, even if it alone exceeds the cap.
+    """
+
+    def __init__(self, max_models=DEFAULT_MAX_MODELS, max_bytes=DEFAULT_MAX_BYTES, loader=load_model):
+        self.max_models = max(1, int(max_models))
+        self.max_bytes = int(max_bytes)
+        self._loader = loader
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, model_path):
+        """
+        Return a loaded model for ``model_path``, loading it on a miss.
+
+        Raises:
+            ModelLoadError: if the file is missing or cannot be loaded
+        """
+        try:
+            key = _model_key(model_path)
+        except OSError as e:
+            raise ModelLoadError(f"Could not load {model_path}: {e}") from e
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+            self.misses += 1
+            # Drop stale versions of the same file (weights replaced on disk)
+            for stale in [k for k in self._entries if k[0] == key[0]]:
+                del self._entries[stale]
+
+            try:
+                model = self._loader(key[0])
+            except Exception as e:
+                raise ModelLoadError(f"Could not load {model_path}: {e}") from e
+            self._entries[key] = (model, _estimate_model_bytes(model, key[2]))
+            self._evict()
+            return model
+
+    def _evict(self):
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_models or self.resident_bytes() > self.max_bytes
+        ):
+            self._entries.popitem(last=False)
+
+    def resident_bytes(self):
+        """Estimated memory used by the cached models."""
+        with self._lock:
+            return sum(size for _, size in self._entries.values())
+
+    def paths(self):
+        """Resolved paths of resident models, least recently used first."""
+        with self._lock:
+            return [key[0] for key in self._entries]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "models": len(self._entries),
+                "resident_bytes": self.resident_bytes(),
+                "max_models": self.max_models,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_default_cache = ModelCache()
+
+
+def get_model(model_path):
+    """Load ``model_path`` through the shared process-wide cache."""
+    return _default_cache.get(model_path)
+
+
+def get_model_cache():
+    """Return the shared process-wide model cache."""
+    return _default_cache
@@ -0,0 +1,527 @@
+import errno
+import hashlib
+import json
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Cross-filesystem copies are I/O bound, so a few streams in flight keep a NAS busy
+DEFAULT_WORKERS = 4
+_CHUNK = 1024 * 1024
+# How filesystems without hard links (FAT, exFAT, some network shares) refuse os.link
+_NO_HARDLINK_ERRNOS = (errno.EPERM, errno.EOPNOTSUPP, errno.ENOTSUP, errno.ENOSYS, errno.EINVAL, errno.EMLINK)
+
+# "link" uses the first of hardlink, reflink, symlink the filesystem supports
+LINK_MODES = ("link", "hardlink", "reflink", "symlink")
+ORGANIZE_MODES = ("move", "manifest") + LINK_MODES
+# Linux FICLONE ioctl: share the source's data blocks (Btrfs, XFS, bcachefs...)
+_FICLONE = 0x40049409
+
+
+def journal_path(destination):
+    """Journal of the moves into ``destination``, stored inside it."""
+    return os.path.join(destination, ".whiteboard-journal.jsonl")
+
+
+def album_path(destination):
+    """Record of the links ``link_files`` keeps in ``destination``."""
+    return os.path.join(destination, ".whiteboard-album.json")
+
+
+def manifest_path(destination):
+    """Plain-text album (one absolute photo path per line) written in "manifest" mode."""
+    return os.path.join(destination, "album.txt")
+
+
+def collision_free_name(filename, taken):
+    """
+    ``filename``, or ``name (1).ext``, ``name (2).ext``... if it is already in ``taken``.
+
+    ``taken`` holds lowercased names so case-insensitive filesystems are safe too;
+    the chosen name is added to it.
+    """
+    stem, ext = os.path.splitext(filename)
+    candidate, n = filename, 0
+    while candidate.lower() in taken:
+        n += 1
+        candidate = f"{stem} ({n}){ext}"
+    taken.add(candidate.lower())
+    return candidate
+
+
+def _copy_file(src, dst):
+    """Copy ``src`` to the new file ``dst`` in the kernel where possible, then fsync it."""
+    with open(src, "rb") as fsrc, open(dst, "xb") as fdst:
+        size = os.fstat(fsrc.fileno()).st_size
+        copied = 0
+        if hasattr(os, "copy_file_range"):
+            try:
+                while copied < size:
+                    n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), size - copied)
+                    if n == 0:
+                        break
+                    copied += n
+            except OSError as e:
+                # Unsupported between these filesystems; fall back to a user-space copy
+                if copied or e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+                    raise
+        if copied < size:
+            fsrc.seek(copied)
+            fdst.seek(copied)
+            shutil.copyfileobj(fsrc, fdst, _CHUNK)
+        fdst.flush()
+        os.fsync(fdst.fileno())
+    shutil.copystat(src, dst)
+
+
+def _digest(path):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            h.update(chunk)
+    return h.digest()
+
+
+def _same_content(a, b):
+    return os.path.getsize(a) == os.path.getsize(b) and _digest(a) == _digest(b)
+
+
+def _rename_exclusive(src, dst):
+    """
+    Rename ``src`` to ``dst``, raising ``FileExistsError`` instead of replacing ``dst``.
+
+    ``os.rename`` silently replaces a file created at ``dst`` after any check
+    (on POSIX), so the file is hard-linked to ``dst``, which fails if the name
+    is taken, and then unlinked from ``src``. Filesystems without hard links
+    (FAT, some network shares) fall back to check-then-rename.
+    """
+    if not os.path.islink(src):
+        try:
+            os.link(src, dst)
+        except OSError as e:
+            if e.errno not in _NO_HARDLINK_ERRNOS:
+                raise
+        else:
+            try:
+                os.unlink(src)
+            except BaseException:
+                os.unlink(dst)
+                raise
+            return
+    if os.path.lexists(dst):
+        raise FileExistsError(errno.EEXIST, "Destination exists", dst)
+    os.rename(src, dst)
+
+
+def _transfer(src, dst):
+    """
+    Move ``src`` to ``dst`` without ever overwriting an existing file.
+
+    Uses an atomic exclusive rename on the same filesystem (see ``_rename_exclusive``). Across filesystems the file is
+    copied to ``dst.part``, verified against the source, renamed into place and
+    only then is the source removed, so a crash never leaves a torn ``dst``.
+
+    Returns:
+        str: "rename" or "copy"
+    """
+    if os.path.lexists(dst):
+        raise FileExistsError(errno.EEXIST, "Destination exists", dst)
+    try:
+        _rename_exclusive(src, dst)
+        return "rename"
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    part = dst + ".part"
+    if os.path.lexists(part):
+        os.remove(part)
+    try:
+        _copy_file(src, part)
+        if not _same_content(src, part):
+            raise OSError(errno.EIO, "Copy verification failed", dst)
+        _rename_exclusive(part, dst)
+    except BaseException:
+        if os.path.lexists(part):
+            os.remove(part)
+        raise
+    os.remove(src)
+    return "copy"
+
+
+class Organizer:
+    """
+    Moves files into one destination folder, journaled so a crash loses nothing.
+
+    Every batch is first planned: sources are sorted and each gets a free name
+    in the destination (``name (1).ext`` on collisions), so the same files and
+    folder state always give the same names and nothing is overwritten. The plan
+    is written to an append-only JSON-lines journal (see ``journal_path``)
+    before any file is touched, followed by one record per finished move. Moves
+    run on a thread pool: same-filesystem moves are atomic renames, others are
+    verified copies (see ``_transfer``).
+
+    After an interruption ``resume()`` finishes the planned moves and
+    ``rollback()`` puts the moved files back; both work out what actually
+    happened from the files on disk, so records lost in a crash do not matter.
+    ``organize()`` resumes an unfinished journal before planning a new batch.
+    """
+
+    def __init__(self, destination, workers=DEFAULT_WORKERS):
+        self.destination = os.path.abspath(destination)
+        self.journal_path = journal_path(self.destination)
+        self.workers = max(1, int(workers))
+        self._lock = threading.Lock()
+        self._journal = None
+
+    # --- journal ---
+    def _read_journal(self):
+        """Return (entries {id: {"src", "dst", "state"}}, finished) from the journal on disk."""
+        entries = {}
+        finished = True
+        try:
+            with open(self.journal_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Torn last line of an interrupted write
+                        continue
+                    op = record.get("op")
+                    if op == "plan":
+                        entries[record["id"]] = {"src": record["src"], "dst": record["dst"], "state": "planned"}
+                        finished = False
+                    elif op in ("done", "failed", "undone") and record.get("id") in entries:
+                        entries[record["id"]]["state"] = op
+                    elif op in ("complete", "rolled_back"):
+                        finished = True
+        except FileNotFoundError:
+            pass
+        return entries, finished
+
+    def _open_journal(self, truncate=False):
+        os.makedirs(self.destination, exist_ok=True)
+        self._journal = open(self.journal_path, "w" if truncate else "a", encoding="utf-8")
+
+    def _log(self, record, sync=False):
+        with self._lock:
+            self._journal.write(json.dumps(record) + "\n")
+            self._journal.flush()
+            if sync:
+                os.fsync(self._journal.fileno())
+
+    def _close_journal(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def has_unfinished(self):
+        """Whether an earlier batch was interrupted before it completed or was rolled back."""
+        return not self._read_journal()[1]
+
+    # --- running moves ---
+    def _run(self, jobs, action):
+        """Run ``action(entry_id, src, dst)`` for every job on the pool; returns {id: error or None}."""
+        def run(job):
+            entry_id, src, dst = job
+            try:
+                action(entry_id, src, dst)
+                return entry_id, None
+            except Exception as e:
+                self._log({"op": "failed", "id": entry_id, "error": str(e)})
+                return entry_id, e
+
+        if self.workers == 1 or len(jobs) < 2:
+            return dict(run(job) for job in jobs)
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="organizer") as pool:
+            return dict(pool.map(run, jobs))
+
+    def _finish_move(self, entry_id, src, dst):
+        """Complete one planned move, whatever state a crash left it in."""
+        part = dst + ".part"
+        if os.path.lexists(part):
+            os.remove(part)
+        src_exists, dst_exists = os.path.lexists(src), os.path.lexists(dst)
+        if dst_exists and src_exists:
+            # The verified copy or the exclusive-rename link was in place, removing the source was not
+            if not _same_content(src, dst):
+                raise FileExistsError(errno.EEXIST, "Destination exists", dst)
+            os.remove(src)
+        elif src_exists:
+            _transfer(src, dst)
+        elif not dst_exists:
+            raise FileNotFoundError(errno.ENOENT, "Source is missing", src)
+        self._log({"op": "done", "id": entry_id})
+
+    def _undo_move(self, entry_id, src, dst):
+        part = dst + ".part"
+        if os.path.lexists(part):
+            os.remove(part)
+        src_exists, dst_exists = os.path.lexists(src), os.path.lexists(dst)
+        if dst_exists and src_exists:
+            if not _same_content(src, dst):
+                raise FileExistsError(errno.EEXIST, "Original location is taken", src)
+            os.remove(dst)
+        elif dst_exists:
+            os.makedirs(os.path.dirname(src), exist_ok=True)
+            _transfer(dst, src)
+        elif not src_exists:
+            raise FileNotFoundError(errno.ENOENT, "Moved file is missing", dst)
+        self._log({"op": "undone", "id": entry_id})
+
+    @staticmethod
+    def _result(entries, errors):
+        moved = [(entries[i]["src"], entries[i]["dst"]) for i in sorted(errors) if errors[i] is None]
+        failed = [(entries[i]["src"], str(errors[i])) for i in sorted(errors) if errors[i] is not None]
+        return {"moved": moved, "failed": failed}
+
+    # --- public API ---
+    def organize(self, paths):
+        """
+        Move ``paths`` into the destination folder.
+
+        Args:
+            paths (list): Files to move; files already directly in the destination are skipped
+
+        Returns:
+            dict: {"moved": [(src, dst)], "failed": [(src, error message)],
+                   "renamed": {src: dst} for files that got a collision-free name,
+                   "resumed": result of the interrupted batch finished first, or None}
+        """
+        resumed = self.resume() if self.has_unfinished() else None
+        os.makedirs(self.destination, exist_ok=True)
+        taken = {name.lower() for name in os.listdir(self.destination)}
+        sources = sorted({os.path.abspath(p) for p in paths})
+        sources = [p for p in sources if os.path.dirname(p) != self.destination]
+
+        entries = {}
+        renamed = {}
+        for entry_id, src in enumerate(sources):
+            filename = os.path.basename(src)
+            name = collision_free_name(filename, taken)
+            dst = os.path.join(self.destination, name)
+            entries[entry_id] = {"src": src, "dst": dst}
+            if name != filename:
+                renamed[src] = dst
+
+        self._open_journal(truncate=True)
+        try:
+            for entry_id, entry in entries.items():
+                self._log({"op": "plan", "id": entry_id, "src": entry["src"], "dst": entry["dst"]})
+            with self._lock:
+                os.fsync(self._journal.fileno())
+            jobs = [(entry_id, entry["src"], entry["dst"]) for entry_id, entry in entries.items()]
+            errors = self._run(jobs, self._finish_move)
+            self._log({"op": "complete"}, sync=True)
+        finally:
+            self._close_journal()
+        result = self._result(entries, errors)
+        result["renamed"] = renamed
+        result["resumed"] = resumed
+        return result
+
+    def resume(self):
+        """
+        Finish the moves of an interrupted batch.
+
+        Returns:
+            dict: {"moved": [(src, dst)], "failed": [(src, error message)]} for the moves still pending
+        """
+        entries, finished = self._read_journal()
+        if finished:
+            return {"moved": [], "failed": []}
+        jobs = [(i, e["src"], e["dst"]) for i, e in entries.items() if e["state"] == "planned"]
+        self._open_journal()
+        try:
+            errors = self._run(jobs, self._finish_move)
+            self._log({"op": "complete"}, sync=True)
+        finally:
+            self._close_journal()
+        return self._result(entries, errors)
+
+    def rollback(self):
+        """
+        Move the files of the last batch (finished or interrupted) back where they came from.
+
+        Returns:
+            dict: {"moved": [(dst, src)], "failed": [(dst, error message)]}
+        """
+        entries, _ = self._read_journal()
+        jobs = [(i, e["src"], e["dst"]) for i, e in sorted(entries.items(), reverse=True)
+                if e["state"] in ("planned", "done")]
+        if not jobs:
+            return {"moved": [], "failed": []}
+        self._open_journal()
+        try:
+            errors = self._run(jobs, self._undo_move)
+            self._log({"op": "rolled_back"}, sync=True)
+        finally:
+            self._close_journal()
+        moved = [(entries[i]["dst"], entries[i]["src"]) for i in sorted(errors) if errors[i] is None]
+        failed = [(entries[i]["dst"], str(errors[i])) for i in sorted(errors) if errors[i] is not None]
+        return {"moved": moved, "failed": failed}
+
+
+def organize_files(paths, destination, workers=DEFAULT_WORKERS):
+    """Move ``paths`` into ``destination`` with an ``Organizer``; see ``Organizer.organize``."""
+    return Organizer(destination, workers).organize(paths)
+
+
+# --- organize by link ---
+def _reflink(src, dst):
+    try:
+        import fcntl
+    except ImportError:
+        raise OSError(errno.EOPNOTSUPP, "Reflinks are not supported on this platform", dst)
+    with open(src, "rb") as fsrc, open(dst, "xb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        except OSError:
+            fdst.close()
+            os.remove(dst)
+            raise
+    shutil.copystat(src, dst)
+
+
+_LINKERS = {"hardlink": os.link, "reflink": _reflink, "symlink": os.symlink}
+
+
+def _make_link(src, dst, mode):
+    """Link ``dst`` to ``src`` with the first method of ``mode`` that works; returns the method."""
+    if not os.path.exists(src):
+        # A symlink would still succeed and leave a dangling entry in the album
+        raise FileNotFoundError(errno.ENOENT, "Source is missing", src)
+    methods = ("hardlink", "reflink", "symlink") if mode == "link" else (mode,)
+    error = None
+    for method in methods:
+        try:
+            _LINKERS[method](src, dst)
+            return method
+        except OSError as e:
+            if e.errno == errno.EEXIST:
+                raise
+            error = e
+    raise error
+
+
+def _is_link_to(dst, src, method):
+    """Whether ``dst`` is still the link to ``src`` created with ``method`` (reflinks cannot be told apart)."""
+    try:
+        if os.path.islink(dst):
+            return method in (None, "symlink") and os.readlink(dst) == src
+        if method in (None, "hardlink"):
+            return os.path.samefile(dst, src)
+        return method == "reflink" and os.path.getsize(dst) == os.path.getsize(src)
+    except OSError:
+        return False
+
+
+def _read_album(destination):
+    try:
+        with open(album_path(destination), encoding="utf-8") as f:
+            album = json.load(f)
+        return album.get("mode"), album.get("entries", {})
+    except (OSError, ValueError):
+        return None, {}
+
+
+def _write_album(destination, mode, entries):
+    path = album_path(destination)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"mode": mode, "entries": entries}, f)
+    os.replace(path + ".tmp", path)
+
+
+def link_files(paths, destination, mode="link", workers=DEFAULT_WORKERS):
+    """
+    Make ``destination`` show exactly ``paths`` without moving or copying photo data.
+
+    Link modes create hardlinks, reflinks or symlinks (see ``LINK_MODES``);
+    "manifest" writes ``manifest_path`` instead. Created links are recorded in
+    the album file, so calling again with a different set (e.g. after a
+    threshold change) only adds the new links and removes the dropped ones.
+    Links are named like moved files would be, with collision-free names.
+    Links left unrecorded by an interrupted run are adopted, not duplicated.
+
+    Args:
+        paths (list): Photos the album should contain
+        destination (str): Album folder, created if needed
+        mode (str): One of ``LINK_MODES`` or "manifest"
+        workers (int): Threads creating links (helps on network shares)
+
+    Returns:
+        dict: {"linked": [(src, dst, method)] created now, "kept": number already linked,
+               "removed": number of links dropped, "failed": [(src, error message)],
+               "renamed": {src: dst} for links that got a collision-free name,
+               "listed": number of photos in the manifest (manifest mode only)}
+    """
+    if mode not in LINK_MODES + ("manifest",):
+        raise ValueError(f"Unknown link mode: {mode}")
+    destination = os.path.abspath(destination)
+    os.makedirs(destination, exist_ok=True)
+    wanted = sorted({os.path.abspath(p) for p in paths})
+    old_mode, entries = _read_album(destination)
+    keep_links = mode != "manifest" and old_mode not in (None, "manifest") and (old_mode == mode or mode == "link")
+
+    # Drop links of photos no longer wanted (all of them when the mode changed)
+    wanted_set = set(wanted)
+    removed = 0
+    for src in list(entries):
+        name, method = entries[src]
+        dst = os.path.join(destination, name)
+        if keep_links and src in wanted_set and _is_link_to(dst, src, method):
+            continue
+        if _is_link_to(dst, src, method):
+            os.remove(dst)
+            removed += 1
+        del entries[src]
+
+    result = {"linked": [], "kept": len(entries), "removed": removed, "failed": [], "renamed": {}}
+    if mode == "manifest":
+        with open(manifest_path(destination) + ".tmp", "w", encoding="utf-8") as f:
+            f.writelines(p + "\n" for p in wanted)
+        os.replace(manifest_path(destination) + ".tmp", manifest_path(destination))
+        _write_album(destination, mode, {})
+        result["listed"] = len(wanted)
+        return result
+    if os.path.exists(manifest_path(destination)):
+        os.remove(manifest_path(destination))
+
+    taken = {name.lower() for name in os.listdir(destination)}
+    jobs = []
+    for src in wanted:
+        if src in entries:
+            continue
+        filename = os.path.basename(src)
+        dst = os.path.join(destination, filename)
+        if _is_link_to(dst, src, None):
+            # Created by a run that stopped before recording it
+            entries[src] = [filename, "symlink" if os.path.islink(dst) else "hardlink"]
+            result["kept"] += 1
+            continue
+        name = collision_free_name(filename, taken)
+        if name != filename:
+            result["renamed"][src] = os.path.join(destination, name)
+        jobs.append((src, os.path.join(destination, name)))
+
+    def link(job):
+        src, dst = job
+        try:
+            return src, dst, _make_link(src, dst, mode), None
+        except OSError as e:
+            return src, dst, None, e
+
+    if workers > 1 and len(jobs) > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="organizer") as pool:
+            outcomes = list(pool.map(link, jobs))
+    else:
+        outcomes = [link(job) for job in jobs]
+    for src, dst, method, error in outcomes:
+        if error is not None:
+            result["failed"].append((src, str(error)))
+            result["renamed"].pop(src, None)
+            continue
+        entries[src] = [os.path.basename(dst), method]
+        result["linked"].append((src, dst, method))
+    _write_album(destination, mode, entries)
+    return result
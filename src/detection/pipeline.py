@@ -0,0 +1,119 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+def default_prefetch_workers():
+    """Decode threads to use when none are configured (leave a core for inference)."""
+    return max(1, min(8, (os.cpu_count() or 2) - 1))
+
+
+class PrefetchPipeline:
+    """
+    Bounded producer/consumer pipeline that prepares images ahead of inference.
+
+    A thread pool runs ``load`` (decode + letterbox) on upcoming images while
+    the caller runs the model on the current batch. At most ``depth`` images
+    are in flight, so memory stays bounded however large the folder is. Busy
+    time is tracked per stage so ``stats()`` can tell whether decoding or
+    inference is the bottleneck.
+    """
+
+    def __init__(self, load, workers=None, depth=None):
+        self.workers = max(1, int(workers or default_prefetch_workers()))
+        self.depth = max(1, int(depth or self.workers * 4))
+        self._load = load
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+        self._busy = {"decode": 0.0, "inference": 0.0}
+        self._wait = 0.0
+        self._images = 0
+        self._started = None
+
+    def _timed_load(self, item):
+        start = time.perf_counter()
+        try:
+            return self._load(item)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._busy["decode"] += elapsed
+
+    def map_batches(self, batches):
+        """
+        Prepare batches ahead of the consumer, preserving order.
+
+        Args:
+            batches: iterable of (key, items) pairs
+
+        Yields:
+            (key, prepared): ``prepared`` holds ``load(item)`` for each item
+        """
+        if self._started is None:
+            self._started = time.perf_counter()
+        inflight = deque()
+        queued = 0
+        for key, items in batches:
+            inflight.append((key, [self._executor.submit(self._timed_load, item) for item in items]))
+            queued += len(items)
+            # Hand back the oldest batch once the prefetch queue is full
+            while inflight and queued - len(inflight[0][1]) >= self.depth:
+                key0, futures = inflight.popleft()
+                queued -= len(futures)
+                yield key0, self._collect(futures)
+        while inflight:
+            key0, futures = inflight.popleft()
+            yield key0, self._collect(futures)
+
+    def _collect(self, futures):
+        start = time.perf_counter()
+        prepared = [future.result() for future in futures]
+        self._wait += time.perf_counter() - start
+        self._images += len(prepared)
+        return prepared
+
+    def timed(self, stage):
+        """Context manager adding the enclosed time to ``stage``'s busy time."""
+        return _StageTimer(self, stage)
+
+    def stats(self):
+        """Per-stage busy time and utilisation since the pipeline started."""
+        wall = time.perf_counter() - self._started if self._started is not None else 0.0
+        with self._lock:
+            decode, inference = self._busy["decode"], self._busy["inference"]
+        decode_util = decode / (wall * self.workers) if wall > 0 else 0.0
+        inference_util = inference / wall if wall > 0 else 0.0
+        return {
+            "images": self._images,
+            "wall_time": wall,
+            "decode_workers": self.workers,
+            "queue_depth": self.depth,
+            "decode_time": decode,
+            "inference_time": inference,
+            # Time the inference loop sat idle waiting for decoded images
+            "starved_time": self._wait,
+            "decode_utilisation": decode_util,
+            "inference_utilisation": inference_util,
+            "bottleneck": "decode" if self._wait > inference else "inference",
+        }
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+class _StageTimer:
+    def __init__(self, pipeline, stage):
+        self._pipeline = pipeline
+        self._stage = stage
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self._start
+        with self._pipeline._lock:
+            self._pipeline._busy[self._stage] = self._pipeline._busy.get(self._stage, 0.0) + elapsed
+        return False
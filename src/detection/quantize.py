@@ -0,0 +1,268 @@
+import argparse
+import json
+import os
+import random
+import sys
+import numpy as np
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.detection.backends import Letterbox, export_model, import_runtime
+from src.detection.detection_module import iter_detections
+from src.detection.image_io import probe_size, read_image
+from src.detection.scanner import iter_image_files
+
+DEFAULT_VAL_IMAGES = os.path.join(PROJECT_ROOT, "data", "images", "val")
+DEFAULT_VAL_LABELS = os.path.join(PROJECT_ROOT, "data", "Labels", "Val")
+DEFAULT_CALIBRATION_IMAGES = 100
+# Largest allowed absolute drop in mAP50, precision or recall versus the fp32 model
+DEFAULT_TOLERANCE = 0.01
+# Precision/recall are reported at the threshold the app runs at
+DEFAULT_CONF = 0.5
+# Low floor used to rank detections for mAP, as ultralytics' validator does
+_EVAL_CONF = 0.001
+
+
+def quantized_model_path(model_path):
+    """Where the INT8 model of ``model_path`` is published (beside the weights)."""
+    return os.path.splitext(model_path)[0] + "_int8.onnx"
+
+
+class _CalibrationReader:
+    """Feeds letterboxed calibration images to ONNX Runtime one at a time (a ``CalibrationDataReader``)."""
+
+    def __init__(self, image_paths, input_name, letterbox):
+        self._image_paths = iter(image_paths)
+        self._input_name = input_name
+        self._letterbox = letterbox
+
+    def get_next(self):
+        for image_path in self._image_paths:
+            img, _ = read_image(image_path)
+            if img is None:
+                continue
+            img = self._letterbox(img)
+            batch = np.ascontiguousarray(img[None, ..., ::-1].transpose(0, 3, 1, 2), dtype=np.float32) / 255.0
+            return {self._input_name: batch}
+        return None
+
+
+def _head_nodes(onnx_path):
+    """Non-conv nodes of the Detect head (box decoding); they stay in float for accuracy."""
+    onnx = import_runtime("onnx")
+
+    graph = onnx.load(onnx_path).graph
+    layers = [int(n.name.split("/")[1].split(".")[1]) for n in graph.node if n.name.startswith("/model.")]
+    head = f"/model.{max(layers)}/"
+    return [n.name for n in graph.node if n.name.startswith(head) and n.op_type != "Conv"]
+
+
+def quantize_model(fp32_path, output_path, calibration_images):
+    """
+    Post-training static INT8 quantization (QDQ, per-channel weights, MinMax calibration).
+
+    Args:
+        fp32_path (str): Exported fp32 ONNX model
+        output_path (str): Where to write the INT8 model
+        calibration_images (list): Images used to calibrate activation ranges
+    """
+    quantization = import_runtime("onnxruntime.quantization")
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+    from src.detection.backends import OnnxRuntimeModel
+
+    fp32 = OnnxRuntimeModel(fp32_path)
+    # Calibrate at the fixed export size so every sample has the same shape
+    letterbox = Letterbox(fp32.imgsz, auto=False, stride=fp32.stride)
+    reader = _CalibrationReader(calibration_images, fp32.session.get_inputs()[0].name, letterbox)
+    # Fold constants and infer shapes first so the quantizer sees every Conv bias as an initializer
+    prepared_path = os.path.splitext(output_path)[0] + ".prep.onnx"
+    quant_pre_process(fp32_path, prepared_path, skip_symbolic_shape=True)
+    try:
+        quantization.quantize_static(prepared_path, output_path, reader,
+                                     quant_format=quantization.QuantFormat.QDQ,
+                                     activation_type=quantization.QuantType.QUInt8,
+                                     weight_type=quantization.QuantType.QInt8,
+                                     per_channel=True,
+                                     calibrate_method=quantization.CalibrationMethod.MinMax,
+                                     nodes_to_exclude=_head_nodes(prepared_path))
+    finally:
+        os.remove(prepared_path)
+
+
+def _load_labels(label_path, image_shape):
+    """YOLO txt labels (class cx cy w h, normalised) as (classes, xyxy pixel boxes)."""
+    try:
+        with open(label_path, "r", encoding="utf-8") as f:
+            rows = [line.split()[:5] for line in f if line.strip()]
+    except OSError:
+        rows = []
+    rows = np.asarray(rows, dtype=np.float32).reshape(-1, 5)
+    if rows.size == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros((0, 4), dtype=np.float32)
+    h, w = image_shape
+    cx, cy, bw, bh = rows[:, 1] * w, rows[:, 2] * h, rows[:, 3] * w, rows[:, 4] * h
+    boxes = np.stack([cx - bw / 2, cy - bh / 2, cx + bw / 2, cy + bh / 2], axis=1)
+    return rows[:, 0].astype(np.int64), boxes
+
+
+def _iou(box, boxes):
+    w = np.clip(np.minimum(box[2], boxes[:, 2]) - np.maximum(box[0], boxes[:, 0]), 0, None)
+    h = np.clip(np.minimum(box[3], boxes[:, 3]) - np.maximum(box[1], boxes[:, 1]), 0, None)
+    inter = w * h
+    union = (box[2] - box[0]) * (box[3] - box[1]) + (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1]) - inter
+    return inter / np.maximum(union, 1e-9)
+
+
+def _average_precision(tp, conf, n_truth):
+    """Area under the precision/recall curve (101-point interpolation, as COCO/ultralytics)."""
+    if n_truth == 0 or tp.size == 0:
+        return 0.0
+    order = np.argsort(-conf, kind="stable")
+    tp_cum = np.cumsum(tp[order])
+    recall = tp_cum / n_truth
+    precision = tp_cum / np.arange(1, tp.size + 1)
+    # Precision envelope
+    mpre = np.concatenate([[1.0], precision, [0.0]])
+    mrec = np.concatenate([[0.0], recall, [1.0]])
+    mpre = np.flip(np.maximum.accumulate(np.flip(mpre)))
+    return float(np.interp(np.linspace(0, 1, 101), mrec, mpre).mean())
+
+
+def evaluate(model_path, image_paths, labels_dir, conf_threshold=DEFAULT_CONF, iou_threshold=0.5):
+    """
+    Score a detector on labelled images.
+
+    Detections are matched greedily (highest confidence first) to unmatched
+    ground-truth boxes of the same class with IoU >= ``iou_threshold``.
+
+    Returns:
+        dict: {"map50", "precision", "recall", "images", "instances"}
+    """
+    all_tp, all_conf, all_classes = [], [], []
+    truth_counts = {}
+    for record in iter_detections(None, model_path, _EVAL_CONF, files=image_paths, reduced_decode=False):
+        # Header only; boxes are reported in the EXIF-rotated frame the decoder returns
+        shape = probe_size(record["image_path"], oriented=True)
+        stem = os.path.splitext(os.path.basename(record["image_path"]))[0]
+        truth_classes, truth_boxes = _load_labels(os.path.join(labels_dir, stem + ".txt"), shape)
+        for cls in truth_classes.tolist():
+            truth_counts[cls] = truth_counts.get(cls, 0) + 1
+
+        boxes = np.asarray(record["boxes"], dtype=np.float32).reshape(-1, 4)
+        confidences = np.asarray(record["confidences"], dtype=np.float32)
+        # Single-class detectors report class 0 for every box
+        classes = np.zeros(len(confidences), dtype=np.int64)
+        matched = np.zeros(len(truth_boxes), dtype=bool)
+        tp = np.zeros(len(confidences), dtype=bool)
+        for i in np.argsort(-confidences, kind="stable"):
+            candidates = np.flatnonzero((truth_classes == classes[i]) & ~matched)
+            if candidates.size == 0:
+                continue
+            ious = _iou(boxes[i], truth_boxes[candidates])
+            best = int(np.argmax(ious))
+            if ious[best] >= iou_threshold:
+                matched[candidates[best]] = True
+                tp[i] = True
+        all_tp.append(tp)
+        all_conf.append(confidences)
+        all_classes.append(classes)
+
+    tp = np.concatenate(all_tp) if all_tp else np.zeros(0, dtype=bool)
+    conf = np.concatenate(all_conf) if all_conf else np.zeros(0, dtype=np.float32)
+    classes = np.concatenate(all_classes) if all_classes else np.zeros(0, dtype=np.int64)
+    n_truth = sum(truth_counts.values())
+
+    aps = [_average_precision(tp[classes == cls], conf[classes == cls], count)
+           for cls, count in truth_counts.items()]
+    kept = conf >= conf_threshold
+    n_kept = int(kept.sum())
+    n_tp = int(tp[kept].sum())
+    return {
+        "map50": float(np.mean(aps)) if aps else 0.0,
+        "precision": n_tp / n_kept if n_kept else 0.0,
+        "recall": n_tp / n_truth if n_truth else 0.0,
+        "images": len(image_paths),
+        "instances": n_truth,
+    }
+
+
+def quantize_and_validate(model_path, val_images=DEFAULT_VAL_IMAGES, val_labels=DEFAULT_VAL_LABELS,
+                          calibration_size=DEFAULT_CALIBRATION_IMAGES, tolerance=DEFAULT_TOLERANCE,
+                          conf_threshold=DEFAULT_CONF, seed=0):
+    """
+    Quantize ``model_path`` to INT8 and publish it only if accuracy holds.
+
+    The fp32 and INT8 models are both run through the ONNX Runtime backend on
+    the val set, so the comparison isolates the effect of quantization. The
+    INT8 model is published as ``<weights>_int8.onnx`` (with a ``.json``
+    report beside it) only when mAP50, precision and recall each drop by at
+    most ``tolerance``.
+
+    Returns:
+        dict: {"fp32": metrics, "int8": metrics, "published": bool, "path": published path or None}
+    """
+    image_paths = list(iter_image_files(val_images))
+    if not image_paths:
+        raise FileNotFoundError(f"No validation images found in {val_images}")
+    calibration = random.Random(seed).sample(image_paths, min(calibration_size, len(image_paths)))
+
+    fp32_path = export_model(model_path, "onnx")
+    target = quantized_model_path(model_path)
+    candidate = os.path.splitext(target)[0] + ".tmp.onnx"
+    quantize_model(fp32_path, candidate, calibration)
+    try:
+        fp32 = evaluate(fp32_path, image_paths, val_labels, conf_threshold)
+        int8 = evaluate(candidate, image_paths, val_labels, conf_threshold)
+        drops = {metric: fp32[metric] - int8[metric] for metric in ("map50", "precision", "recall")}
+        published = all(drop <= tolerance for drop in drops.values())
+        report = {
+            "weights": os.path.abspath(model_path),
+            "calibration_images": len(calibration),
+            "tolerance": tolerance,
+            "conf_threshold": conf_threshold,
+            "fp32": fp32,
+            "int8": int8,
+            "drops": drops,
+            "published": published,
+        }
+        if published:
+            os.replace(candidate, target)
+            with open(os.path.splitext(target)[0] + ".json", "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+    finally:
+        if os.path.exists(candidate):
+            os.remove(candidate)
+    report["path"] = target if published else None
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Quantize a trained detector to INT8 with an accuracy guard.")
+    parser.add_argument("weights", help="Trained detector, e.g. 'src/models/Whiteboard Model4/weights/best.pt'")
+    parser.add_argument("--val-images", default=DEFAULT_VAL_IMAGES, help="Validation images folder")
+    parser.add_argument("--val-labels", default=DEFAULT_VAL_LABELS, help="YOLO txt labels for the val images")
+    parser.add_argument("--calibration", type=int, default=DEFAULT_CALIBRATION_IMAGES,
+                        help="Number of val images used for calibration")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Largest allowed drop in mAP50, precision or recall")
+    parser.add_argument("--conf", type=float, default=DEFAULT_CONF, help="Threshold for precision/recall")
+    args = parser.parse_args(argv)
+
+    report = quantize_and_validate(args.weights, args.val_images, args.val_labels, args.calibration,
+                                   args.tolerance, args.conf)
+    print(f"{'':10}{'mAP50':>8}{'P':>8}{'R':>8}")
+    for name in ("fp32", "int8"):
+        m = report[name]
+        print(f"{name:10}{m['map50']:8.3f}{m['precision']:8.3f}{m['recall']:8.3f}")
+    if report["published"]:
+        print(f"✅ Published {report['path']}")
+        return 0
+    worst = max(report["drops"], key=report["drops"].get)
+    print(f"❌ Not published: {worst} dropped by {report['drops'][worst]:.3f} (tolerance {args.tolerance})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
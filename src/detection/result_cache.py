@@ -0,0 +1,214 @@
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS detections (
+    path TEXT NOT NULL,
+    model_hash TEXT NOT NULL,
+    imgsz TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    conf REAL NOT NULL,
+    boxes BLOB NOT NULL,
+    confidences BLOB NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (path, model_hash, imgsz)
+);
+CREATE INDEX IF NOT EXISTS detections_last_used ON detections (last_used);
+"""
+
+
+def default_cache_dir():
+    """Per-user cache directory for the project (LOCALAPPDATA on Windows, XDG elsewhere)."""
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME")
+    if not base:
+        base = os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "whiteboard-detection")
+
+
+def folder_cache_path(folder_path):
+    """Cache file stored beside the scanned photos instead of in the user cache dir."""
+    return os.path.join(folder_path, ".whiteboard-cache.sqlite3")
+
+
+class DetectionCache:
+    """
+    SQLite store of raw detection results.
+
+    Rows are keyed by image path, weights hash and inference size, and are only
+    served while the file's size and mtime still match, so modified photos are
+    re-inferred. Boxes (xyxy) and confidences are stored as float32 blobs along
+    with the confidence threshold they were computed at; a row answers any
+    request at that threshold or higher. The payload is kept under ``max_bytes``
+    by evicting least recently used rows.
+    """
+
+    def __init__(self, db_path=None, max_bytes=DEFAULT_MAX_BYTES):
+        if db_path is None:
+            db_path = os.path.join(default_cache_dir(), "detections.sqlite3")
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.db_path = db_path
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # Detection runs on a worker thread; every access goes through the lock
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        row = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(boxes) + LENGTH(confidences)), 0) FROM detections"
+        ).fetchone()
+        self._entries, self._bytes = row
+
+    def get_many(self, image_paths, model_hash, imgsz, conf_threshold, stats=None):
+        """
+        Look up cached results for ``image_paths``.
+
+        Args:
+            image_paths (list): Image paths to look up
+            model_hash (str): Hash of the weights file (see ``weights_hash``)
+            imgsz: Inference size the results must have been computed at
+            conf_threshold (float): Requested confidence threshold
+            stats (dict): Optional {path: os.stat_result} to avoid re-stat'ing files
+
+        Returns:
+            dict: {path: (boxes, confidences)} for every hit, filtered to ``conf_threshold``
+        """
+        # numpy is only needed once results flow; the GUI imports this module at startup
+        import numpy as np
+
+        found = {}
+        touched = []
+        now = time.time()
+        with self._lock:
+            for image_path in image_paths:
+                st = stats.get(image_path) if stats else None
+                try:
+                    st = st or os.stat(image_path)
+                except OSError:
+                    self.misses += 1
+                    continue
+                row = self._conn.execute(
+                    "SELECT size, mtime_ns, conf, boxes, confidences FROM detections "
+                    "WHERE path = ? AND model_hash = ? AND imgsz = ?",
+                    (image_path, model_hash, str(imgsz)),
+                ).fetchone()
+                if row is None or row[0] != st.st_size or row[1] != st.st_mtime_ns or row[2] > conf_threshold:
+                    self.misses += 1
+                    continue
+                boxes = np.frombuffer(row[3], dtype=np.float32).reshape(-1, 4)
+                confidences = np.frombuffer(row[4], dtype=np.float32)
+                keep = confidences >= conf_threshold
+                found[image_path] = (boxes[keep], confidences[keep])
+                touched.append((now, image_path, model_hash, str(imgsz)))
+                self.hits += 1
+            if touched:
+                self._conn.executemany(
+                    "UPDATE detections SET last_used = ? WHERE path = ? AND model_hash = ? AND imgsz = ?", touched
+                )
+                self._conn.commit()
+        return found
+
+    def put_many(self, entries, model_hash, imgsz, conf_threshold, stats=None):
+        """
+        Store results computed at ``conf_threshold``.
+
+        Args:
+            entries (dict): {path: (boxes, confidences)} with xyxy boxes
+            model_hash (str): Hash of the weights file
+            imgsz: Inference size used
+            conf_threshold (float): Threshold the results were computed at
+            stats (dict): Optional {path: os.stat_result}
+        """
+        import numpy as np
+
+        rows = []
+        now = time.time()
+        for image_path, (boxes, confidences) in entries.items():
+            st = stats.get(image_path) if stats else None
+            try:
+                st = st or os.stat(image_path)
+            except OSError:
+                continue
+            rows.append((
+                image_path, model_hash, str(imgsz), st.st_size, st.st_mtime_ns, float(conf_threshold),
+                np.asarray(boxes, dtype=np.float32).tobytes(),
+                np.asarray(confidences, dtype=np.float32).tobytes(),
+                now,
+            ))
+        if not rows:
+            return
+        with self._lock:
+            for row in rows:
+                previous = self._conn.execute(
+                    "SELECT LENGTH(boxes) + LENGTH(confidences) FROM detections "
+                    "WHERE path = ? AND model_hash = ? AND imgsz = ?",
+                    row[:3],
+                ).fetchone()
+                if previous is None:
+                    self._entries += 1
+                else:
+                    self._bytes -= previous[0]
+                self._bytes += len(row[6]) + len(row[7])
+                self._conn.execute("INSERT OR REPLACE INTO detections VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", row)
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        # Trim to 90% of the cap so eviction does not run on every insert
+        target = int(self.max_bytes * 0.9)
+        if self._bytes <= self.max_bytes:
+            return
+        cursor = self._conn.execute(
+            "SELECT rowid, LENGTH(boxes) + LENGTH(confidences) FROM detections ORDER BY last_used"
+        )
+        doomed = []
+        for rowid, size in cursor:
+            if self._bytes <= target:
+                break
+            doomed.append((rowid,))
+            self._bytes -= size
+            self._entries -= 1
+        self._conn.executemany("DELETE FROM detections WHERE rowid = ?", doomed)
+        self.evictions += len(doomed)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM detections")
+            self._conn.commit()
+            self._entries = self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": self._entries,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups * 100) if lookups > 0 else 0,
+                "evictions": self.evictions,
+            }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_default_cache = None
+
+
+def get_result_cache():
+    """Return the shared detection cache in the user cache directory."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = DetectionCache()
+    return _default_cache
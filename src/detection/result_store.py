@@ -0,0 +1,118 @@
+import os
+import numpy as np
+
+# Detection runs at this floor so any slider position (10-95%) can be served from memory
+FLOOR_CONFIDENCE = 0.10
+
+
+class DetectionStore:
+    """
+    Compact store of every box found during a scan run at a low floor confidence.
+
+    Boxes from all images live in flat NumPy arrays (one row per box plus the
+    index of the image it belongs to), so re-applying a higher confidence
+    threshold is a couple of vectorised passes instead of a new scan.
+    """
+
+    def __init__(self):
+        self.image_paths = []
+        self._index = {}
+        self._chunks = []
+        self._image_index = np.empty(0, dtype=np.int32)
+        self._confidences = np.empty(0, dtype=np.float32)
+        self._boxes = np.empty((0, 4), dtype=np.float32)
+        self._max_confidence = np.empty(0, dtype=np.float32)
+
+    def __len__(self):
+        return len(self.image_paths)
+
+    def add(self, record):
+        """Add one record from ``iter_detections`` (re-adding a path replaces its boxes)."""
+        image_path = record["image_path"]
+        if image_path in self._index:
+            self.remove([image_path])
+        image_id = len(self.image_paths)
+        self._index[image_path] = image_id
+        self.image_paths.append(image_path)
+        confidences = np.asarray(record["confidences"], dtype=np.float32)
+        boxes = record.get("boxes")
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4) if boxes is not None else np.zeros((len(confidences), 4), np.float32)
+        self._chunks.append((image_id, confidences, boxes))
+
+    def _consolidate(self):
+        # Records arrive one at a time; concatenate lazily before filtering
+        if not self._chunks:
+            return
+        ids = [np.full(len(conf), image_id, dtype=np.int32) for image_id, conf, _ in self._chunks]
+        self._image_index = np.concatenate([self._image_index] + ids)
+        self._confidences = np.concatenate([self._confidences] + [conf for _, conf, _ in self._chunks])
+        self._boxes = np.concatenate([self._boxes] + [boxes for _, _, boxes in self._chunks])
+        max_conf = np.zeros(len(self.image_paths), dtype=np.float32)
+        max_conf[:len(self._max_confidence)] = self._max_confidence
+        for image_id, conf, _ in self._chunks:
+            max_conf[image_id] = conf.max() if len(conf) else 0.0
+        self._max_confidence = max_conf
+        self._chunks = []
+
+    def remove(self, image_paths):
+        """Drop images (e.g. after they were moved) and re-number the remaining ones."""
+        self._consolidate()
+        doomed = {self._index[p] for p in image_paths if p in self._index}
+        if not doomed:
+            return
+        keep_images = np.ones(len(self.image_paths), dtype=bool)
+        keep_images[list(doomed)] = False
+        remap = np.cumsum(keep_images, dtype=np.int32) - 1
+        keep_boxes = keep_images[self._image_index]
+        self._image_index = remap[self._image_index[keep_boxes]]
+        self._confidences = self._confidences[keep_boxes]
+        self._boxes = self._boxes[keep_boxes]
+        self._max_confidence = self._max_confidence[keep_images]
+        self.image_paths = [p for i, p in enumerate(self.image_paths) if keep_images[i]]
+        self._index = {p: i for i, p in enumerate(self.image_paths)}
+
+    def max_confidence(self, image_path):
+        self._consolidate()
+        image_id = self._index.get(image_path)
+        return float(self._max_confidence[image_id]) if image_id is not None else 0.0
+
+    def boxes(self, image_path, conf_threshold=FLOOR_CONFIDENCE):
+        """Boxes (xyxy) and confidences of one image at ``conf_threshold``."""
+        self._consolidate()
+        mask = (self._image_index == self._index[image_path]) & (self._confidences >= conf_threshold)
+        return self._boxes[mask], self._confidences[mask]
+
+    def filter(self, conf_threshold):
+        """
+        Re-apply a confidence threshold without re-running inference.
+
+        Returns:
+            dict: same structure as ``detect_whiteboards``
+        """
+        self._consolidate()
+        n_images = len(self.image_paths)
+        mask = self._confidences >= conf_threshold
+        kept = self._confidences[mask]
+        counts = np.bincount(self._image_index[mask], minlength=n_images)
+        detected = np.flatnonzero(counts)
+        undetected = np.flatnonzero(counts == 0)
+
+        detected_images = [self.image_paths[i] for i in detected]
+        detected_count = len(detected_images)
+        total_detections = int(kept.size)
+        stats = {
+            "total_images": n_images,
+            "detected_count": detected_count,
+            "undetected_count": len(undetected),
+            "detection_rate": (detected_count / n_images * 100) if n_images > 0 else 0,
+            "total_detections": total_detections,
+            "avg_detections": total_detections / detected_count if detected_count > 0 else 0,
+            "avg_confidence": float(kept.mean()) if kept.size else 0,
+            "confidence_range": (float(kept.min()), float(kept.max())) if kept.size else (0, 0),
+        }
+        return {
+            "detected_images": detected_images,
+            "undetected_images": [os.path.basename(self.image_paths[i]) for i in undetected],
+            "stats": stats,
+            "image_confidences": dict(zip(detected_images, self._max_confidence[detected].tolist())),
+        }
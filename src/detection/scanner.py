@@ -0,0 +1,96 @@
+import os
+
+# One extension policy for detection, thumbnails and the utility scripts
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff", ".webp")
+
+# Folders created by this project (moved results) and OS/NAS housekeeping folders
+SKIP_DIR_NAMES = {
+    "whiteboards",
+    "__pycache__",
+    "$recycle.bin",
+    "system volume information",
+    "@eadir",
+}
+
+
+def is_image_file(name, extensions=IMAGE_EXTENSIONS):
+    return name.lower().endswith(extensions)
+
+
+def _skip_dir(name, skip_dirs):
+    return name.startswith(".") or name.lower() in skip_dirs
+
+
+def iter_image_entries(folder, recursive=True, extensions=IMAGE_EXTENSIONS, skip_dirs=SKIP_DIR_NAMES):
+    """
+    Lazily yield ``os.DirEntry`` objects for the images under ``folder``.
+
+    Uses ``os.scandir`` so file type (and on Windows the full stat) comes from the
+    directory listing itself. Hidden folders, symlinked folders, the generated
+    ``Whiteboards`` output folder and OS cache folders are skipped. Entries are
+    yielded in name order per directory, files before subdirectories.
+
+    Args:
+        folder (str): Root folder to scan
+        recursive (bool): Descend into subfolders
+        extensions (tuple): Lower-case file extensions to accept
+        skip_dirs (set): Lower-case folder names never descended into
+    """
+    pending = [folder]
+    while pending:
+        images, subdirs = list_directory(pending.pop(), extensions, skip_dirs)
+        yield from images
+        if recursive:
+            # Reverse so the stack pops subfolders in name order
+            pending.extend(reversed(subdirs))
+
+
+def list_directory(folder, extensions=IMAGE_EXTENSIONS, skip_dirs=SKIP_DIR_NAMES):
+    """
+    List one directory without descending into it.
+
+    Returns:
+        tuple: (image ``os.DirEntry`` list, list of subfolder paths to scan), both
+        in name order; an unreadable folder gives two empty lists
+    """
+    try:
+        with os.scandir(folder) as it:
+            entries = sorted(it, key=lambda e: e.name)
+    except OSError:
+        return [], []
+    images = []
+    subdirs = []
+    for entry in entries:
+        try:
+            if entry.is_file():
+                if is_image_file(entry.name, extensions):
+                    images.append(entry)
+            elif entry.is_dir(follow_symlinks=False) and not _skip_dir(entry.name, skip_dirs):
+                subdirs.append(entry.path)
+        except OSError:
+            continue
+    return images, subdirs
+
+
+def iter_image_files(folder, recursive=True, extensions=IMAGE_EXTENSIONS, skip_dirs=SKIP_DIR_NAMES):
+    """Lazily yield image paths under ``folder`` (see ``iter_image_entries``)."""
+    for entry in iter_image_entries(folder, recursive, extensions, skip_dirs):
+        yield entry.path
+
+
+def scan_images(folder, recursive=True, extensions=IMAGE_EXTENSIONS, skip_dirs=SKIP_DIR_NAMES):
+    """
+    List images under ``folder`` in one pass, keeping the stat data of each file.
+
+    Returns:
+        tuple: (list of paths, {path: os.stat_result})
+    """
+    paths = []
+    stats = {}
+    for entry in iter_image_entries(folder, recursive, extensions, skip_dirs):
+        try:
+            stats[entry.path] = entry.stat()
+        except OSError:
+            continue
+        paths.append(entry.path)
+    return paths, stats
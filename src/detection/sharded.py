@@ -0,0 +1,132 @@
+import multiprocessing
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# PyTorch intra-op threading stops paying off past a few threads at small batch sizes
+THREADS_PER_WORKER = 4
+
+_worker_options = None
+# Why the replica failed to load, raised again for every shard so the caller sees it
+_worker_error = None
+
+
+def default_worker_split(cpu_count=None):
+    """
+    Split the machine's cores into (worker processes, torch threads per worker).
+
+    Small machines keep a single process using every core; larger ones run one
+    model replica per ``THREADS_PER_WORKER`` cores (e.g. 32 cores -> 8 x 4).
+    """
+    cpus = cpu_count or os.cpu_count() or 1
+    if cpus < 2 * THREADS_PER_WORKER:
+        return 1, cpus
+    workers = cpus // THREADS_PER_WORKER
+    return workers, cpus // workers
+
+
+def _init_worker(options, threads):
+    global _worker_options, _worker_error
+    # Results go back through the pool; anything a worker prints (ultralytics or runtime logs) goes
+    # to stderr so it never mixes into the caller's stdout (the CLI streams JSON lines there)
+    if sys.stdout is not None and sys.stderr is not None:
+        try:
+            sys.stdout.flush()
+            os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+        except (OSError, ValueError):
+            pass
+    import cv2
+    from src.detection.backends import export_model, is_exported_model, set_runtime_threads
+    from src.detection.model_cache import get_model
+
+    # Decoding happens on the same core budget as inference
+    cv2.setNumThreads(1)
+    _worker_options = options
+    backend = options["backend"]
+    model_path = options["model_path"]
+    if backend == "torch" and not is_exported_model(model_path):
+        import torch
+
+        torch.set_num_threads(threads)
+    else:
+        # Exported runtimes take their thread count from the session options; PyTorch is never loaded
+        set_runtime_threads(threads)
+    # Load the replica up front so the first shard does not pay for it
+    try:
+        get_model(export_model(model_path, backend) if backend != "torch" else model_path)
+    except Exception as e:
+        # An initializer error would only break the pool; keep it for the shards instead
+        _worker_error = str(e)
+
+
+def _run_shard(image_paths):
+    from src.detection.backends import ModelLoadError
+    from src.detection.detection_module import iter_detections
+
+    if _worker_error is not None:
+        raise ModelLoadError(_worker_error)
+
+    outputs = []
+    for record in iter_detections(None, files=image_paths, batch_size=len(image_paths), **_worker_options):
+        outputs.append((record["boxes"], record["confidences"]))
+    return outputs
+
+
+class ShardedInference:
+    """
+    Process pool where each worker holds its own model replica.
+
+    Shards (lists of image paths) are submitted in order and results come back
+    in the same order. Each worker limits PyTorch to ``threads_per_worker``
+    threads so the replicas share the cores instead of oversubscribing them.
+    Exported backends get the same per-worker thread budget.
+    Workers are started with ``spawn`` so they never inherit a forked copy of
+    the parent's torch thread pools.
+    """
+
+    def __init__(self, model_path, conf_threshold, imgsz=None, reduced_decode=False, workers=None,
+                 threads_per_worker=None, backend="torch"):
+        default_workers, default_threads = default_worker_split()
+        self.workers = max(1, int(workers or default_workers))
+        if threads_per_worker is None:
+            threads_per_worker = max(1, (os.cpu_count() or 1) // self.workers) if workers else default_threads
+        self.threads_per_worker = max(1, int(threads_per_worker))
+        options = {
+            "model_path": model_path,
+            "conf_threshold": conf_threshold,
+            "imgsz": imgsz,
+            "reduced_decode": reduced_decode,
+            "backend": backend,
+        }
+        self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                             mp_context=multiprocessing.get_context("spawn"),
+                                             initializer=_init_worker,
+                                             initargs=(options, self.threads_per_worker))
+
+    def map_batches(self, batches):
+        """
+        Run shards on the pool, keeping every worker busy, preserving order.
+
+        Args:
+            batches: iterable of (key, image_paths) pairs
+
+        Yields:
+            (key, outputs): ``outputs`` holds (boxes, confidences) per image path
+        """
+        inflight = deque()
+        for key, image_paths in batches:
+            future = self._executor.submit(_run_shard, image_paths) if image_paths else None
+            inflight.append((key, future))
+            while len(inflight) > 2 * self.workers:
+                yield self._collect(inflight.popleft())
+        while inflight:
+            yield self._collect(inflight.popleft())
+
+    @staticmethod
+    def _collect(item):
+        key, future = item
+        return key, future.result() if future is not None else []
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
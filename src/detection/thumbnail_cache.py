@@ -0,0 +1,245 @@
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from src.detection.result_cache import default_cache_dir
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_MAGIC = b"WBTHUMB1"
+# magic, slot capacity, live entries
+_HEADER = struct.Struct("<8sII")
+# key digest, pack offset, length, crc32 of the payload, last used (epoch seconds)
+_SLOT = struct.Struct("<16sQIId")
+_LAST_USED_OFFSET = 32
+_MIN_CAPACITY = 4096
+
+
+def _thumbnail_key(image_path, size, st):
+    width, height = size
+    raw = f"{os.path.abspath(image_path)}\0{st.st_size}\0{st.st_mtime_ns}\0{width}x{height}"
+    return hashlib.blake2b(raw.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+class ThumbnailCache:
+    """
+    Persistent store of encoded thumbnails in one packed file.
+
+    Thumbnails are appended to ``thumbnails.pack``; ``thumbnails.idx`` is a
+    memory-mapped open-addressing hash table of fixed-size slots keyed by
+    (path, file size, mtime, thumbnail size), so lookups touch a single page
+    instead of loading an index. Modified photos get a new key and their old
+    thumbnail simply ages out. Once the pack outgrows ``max_bytes`` it is
+    rewritten keeping the most recently used thumbnails. Payloads carry a CRC,
+    so an index that outlived a crash never serves torn data.
+
+    Safe to share between threads of one process.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        cache_dir = cache_dir or default_cache_dir()
+        os.makedirs(cache_dir, exist_ok=True)
+        self.pack_path = os.path.join(cache_dir, "thumbnails.pack")
+        self.index_path = os.path.join(cache_dir, "thumbnails.idx")
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._open()
+
+    # --- storage ---
+    def _index_valid(self):
+        try:
+            with open(self.index_path, "rb") as f:
+                magic, capacity, _ = _HEADER.unpack(f.read(_HEADER.size))
+            return (magic == _MAGIC and capacity >= _MIN_CAPACITY and os.path.exists(self.pack_path)
+                    and os.path.getsize(self.index_path) == _HEADER.size + capacity * _SLOT.size)
+        except (OSError, struct.error):
+            return False
+
+    def _write_empty(self, capacity):
+        with open(self.index_path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, capacity, 0))
+            f.truncate(_HEADER.size + capacity * _SLOT.size)
+        open(self.pack_path, "wb").close()
+
+    def _open(self):
+        if not self._index_valid():
+            self._write_empty(_MIN_CAPACITY)
+        self._index_file = open(self.index_path, "r+b")
+        self._index = mmap.mmap(self._index_file.fileno(), 0)
+        _, self._capacity, self._entries = _HEADER.unpack_from(self._index, 0)
+        # Appends always land at the end; reads seek explicitly
+        self._pack = open(self.pack_path, "a+b")
+        self._pack_size = self._pack.seek(0, os.SEEK_END)
+
+    def _close_files(self):
+        self._index.flush()
+        self._index.close()
+        self._index_file.close()
+        self._pack.close()
+
+    def _slot_pos(self, i):
+        return _HEADER.size + i * _SLOT.size
+
+    def _find(self, key):
+        """Return (slot position, found) for ``key`` using linear probing."""
+        mask = self._capacity - 1
+        i = int.from_bytes(key[:8], "little") & mask
+        while True:
+            pos = self._slot_pos(i)
+            digest, _, length, _, _ = _SLOT.unpack_from(self._index, pos)
+            if digest == key:
+                return pos, True
+            if length == 0:
+                return pos, False
+            i = (i + 1) & mask
+
+    def _live_slots(self):
+        slots = []
+        for i in range(self._capacity):
+            slot = _SLOT.unpack_from(self._index, self._slot_pos(i))
+            if slot[2]:
+                slots.append(slot)
+        return slots
+
+    def _rebuild(self, capacity, keep_bytes=None):
+        """
+        Rewrite the index at ``capacity`` slots; with ``keep_bytes`` also rewrite
+        the pack, keeping the most recently used thumbnails that fit.
+        """
+        slots = self._live_slots()
+        if keep_bytes is not None:
+            slots.sort(key=lambda slot: slot[4], reverse=True)
+            kept, total = [], 0
+            for slot in slots:
+                if total + slot[2] > keep_bytes:
+                    break
+                kept.append(slot)
+                total += slot[2]
+            self.evictions += len(slots) - len(kept)
+            slots = kept
+
+        index = bytearray(_HEADER.size + capacity * _SLOT.size)
+        _HEADER.pack_into(index, 0, _MAGIC, capacity, len(slots))
+        mask = capacity - 1
+        pack_tmp = self.pack_path + ".tmp"
+        if keep_bytes is not None:
+            new_pack = open(pack_tmp, "wb")
+        offset = 0
+        try:
+            for digest, old_offset, length, crc, last_used in slots:
+                if keep_bytes is not None:
+                    self._pack.seek(old_offset)
+                    new_pack.write(self._pack.read(length))
+                    old_offset, offset = offset, offset + length
+                i = int.from_bytes(digest[:8], "little") & mask
+                while _SLOT.unpack_from(index, self._slot_pos(i))[2]:
+                    i = (i + 1) & mask
+                _SLOT.pack_into(index, self._slot_pos(i), digest, old_offset, length, crc, last_used)
+        finally:
+            if keep_bytes is not None:
+                new_pack.close()
+
+        index_tmp = self.index_path + ".tmp"
+        with open(index_tmp, "wb") as f:
+            f.write(index)
+        # Windows cannot replace files that are still open or mapped
+        self._close_files()
+        if keep_bytes is not None:
+            os.replace(pack_tmp, self.pack_path)
+        os.replace(index_tmp, self.index_path)
+        self._open()
+
+    # --- public API ---
+    def get(self, image_path, size, st=None):
+        """
+        Return the cached encoded thumbnail of ``image_path`` at ``size`` (w, h), or None.
+
+        Args:
+            image_path (str): Source photo
+            size (tuple): (width, height) box the thumbnail was scaled into
+            st (os.stat_result): Optional stat of ``image_path`` to avoid re-stat'ing it
+        """
+        try:
+            key = _thumbnail_key(image_path, size, st or os.stat(image_path))
+        except OSError:
+            return None
+        with self._lock:
+            pos, found = self._find(key)
+            if not found:
+                self.misses += 1
+                return None
+            _, offset, length, crc, _ = _SLOT.unpack_from(self._index, pos)
+            self._pack.seek(offset)
+            data = self._pack.read(length)
+            if len(data) != length or zlib.crc32(data) != crc:
+                self.misses += 1
+                return None
+            struct.pack_into("<d", self._index, pos + _LAST_USED_OFFSET, time.time())
+            self.hits += 1
+            return data
+
+    def put(self, image_path, size, data, st=None):
+        """Store the encoded thumbnail ``data`` of ``image_path`` at ``size`` (w, h)."""
+        if not data or len(data) > self.max_bytes // 4:
+            return
+        try:
+            key = _thumbnail_key(image_path, size, st or os.stat(image_path))
+        except OSError:
+            return
+        with self._lock:
+            pos, found = self._find(key)
+            offset = self._pack_size
+            self._pack.write(data)
+            self._pack_size += len(data)
+            _SLOT.pack_into(self._index, pos, key, offset, len(data), zlib.crc32(data), time.time())
+            if not found:
+                self._entries += 1
+                _HEADER.pack_into(self._index, 0, _MAGIC, self._capacity, self._entries)
+            if self._pack_size > self.max_bytes:
+                # Trim to 75% so compaction does not run again right away
+                self._pack.flush()
+                self._rebuild(self._capacity, keep_bytes=int(self.max_bytes * 0.75))
+            elif self._entries * 2 > self._capacity:
+                self._rebuild(self._capacity * 2)
+
+    def clear(self):
+        with self._lock:
+            self._close_files()
+            self._write_empty(_MIN_CAPACITY)
+            self._open()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": self._entries,
+                "bytes": self._pack_size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups * 100) if lookups > 0 else 0,
+                "evictions": self.evictions,
+            }
+
+    def close(self):
+        with self._lock:
+            self._close_files()
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_thumbnail_cache():
+    """Return the shared thumbnail cache in the user cache directory."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ThumbnailCache()
+        return _default_cache
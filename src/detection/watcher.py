@@ -0,0 +1,287 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.detection.detection_module import DetectionSummary, detect_whiteboards, iter_detections, move_detected_images
+from src.detection.scanner import IMAGE_EXTENSIONS, SKIP_DIR_NAMES, list_directory
+
+DEFAULT_POLL_INTERVAL = 2.0
+# Wait this long after the last change before processing, so a sync burst is handled once
+DEFAULT_DEBOUNCE = 5.0
+
+
+def folder_manifest_path(folder_path):
+    """Manifest of classified files, stored beside the photos it describes."""
+    return os.path.join(folder_path, ".whiteboard-manifest.jsonl")
+
+
+class FolderWatcher:
+    """
+    Track which images in a folder tree have already been classified and report new ones.
+
+    Changes are found by comparing directory mtimes, which move whenever a file is
+    created, renamed or deleted inside them. An idle poll therefore costs one
+    ``stat`` per directory, and only directories that changed are listed again;
+    only names missing from the manifest are stat'ed. New files are held back
+    until nothing has changed for ``debounce`` seconds (including the size and
+    mtime of files still being written by a sync client).
+
+    With ``only_new``, the images present at the first poll are taken as the
+    baseline and never reported, so only photos added afterwards are processed
+    (e.g. when a scan has just been reviewed by hand).
+
+    The manifest is an append-only JSON-lines file of
+    ``{"path", "size", "mtime_ns", "detected"}`` records (paths relative to the
+    folder), so recording a batch costs a few appended lines.
+    """
+
+    def __init__(self, folder_path, manifest_path=None, recursive=True, debounce=DEFAULT_DEBOUNCE,
+                 extensions=IMAGE_EXTENSIONS, skip_dirs=SKIP_DIR_NAMES, only_new=False):
+        self.folder_path = os.path.abspath(folder_path)
+        self.manifest_path = manifest_path or folder_manifest_path(self.folder_path)
+        self.recursive = recursive
+        self.debounce = float(debounce)
+        self._extensions = extensions
+        self._skip_dirs = skip_dirs
+        self._dirs = {}
+        self._pending = {}
+        self._skipped = set()
+        self._baseline = set()
+        self._take_baseline = only_new
+        self._last_change = None
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        manifest = {}
+        lines = 0
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A torn final line from an interrupted run
+                        continue
+                    lines += 1
+                    manifest[os.path.join(self.folder_path, entry["path"])] = (
+                        entry["size"], entry["mtime_ns"], entry["detected"])
+        except OSError:
+            return manifest
+        if lines > 2 * len(manifest) + 100:
+            self._rewrite_manifest(manifest)
+        return manifest
+
+    def _rewrite_manifest(self, manifest):
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for path, (size, mtime_ns, detected) in manifest.items():
+                f.write(self._manifest_line(path, size, mtime_ns, detected))
+        os.replace(tmp_path, self.manifest_path)
+
+    def _manifest_line(self, path, size, mtime_ns, detected):
+        entry = {"path": os.path.relpath(path, self.folder_path), "size": size,
+                 "mtime_ns": mtime_ns, "detected": bool(detected)}
+        return json.dumps(entry) + "\n"
+
+    def _list(self, folder, baseline=False):
+        # Take the mtime before listing so a file landing mid-listing triggers another pass
+        try:
+            self._dirs[folder] = os.stat(folder).st_mtime_ns
+        except OSError:
+            self._dirs.pop(folder, None)
+            return False
+        images, subdirs = list_directory(folder, self._extensions, self._skip_dirs)
+        changed = False
+        for entry in images:
+            path = entry.path
+            if (path in self.manifest or path in self._pending or path in self._skipped
+                    or path in self._baseline):
+                continue
+            if baseline:
+                self._baseline.add(path)
+                continue
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            self._pending[path] = (st.st_size, st.st_mtime_ns)
+            changed = True
+        if self.recursive:
+            for subdir in subdirs:
+                if subdir not in self._dirs:
+                    changed |= self._list(subdir, baseline)
+        return changed
+
+    def poll(self):
+        """
+        Look for new images.
+
+        Returns:
+            list: paths that are new and have been stable for ``debounce`` seconds
+            (empty while a burst is still arriving)
+        """
+        now = time.monotonic()
+        if not self._dirs:
+            changed = self._list(self.folder_path, self._take_baseline)
+            self._take_baseline = False
+        else:
+            changed = False
+            for folder, mtime_ns in list(self._dirs.items()):
+                try:
+                    current = os.stat(folder).st_mtime_ns
+                except OSError:
+                    # Removed; its subfolders fail the same way
+                    del self._dirs[folder]
+                    continue
+                if current != mtime_ns:
+                    changed |= self._list(folder)
+        if not self._pending:
+            return []
+
+        # Files that are still growing keep the burst open
+        for path, signature in list(self._pending.items()):
+            try:
+                st = os.stat(path)
+            except OSError:
+                del self._pending[path]
+                continue
+            if (st.st_size, st.st_mtime_ns) != signature:
+                self._pending[path] = (st.st_size, st.st_mtime_ns)
+                changed = True
+        if changed or self._last_change is None:
+            self._last_change = now
+        if now - self._last_change < self.debounce:
+            return []
+        return sorted(self._pending)
+
+    def mark_processed(self, image_paths, detected=()):
+        """
+        Record classified images so they are never processed again.
+
+        Images that no longer exist (e.g. moved into Whiteboards) are not recorded.
+        """
+        detected = set(detected)
+        lines = []
+        for path in image_paths:
+            signature = self._pending.pop(path, None)
+            if not os.path.exists(path):
+                continue
+            if signature is None:
+                st = os.stat(path)
+                signature = (st.st_size, st.st_mtime_ns)
+            self.manifest[path] = signature + (path in detected,)
+            lines.append(self._manifest_line(path, *self.manifest[path]))
+        if lines:
+            with open(self.manifest_path, "a", encoding="utf-8") as f:
+                f.writelines(lines)
+        if not self._pending:
+            self._last_change = None
+
+    def skip(self, image_paths):
+        """Stop reporting images that could not be processed (they are retried on the next start)."""
+        for path in image_paths:
+            self._pending.pop(path, None)
+            self._skipped.add(path)
+        if not self._pending:
+            self._last_change = None
+
+    def pending_count(self):
+        return len(self._pending)
+
+
+def _detect_each(watcher, folder_path, model_path, conf_threshold, image_paths, on_error, detect_kwargs):
+    summary = DetectionSummary()
+    processed = []
+    for image_path in image_paths:
+        try:
+            for record in iter_detections(folder_path, model_path, conf_threshold, files=[image_path],
+                                          **detect_kwargs):
+                summary.add(record)
+        except Exception as e:
+            watcher.skip([image_path])
+            if on_error is not None:
+                on_error([image_path], e)
+            else:
+                print(f"❌ Detection failed for {os.path.basename(image_path)}: {e}")
+            continue
+        processed.append(image_path)
+    return processed, summary.as_result()
+
+
+def watch_folder(folder_path, model_path="./runs/detect/train19/weights/best.pt", conf_threshold=0.5,
+                 interval=DEFAULT_POLL_INTERVAL, debounce=DEFAULT_DEBOUNCE, move=True, stop_event=None,
+                 on_batch=None, on_error=None, recursive=True, only_new=False, **detect_kwargs):
+    """
+    Watch a folder and classify only newly added images.
+
+    Args:
+        folder_path (str): Folder to watch
+        model_path (str): Path to YOLO trained model weights
+        conf_threshold (float): Confidence threshold for detection
+        interval (float): Seconds between polls
+        debounce (float): Quiet period before a burst of new files is processed
+        move (bool): Move images with whiteboards into the Whiteboards folder
+        stop_event (threading.Event): Set to stop watching
+        on_batch (callable): Called with (image_paths, result, moved_count) after each batch;
+            prints a summary when omitted
+        on_error (callable): Called with (image_paths, exception) for images that could not
+            be classified; prints the error when omitted
+        recursive (bool): Watch subfolders too
+        only_new (bool): Leave the images already in the folder alone and process only those added
+            after the watch starts
+        **detect_kwargs: Passed through to ``detect_whiteboards`` (batch_size, cache, ...)
+    """
+    if stop_event is None:
+        stop_event = threading.Event()
+    watcher = FolderWatcher(folder_path, recursive=recursive, debounce=debounce, only_new=only_new)
+    while not stop_event.is_set():
+        image_paths = watcher.poll()
+        if image_paths:
+            try:
+                result = detect_whiteboards(folder_path, model_path, conf_threshold, recursive=recursive,
+                                            files=image_paths, **detect_kwargs)
+            except Exception:
+                # Retry one by one so a half-synced or corrupt photo does not hold back the rest
+                image_paths, result = _detect_each(watcher, folder_path, model_path, conf_threshold, image_paths,
+                                                   on_error, detect_kwargs)
+            moved = move_detected_images(result["detected_images"], folder_path) if move else 0
+            watcher.mark_processed(image_paths, result["detected_images"])
+            if on_batch is not None:
+                on_batch(image_paths, result, moved)
+            else:
+                print(f"📸 {len(image_paths)} new images: {len(result['detected_images'])} contain whiteboards, "
+                      f"{moved} moved")
+        stop_event.wait(interval)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Watch a folder and move new whiteboard photos as they arrive.")
+    parser.add_argument("folder", help="Folder to watch")
+    parser.add_argument("--model", default="./runs/detect/train19/weights/best.pt", help="YOLO weights")
+    parser.add_argument("--conf", type=float, default=0.5, help="Confidence threshold")
+    parser.add_argument("--interval", type=float, default=DEFAULT_POLL_INTERVAL, help="Seconds between polls")
+    parser.add_argument("--debounce", type=float, default=DEFAULT_DEBOUNCE,
+                        help="Quiet seconds before a burst of new files is processed")
+    parser.add_argument("--no-move", action="store_true", help="Only classify, do not move")
+    parser.add_argument("--only-new", action="store_true",
+                        help="Ignore photos already in the folder; process only those added from now on")
+    args = parser.parse_args(argv)
+
+    print(f"👀 Watching {args.folder} (Ctrl+C to stop)")
+    try:
+        watch_folder(args.folder, args.model, args.conf, interval=args.interval, debounce=args.debounce,
+                     move=not args.no_move, only_new=args.only_new, batch_size=8)
+    except KeyboardInterrupt:
+        print("⏹ Stopped watching")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,16 @@
 import sys
 import os
+import threading
+import time
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QPushButton,
-    QFileDialog, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem,
-    QLabel, QFrame, QStatusBar, QAbstractItemView, QProgressBar, QSlider, QSizePolicy, QComboBox
+    QFileDialog, QVBoxLayout, QHBoxLayout,
+    QLabel, QFrame, QStatusBar, QProgressBar, QSlider, QSizePolicy, QComboBox, QCheckBox
+)
+from PyQt6.QtGui import QImage, QFont, QPainter, QGuiApplication, QRegion
+from PyQt6.QtCore import (
+    Qt, QObject, pyqtSignal, QThread, QThreadPool, QPropertyAnimation, QEasingCurve, QEvent, QPoint, QTimer
 )
-from PyQt6.QtGui import QPixmap, QIcon, QImage, QImageReader, QFont, QPainter, QGuiApplication, QRegion
-from PyQt6.QtCore import Qt, QSize, QObject, pyqtSignal, QThread, QPropertyAnimation, QEasingCurve, QEvent, QPoint, QTimer
 
 # Add the project root to Python path so we can import from src.detection
 import sys
@@ -15,54 +19,158 @@ PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-from src.detection.detection_module import detect_whiteboards, move_detected_images
+# The detection modules pull in cv2, numpy and PIL, so they are imported where they are
+# first used (mostly on worker threads) rather than before the window can paint
+from src.detection.defaults import DEFAULT_CLASSIFIER_PATH
+from src.detection.pipeline import default_prefetch_workers
+from src.gui.thumbnails import (
+    THUMBNAIL_SIZE, FolderLister, ThumbnailModel, ThumbnailView, file_signature, thumbnail_cache
+)
 
+# Images per forward pass when running detection from the GUI
+DETECTION_BATCH_SIZE = 8
 
-class ThumbnailWorker(QObject):
-    imageLoaded = pyqtSignal(str, QImage)
-    finished = pyqtSignal()
 
-    def __init__(self, parent=None):
+class StartupTimer:
+    """Prints how long each startup phase took, and the time since launch."""
+
+    def __init__(self, start=None):
+        self._start = start if start is not None else time.perf_counter()
+        self._last = self._start
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        print(f"⏱️ Startup: {phase} in {now - self._last:.2f}s ({now - self._start:.2f}s since launch)")
+        self._last = now
+
+
+class DetectionWorker(QObject):
+    resultReady = pyqtSignal(object)
+    # done, total, images per second, ETA in seconds
+    progress = pyqtSignal(int, int, float, float)
+    failed = pyqtSignal(str)
+    finished = pyqtSignal(object)
+
+    def __init__(self, folder, detect_kwargs, parent=None):
         super().__init__(parent)
+        self._folder = folder
+        self._detect_kwargs = detect_kwargs
         self._stop = False
 
     def stop(self):
         self._stop = True
 
-    def _iter_image_files(self, folder):
-        for filename in os.listdir(folder):
-            if filename.lower().endswith((".png", ".jpg", ".jpeg")):
-                yield os.path.join(folder, filename)
-
-    def load_from_folder(self, folder):
-        for path in self._iter_image_files(folder):
-            if self._stop:
-                break
-            image = self._read_thumbnail_image(path, 150, 150)
-            if image is not None:
-                self.imageLoaded.emit(path, image)
-        self.finished.emit()
+    def is_stopped(self):
+        return self._stop
+
+    def run(self):
+        from src.detection.detection_module import DetectionSummary, iter_detections
+
+        summary = DetectionSummary()
+        result = None
+        first_time = None
+        first_done = 0
+        try:
+            for record in iter_detections(self._folder, summary=summary, **self._detect_kwargs):
+                done = record["index"] + 1
+                total = record["total"]
+                # Measure throughput from the first result so model loading does not skew the ETA
+                now = time.perf_counter()
+                if first_time is None:
+                    first_time, first_done = now, done
+                elapsed = now - first_time
+                rate = (done - first_done) / elapsed if elapsed > 0 else 0.0
+                eta = (total - done) / rate if rate > 0 else 0.0
+
+                if record.get("thumbnail"):
+                    # Encoded from the detector's decode; only a small JPEG to unpack here
+                    image = QImage.fromData(record["thumbnail"])
+                    if not image.isNull():
+                        record["thumbnail_image"] = (image, file_signature(record["image_path"]))
+                self.resultReady.emit(record)
+                self.progress.emit(done, total, rate, eta)
+                if self._stop:
+                    break
+            result = summary.as_result()
+        except Exception as e:
+            self.failed.emit(str(e))
+        self.finished.emit(result)
+
+
+class ModelScanWorker(QObject):
+    found = pyqtSignal(list)
+
+    def __init__(self, models_dir, parent=None):
+        super().__init__(parent)
+        self._models_dir = models_dir
+
+    def run(self):
+        model_files = []
+        for root, dirs, files in os.walk(self._models_dir):
+            # Virtualenvs, .git and caches can hold thousands of files and never hold our models
+            dirs[:] = [d for d in dirs if not d.startswith(".") and d != "__pycache__"]
+            for f in files:
+                # .onnx covers exported and INT8-quantized detectors
+                if f.lower().endswith(('.pt', '.onnx')):
+                    model_files.append(os.path.join(root, f))
+        model_files.sort()
+        self.found.emit(model_files)
+
+
+class WarmupWorker(QObject):
+    # model path, seconds taken, error message ("" on success)
+    finished = pyqtSignal(str, float, str)
+
+    def __init__(self, model_path, parent=None):
+        super().__init__(parent)
+        self._model_path = model_path
+
+    def run(self):
+        start = time.perf_counter()
+        error = ""
+        try:
+            from src.detection.detection_module import warm_up_model
+            warm_up_model(self._model_path)
+        except Exception as e:
+            error = str(e)
+        self.finished.emit(self._model_path, time.perf_counter() - start, error)
+
+
+class WatchWorker(QObject):
+    # new image paths, detection result, number moved
+    batchProcessed = pyqtSignal(object, object, int)
+    # new photos that stayed in the folder
+    photosAdded = pyqtSignal(list)
+    failed = pyqtSignal(str)
+    finished = pyqtSignal()
+
+    def __init__(self, folder, detect_kwargs, parent=None):
+        super().__init__(parent)
+        self._folder = folder
+        self._detect_kwargs = detect_kwargs
+        self._stop_event = threading.Event()
 
-    def load_from_files(self, filepaths):
-        for path in filepaths:
-            if self._stop:
-                break
-            image = self._read_thumbnail_image(path, 150, 150)
-            if image is not None:
-                self.imageLoaded.emit(path, image)
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        try:
+            from src.detection.watcher import watch_folder
+            # Photos already in the folder were scanned (and maybe excluded) by hand
+            watch_folder(self._folder, stop_event=self._stop_event, on_batch=self._on_batch,
+                         on_error=self._on_error, only_new=True, **self._detect_kwargs)
+        except Exception as e:
+            self.failed.emit(str(e))
         self.finished.emit()
 
-    def _read_thumbnail_image(self, path, width, height):
-        reader = QImageReader(path)
-        reader.setAutoTransform(True)
-        # Compute scaled size while keeping aspect ratio
-        size = reader.size()
-        if size.isValid() and not size.isEmpty():
-            # QSize.scaled in PyQt6 does not accept a TransformationMode; provide only aspect ratio mode
-            scaled = size.scaled(width, height, Qt.AspectRatioMode.KeepAspectRatio)
-            reader.setScaledSize(scaled)
-        image = reader.read()
-        return image if not image.isNull() else None
+    def _on_batch(self, image_paths, result, moved):
+        self.batchProcessed.emit(image_paths, result, moved)
+        # Photos that stayed in the folder join the folder view
+        detected = set(result["detected_images"])
+        self.photosAdded.emit([path for path in image_paths if path not in detected])
+
+    def _on_error(self, image_paths, error):
+        self.failed.emit(f"{os.path.basename(image_paths[0])}: {error}")
 
 
 class StyledButton(QPushButton):
@@ -215,7 +323,7 @@ class ToastNotification(QWidget):
 
 
 class WhiteboardApp(QMainWindow):
-    def __init__(self):
+    def __init__(self, startup_timer=None):
         super().__init__()
 
         self.setWindowTitle("📋 Whiteboard Detection")
@@ -226,10 +334,27 @@ class WhiteboardApp(QMainWindow):
         self.detect_result = None
         self.detected_images = []
         self.excluded_images = set()
-        self._thumb_thread = None
-        self._thumb_worker = None
+        self._folder_lister = None
+        # Paths of the selected folder as last listed; complete once the lister finishes
+        self._folder_paths = []
+        self._folder_listed = False
+        self._scanning = False
+        self._detect_thread = None
+        self._detect_worker = None
+        self._watch_thread = None
+        self._watch_worker = None
+        self._cached_count = 0
+        self.detection_store = None
         self.models_dir = os.path.abspath(".")
         self.selected_model_path = None
+        self._startup_timer = startup_timer
+        self._models_thread = None
+        self._models_worker = None
+        self._warmup_thread = None
+        self._warmup_worker = None
+        self._warm_model_path = None
+        # Threads waiting for the warm-up to finish before they may use the model
+        self._after_warmup = []
 
         # --- Central Widget ---
         central_widget = QWidget()
@@ -261,9 +386,24 @@ class WhiteboardApp(QMainWindow):
         self.btn_run_detection.clicked.connect(self.run_detection)
         self.btn_run_detection.setEnabled(False)
 
+        self.btn_watch = StyledButton("👀 Watch Folder")
+        self.btn_watch.setToolTip("Classify photos as they are added and move whiteboards automatically")
+        self.btn_watch.clicked.connect(self.toggle_watch)
+        self.btn_watch.setEnabled(False)
+
+        self.detect_progress = QProgressBar()
+        self.detect_progress.setFormat("%v / %m")
+        self.detect_progress.setFixedHeight(16)
+        self.detect_progress.setStyleSheet(
+            "QProgressBar { background: rgba(255,255,255,0.08); border-radius: 6px; color: #e8eaed;"
+            "font-size: 11px; text-align: center; }"
+            "QProgressBar::chunk { background: #8ab4f8; border-radius: 6px; }"
+        )
+        self.detect_progress.setVisible(False)
+
         # Threshold control
         # Model selection
-        model_title = QLabel("Model (.pt)")
+        model_title = QLabel("Model (.pt / .onnx)")
         model_title.setStyleSheet("color: #aab0b7; font-size: 12px;")
         model_row = QHBoxLayout()
         model_row.setSpacing(8)
@@ -284,8 +424,26 @@ class WhiteboardApp(QMainWindow):
         self.btn_pick_models.clicked.connect(self.pick_models_dir)
         model_row.addWidget(self.model_combo, 1)
         model_row.addWidget(self.btn_pick_models, 0)
+        self.model_combo.currentIndexChanged.connect(self._on_model_changed)
+        # Listed in the background once the window is up (see run)
+        self.model_combo.addItem("Looking for models…", userData=None)
+
+        # Classifier prefilter: only photos the classifier is unsure about reach the detector
+        self.classifier_path = os.path.join(PROJECT_ROOT, DEFAULT_CLASSIFIER_PATH)
+        self.cascade_checkbox = QCheckBox("Classifier prefilter (faster)")
+        self.cascade_checkbox.setStyleSheet("color: #e8eaed; font-size: 12px;")
+        if os.path.exists(self.classifier_path):
+            self.cascade_checkbox.setToolTip(
+                "Skip the detector for photos the classifier is confident about\n" + self.classifier_path
+            )
+        else:
+            self.cascade_checkbox.setEnabled(False)
+            self.cascade_checkbox.setToolTip(f"Classifier weights not found: {self.classifier_path}")
 
-        self._populate_models()
+        # Burst shots of the same board inherit the first shot's result instead of being inferred
+        self.dedup_checkbox = QCheckBox("Skip near-duplicate shots")
+        self.dedup_checkbox.setStyleSheet("color: #e8eaed; font-size: 12px;")
+        self.dedup_checkbox.setToolTip("Photos that look almost identical to an earlier one reuse its result")
 
         threshold_title = QLabel("Confidence Threshold")
         threshold_title.setStyleSheet("color: #aab0b7; font-size: 12px;")
@@ -300,9 +458,7 @@ class WhiteboardApp(QMainWindow):
         self.threshold_slider.setRange(10, 95)
         self.threshold_slider.setSingleStep(1)
         self.threshold_slider.setValue(50)
-        self.threshold_slider.valueChanged.connect(
-            lambda v: self.threshold_value_label.setText(f"{v}%")
-        )
+        self.threshold_slider.valueChanged.connect(self._on_threshold_changed)
         self.threshold_slider.setStyleSheet(
             "QSlider::groove:horizontal { height: 6px; background: rgba(255,255,255,0.12); border-radius: 4px; }"
             "QSlider::sub-page:horizontal { background: #8ab4f8; border-radius: 4px; }"
@@ -320,19 +476,37 @@ class WhiteboardApp(QMainWindow):
         self.btn_move_all.setVisible(False)
         self.btn_move_all.setEnabled(False)
 
+        # Linking leaves the originals in place; re-linking after a threshold change only updates the difference
+        self.organize_combo = QComboBox()
+        self.organize_combo.setStyleSheet(self.model_combo.styleSheet())
+        self.organize_combo.addItem("Move files", userData="move")
+        self.organize_combo.addItem("Link files (no copy)", userData="link")
+        self.organize_combo.addItem("Album file only", userData="manifest")
+        self.organize_combo.setToolTip(
+            "How 'Whiteboards' is filled: move the photos, link them (hardlink, reflink or symlink),\n"
+            "or list them in Whiteboards/album.txt"
+        )
+        self.organize_combo.currentIndexChanged.connect(self._on_organize_mode_changed)
+        self.organize_combo.setVisible(False)
+
         sidebar_layout.addWidget(brand)
         sidebar_layout.addWidget(subtitle)
         sidebar_layout.addSpacing(8)
         sidebar_layout.addWidget(self.btn_select_folder)
         sidebar_layout.addWidget(self.btn_run_detection)
+        sidebar_layout.addWidget(self.detect_progress)
+        sidebar_layout.addWidget(self.btn_watch)
         sidebar_layout.addSpacing(10)
         sidebar_layout.addWidget(model_title)
         sidebar_layout.addLayout(model_row)
+        sidebar_layout.addWidget(self.cascade_checkbox)
+        sidebar_layout.addWidget(self.dedup_checkbox)
         sidebar_layout.addSpacing(12)
         sidebar_layout.addLayout(threshold_header)
         sidebar_layout.addWidget(self.threshold_slider)
         sidebar_layout.addStretch()
         sidebar_layout.addWidget(self.btn_exclude_selected)
+        sidebar_layout.addWidget(self.organize_combo)
         sidebar_layout.addWidget(self.btn_move_all)
 
         # --- Content Area ---
@@ -370,17 +544,16 @@ class WhiteboardApp(QMainWindow):
         content_layout.addWidget(hero, 0)
 
         # --- Thumbnails Grid ---
-        self.thumbnail_list = QListWidget()
-        self.thumbnail_list.setViewMode(QListWidget.ViewMode.IconMode)
-        self.thumbnail_list.setIconSize(QSize(150, 150))
-        self.thumbnail_list.setResizeMode(QListWidget.ResizeMode.Adjust)
+        # Virtualized: only rows on (or near) the screen are decoded
+        self.thumbnail_model = ThumbnailModel(self)
+        self.thumbnail_list = ThumbnailView()
+        self.thumbnail_list.setModel(self.thumbnail_model)
         self.thumbnail_list.setSpacing(15)
-        self.thumbnail_list.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         self.thumbnail_list.setStyleSheet("""
-            QListWidget {
+            QListView {
                 outline: none;
             }
-            QListWidget::item {
+            QListView::item {
                 background: rgba(255,255,255,0.02);
                 border: 1px solid rgba(255,255,255,0.08);
                 border-radius: 12px;
@@ -388,11 +561,11 @@ class WhiteboardApp(QMainWindow):
                 margin: 5px;
                 color: #e8eaed;
             }
-            QListWidget::item:hover {
+            QListView::item:hover {
                 background-color: rgba(138,180,248,0.08);
                 border-color: rgba(138,180,248,0.35);
             }
-            QListWidget::item:selected {
+            QListView::item:selected {
                 background-color: rgba(138,180,248,0.18);
                 border-color: rgba(138,180,248,0.6);
             }
@@ -465,7 +638,7 @@ class WhiteboardApp(QMainWindow):
             QWidget#centralWidget, QWidget {
                 background: transparent;
             }
-            QListWidget {
+            QListView {
                 background: transparent;
             }
         """)
@@ -479,7 +652,9 @@ class WhiteboardApp(QMainWindow):
         folder = QFileDialog.getExistingDirectory(self, "Select Image Folder")
         if folder:
             self.folder_path = folder
+            self.detection_store = None
             self.btn_run_detection.setEnabled(True)
+            self.btn_watch.setEnabled(True)
             self.status_bar.showMessage(f"Selected folder: {folder}")
             self._toast.show_toast("Folder selected. Thumbnails loading…")
             self.load_thumbnails(folder)
@@ -489,118 +664,393 @@ class WhiteboardApp(QMainWindow):
         if folder:
             self.models_dir = folder
             self._populate_models()
-            self._toast.show_toast("Models list updated.")
+            self._toast.show_toast("Updating models list…")
 
     def _populate_models(self):
-        self.model_combo.clear()
-        pt_files = []
-        for root, _, files in os.walk(self.models_dir):
-            for f in files:
-                if f.lower().endswith('.pt'):
-                    pt_files.append(os.path.join(root, f))
-        pt_files.sort()
-        if not pt_files:
-            self.model_combo.addItem("No .pt models found", userData=None)
-            self.selected_model_path = None
+        if self._models_thread is not None:
             return
-        for path in pt_files:
+        # Walking the models folder can take a while on big project trees, so keep it off the UI thread
+        self._models_thread = QThread()
+        self._models_worker = ModelScanWorker(self.models_dir)
+        self._models_worker.moveToThread(self._models_thread)
+        self._models_thread.started.connect(self._models_worker.run)
+        self._models_worker.found.connect(self._on_models_found)
+        self._models_worker.found.connect(self._models_thread.quit)
+        self._models_worker.found.connect(self._models_worker.deleteLater)
+        self._models_thread.finished.connect(self._on_models_thread_finished)
+        self._models_thread.finished.connect(self._models_thread.deleteLater)
+        self._models_thread.start()
+
+    def _on_models_found(self, model_files):
+        self.model_combo.clear()
+        if not model_files:
+            self.model_combo.addItem("No .pt / .onnx models found", userData=None)
+        for path in model_files:
             display = os.path.relpath(path, self.models_dir)
             self.model_combo.addItem(display, userData=path)
-        self.model_combo.currentIndexChanged.connect(self._on_model_changed)
-        # Initialize selection
-        self._on_model_changed(self.model_combo.currentIndex())
+        if self._startup_timer is not None:
+            self._startup_timer.mark(f"listed {len(model_files)} models")
+
+    def _on_models_thread_finished(self):
+        self._models_thread.wait()
+        self._models_thread = None
+        self._models_worker = None
 
     def _on_model_changed(self, idx: int):
         data = self.model_combo.itemData(idx)
         self.selected_model_path = data if isinstance(data, str) else None
+        self._warm_up_selected_model()
+
+    # --- Load the selected model in the background so the first detection starts warm ---
+    def _warm_up_selected_model(self):
+        path = self.selected_model_path
+        if path is None or path == self._warm_model_path or self._warmup_thread is not None or not self.isVisible():
+            return
+        self._warmup_thread = QThread()
+        self._warmup_worker = WarmupWorker(path)
+        self._warmup_worker.moveToThread(self._warmup_thread)
+        self._warmup_thread.started.connect(self._warmup_worker.run)
+        self._warmup_worker.finished.connect(self._on_warmup_done)
+        self._warmup_worker.finished.connect(self._warmup_thread.quit)
+        self._warmup_worker.finished.connect(self._warmup_worker.deleteLater)
+        self._warmup_thread.finished.connect(self._on_warmup_thread_finished)
+        self._warmup_thread.finished.connect(self._warmup_thread.deleteLater)
+        self._warmup_thread.start()
+
+    def _on_warmup_done(self, model_path, seconds, error):
+        name = os.path.relpath(model_path, self.models_dir)
+        if error:
+            print(f"⚠️ Model warm-up failed for {name}: {error}")
+            return
+        self._warm_model_path = model_path
+        if self._startup_timer is not None:
+            self._startup_timer.mark(f"warmed up {name}")
+            # Only the first warm-up is part of startup
+            self._startup_timer = None
+        if not self._scanning and self._watch_thread is None:
+            self.status_bar.showMessage(f"✅ Model ready: {name} ({seconds:.1f}s)")
+
+    def _on_warmup_thread_finished(self):
+        # finished is emitted before the thread has fully exited; wait (without the GIL) so
+        # dropping the last reference does not block in the QThread destructor
+        self._warmup_thread.wait()
+        self._warmup_thread = None
+        self._warmup_worker = None
+        waiting, self._after_warmup = self._after_warmup, []
+        for thread in waiting:
+            thread.start()
+        # The selection may have changed while the previous model was loading
+        if not waiting:
+            self._warm_up_selected_model()
+
+    def _start_when_warm(self, thread):
+        """Start ``thread`` now, or once the running warm-up has finished with the model."""
+        if self._warmup_thread is not None:
+            self._after_warmup.append(thread)
+        else:
+            thread.start()
 
     # --- Load thumbnails into the grid ---
     def load_thumbnails(self, folder):
         self._cancel_thumbnail_loading()
-        self.thumbnail_list.clear()
+        self.thumbnail_model.clear()
+        self.thumbnail_model.set_confidences(None)
+        self._folder_paths = []
+        self._folder_listed = False
 
         # Reset action buttons when browsing
         self.btn_exclude_selected.setVisible(False)
         self.btn_move_all.setVisible(False)
+        self.organize_combo.setVisible(False)
         self.btn_exclude_selected.setEnabled(False)
         self.btn_move_all.setEnabled(False)
 
-        # Start background loading
-        self._thumb_thread = QThread()
-        self._thumb_worker = ThumbnailWorker()
-        self._thumb_worker.moveToThread(self._thumb_thread)
-        self._thumb_thread.started.connect(lambda: self._thumb_worker.load_from_folder(folder))
-        self._thumb_worker.imageLoaded.connect(self._on_thumbnail_loaded)
-        self._thumb_worker.finished.connect(self._thumb_thread.quit)
-        self._thumb_worker.finished.connect(self._thumb_worker.deleteLater)
-        self._thumb_thread.finished.connect(self._on_thumbnail_finished)
-        self._thumb_thread.finished.connect(self._thumb_thread.deleteLater)
-        self._thumb_thread.start()
-
-    # --- Run YOLO detection and show results ---
+        # List in the background; thumbnails are decoded as rows scroll into view
+        self._folder_lister = FolderLister(self)
+        self._folder_lister.pathsFound.connect(self._on_paths_listed)
+        self._folder_lister.finished.connect(self._on_thumbnail_finished)
+        self._folder_lister.list_folder(folder)
+
+    # --- Run YOLO detection in the background and show results as they arrive ---
     def run_detection(self):
-        if not self.folder_path:
+        if self._scanning:
+            # The button doubles as "Cancel" while a scan is running
+            self._detect_worker.stop()
+            self.btn_run_detection.setEnabled(False)
+            self.status_bar.showMessage("⏹ Cancelling detection...")
+            return
+        if not self.folder_path or self._detect_thread is not None or self._watch_thread is not None:
             return
+        from src.detection.result_store import FLOOR_CONFIDENCE, DetectionStore
+
+        self._cancel_thumbnail_loading()
+        self.thumbnail_model.clear()
+        self.detect_result = {"image_confidences": {}}
+        self.thumbnail_model.set_confidences(self.detect_result["image_confidences"])
+        self.detected_images = []
+        self.excluded_images = set()
+        self.detection_store = DetectionStore()
+        self.btn_exclude_selected.setVisible(True)
+        self.btn_move_all.setVisible(True)
+        self.organize_combo.setVisible(True)
+        self._set_scanning(True)
+
+        # Keep every box above the slider minimum so threshold changes never need a rescan
+        kwargs = self._detect_kwargs(FLOOR_CONFIDENCE)
+        # Thumbnails come out of the detector's own decode, so reviewing the results reads no photo twice
+        kwargs["thumbnail_size"] = THUMBNAIL_SIZE
+        kwargs["thumbnail_cache"] = thumbnail_cache()
+        self._cached_count = 0
+
         self.status_bar.showMessage("🚀 Running YOLO detection...")
-        self._overlay.show_overlay("Running detection…")
-        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        self._overlay.show_overlay("Loading model…")
+
+        self._detect_thread = QThread()
+        self._detect_worker = DetectionWorker(self.folder_path, kwargs)
+        self._detect_worker.moveToThread(self._detect_thread)
+        self._detect_thread.started.connect(self._detect_worker.run)
+        self._detect_worker.resultReady.connect(self._on_detection_result)
+        self._detect_worker.progress.connect(self._on_detection_progress)
+        self._detect_worker.failed.connect(self._on_detection_failed)
+        self._detect_worker.finished.connect(self._on_detection_finished)
+        self._detect_worker.finished.connect(self._detect_thread.quit)
+        self._detect_worker.finished.connect(self._detect_worker.deleteLater)
+        self._detect_thread.finished.connect(self._on_detection_thread_finished)
+        self._detect_thread.finished.connect(self._detect_thread.deleteLater)
+        self._start_when_warm(self._detect_thread)
+
+    def _detect_kwargs(self, conf_threshold):
+        kwargs = {
+            "conf_threshold": conf_threshold,
+            "batch_size": DETECTION_BATCH_SIZE,
+            "prefetch_workers": default_prefetch_workers(),
+            "reduced_decode": True,
+        }
+        if self.selected_model_path:
+            kwargs["model_path"] = self.selected_model_path
+        if self.cascade_checkbox.isChecked():
+            from src.detection.cascade import Cascade
+            kwargs["cascade"] = Cascade(self.classifier_path)
+        if self.dedup_checkbox.isChecked():
+            from src.detection.dedup import DuplicateFilter
+            kwargs["dedup"] = DuplicateFilter()
         try:
-            # Map slider value (10-95) to 0.10 - 0.95
-            conf_threshold = float(self.threshold_slider.value()) / 100.0
-            kwargs = {"conf_threshold": conf_threshold}
-            if self.selected_model_path:
-                kwargs["model_path"] = self.selected_model_path
-            self.detect_result = detect_whiteboards(self.folder_path, **kwargs)
-            self.detected_images = list(self.detect_result.get("detected_images", []))
-            self.excluded_images = set()
-            self.show_detected_thumbnails()
-            stats = self.detect_result.get("stats", {})
+            from src.detection.result_cache import get_result_cache
+            # Unchanged photos are answered from the on-disk cache instead of re-inferred
+            kwargs["cache"] = get_result_cache()
+        except Exception as e:
+            self.status_bar.showMessage(f"⚠️ Detection cache unavailable: {e}")
+        return kwargs
+
+    # --- Watch the folder and classify only newly added photos ---
+    def toggle_watch(self):
+        if self._watch_thread is not None:
+            self._watch_worker.stop()
+            self.btn_watch.setEnabled(False)
+            self.status_bar.showMessage("⏹ Stopping watch...")
+            return
+        if not self.folder_path or self._scanning:
+            return
+        # New photos are moved as soon as they are classified, at the current slider threshold
+        kwargs = self._detect_kwargs(self._conf_threshold())
+        self._set_watching(True)
+        self.status_bar.showMessage(
+            f"👀 Watching {self.folder_path} — new whiteboards are moved at {self.threshold_slider.value()}% confidence"
+        )
+
+        self._watch_thread = QThread()
+        self._watch_worker = WatchWorker(self.folder_path, kwargs)
+        self._watch_worker.moveToThread(self._watch_thread)
+        self._watch_thread.started.connect(self._watch_worker.run)
+        self._watch_worker.batchProcessed.connect(self._on_watch_batch)
+        self._watch_worker.photosAdded.connect(self._on_watch_photos)
+        self._watch_worker.failed.connect(self._on_watch_failed)
+        self._watch_worker.finished.connect(self._watch_thread.quit)
+        self._watch_worker.finished.connect(self._watch_worker.deleteLater)
+        self._watch_thread.finished.connect(self._on_watch_thread_finished)
+        self._watch_thread.finished.connect(self._watch_thread.deleteLater)
+        self._start_when_warm(self._watch_thread)
+
+    def _on_watch_batch(self, image_paths, result, moved):
+        found = len(result["detected_images"])
+        self.status_bar.showMessage(
+            f"👀 {len(image_paths)} new photos: {found} contain whiteboards, {moved} moved to 'Whiteboards'"
+        )
+        if moved:
+            self._toast.show_toast(f"Moved {moved} new whiteboard photos.")
+
+    def _on_watch_photos(self, filepaths):
+        # Only the folder view lists unclassified photos
+        if self._folder_listed:
+            self._folder_paths.extend(filepaths)
+        if not self.btn_exclude_selected.isVisible():
+            self.thumbnail_model.append_paths(filepaths)
+
+    def _on_watch_failed(self, message):
+        self.status_bar.showMessage(f"❌ Watch: {message}")
+
+    def _on_watch_thread_finished(self):
+        self._watch_thread = None
+        self._watch_worker = None
+        self._set_watching(False)
+        self.status_bar.showMessage("⏹ Stopped watching.")
+
+    def _set_watching(self, watching):
+        # Detection and the watcher share the model, so only one runs at a time
+        for widget in (self.btn_select_folder, self.btn_run_detection, self.btn_pick_models, self.model_combo):
+            widget.setEnabled(not watching)
+        self.cascade_checkbox.setEnabled(not watching and os.path.exists(self.classifier_path))
+        self.dedup_checkbox.setEnabled(not watching)
+        self.btn_watch.setEnabled(True)
+        self.btn_watch.setText("⏹ Stop Watching" if watching else "👀 Watch Folder")
+
+    def _cancel_watch(self):
+        if self._watch_worker is not None:
+            self._watch_worker.stop()
+        if self._watch_thread is not None:
+            self._watch_thread.quit()
+            self._watch_thread.wait()
+
+    def _on_detection_result(self, record):
+        if record.get("cached"):
+            self._cached_count += 1
+        self.detection_store.add(record)
+        if record["confidences"] and record["max_confidence"] >= self._conf_threshold():
+            self.detected_images.append(record["image_path"])
+            self.detect_result["image_confidences"][record["image_path"]] = record["max_confidence"]
+            if "thumbnail_image" in record:
+                self.thumbnail_model.add_thumbnail(record["image_path"], *record["thumbnail_image"])
+            self.thumbnail_model.append_paths([record["image_path"]])
+            self._update_action_buttons()
+
+    def _on_detection_progress(self, done, total, rate, eta):
+        if self._overlay.isVisible():
+            # Model is loaded and results are flowing; uncover the grid
+            self._overlay.hide_overlay()
+        self.detect_progress.setRange(0, max(total, 1))
+        self.detect_progress.setValue(done)
+        eta_text = f"{int(eta) // 60}:{int(eta) % 60:02d}" if rate > 0 else "--:--"
+        self.status_bar.showMessage(
+            f"🚀 Scanning {done}/{total} · {rate:.1f} img/s · ETA {eta_text} · "
+            f"{len(self.detected_images)} with whiteboards"
+        )
+
+    def _on_detection_failed(self, message):
+        self.status_bar.showMessage(f"❌ Detection failed: {message}")
+        self._toast.show_toast("Detection failed.")
+
+    def _on_detection_finished(self, result):
+        cancelled = self._detect_worker is not None and self._detect_worker.is_stopped()
+        self._overlay.hide_overlay()
+        self._set_scanning(False)
+        if result is None:
+            return
+        self.detect_result = self.detection_store.filter(self._conf_threshold())
+        self.detected_images = list(self.detect_result["detected_images"])
+        self.thumbnail_model.set_confidences(self.detect_result["image_confidences"])
+        stats = self.detect_result.get("stats", {})
+        if cancelled:
             self.status_bar.showMessage(
+                f"⏹ Detection cancelled after {stats.get('total_images', 0)} images: "
+                f"{stats.get('detected_count', 0)} contain whiteboards"
+            )
+            self._toast.show_toast("Detection cancelled.")
+        else:
+            message = (
                 f"✅ Detection complete: {stats.get('detected_count', 0)}/{stats.get('total_images', 0)} images contain whiteboards"
+                f" ({self._cached_count} from cache)"
             )
+            cascade = result["stats"].get("cascade")
+            if cascade:
+                classifier = cascade["classifier"]
+                message += (
+                    f" · classifier kept {classifier['accepted']}, dropped {classifier['rejected']},"
+                    f" detector ran on {cascade['detector']['images']}"
+                )
+            dedup = result["stats"].get("dedup")
+            if dedup:
+                message += f" · {dedup['inferences_saved']} near-duplicates skipped"
+            self.status_bar.showMessage(message)
             self._toast.show_toast("Detection complete.")
-        except Exception as e:
-            self.status_bar.showMessage(f"❌ Detection failed: {e}")
-            self._toast.show_toast("Detection failed.")
-        finally:
-            QApplication.restoreOverrideCursor()
-            self._overlay.hide_overlay()
+
+    def _conf_threshold(self):
+        # Map slider value (10-95) to 0.10 - 0.95
+        return float(self.threshold_slider.value()) / 100.0
+
+    def _on_threshold_changed(self, value):
+        self.threshold_value_label.setText(f"{value}%")
+        if self.detection_store is None or not self.btn_exclude_selected.isVisible():
+            return
+        self._apply_threshold()
+
+    def _apply_threshold(self):
+        """Re-filter stored detections at the slider threshold and patch the grid in place."""
+        self.detect_result = self.detection_store.filter(self._conf_threshold())
+        self.detected_images = list(self.detect_result["detected_images"])
+        self.thumbnail_model.set_confidences(self.detect_result["image_confidences"])
+        self.thumbnail_model.set_paths([p for p in self.detected_images if p not in self.excluded_images])
+        self._update_action_buttons()
+        if not self._scanning:
+            stats = self.detect_result["stats"]
+            self.status_bar.showMessage(
+                f"🎚️ {stats['detected_count']}/{stats['total_images']} images contain whiteboards "
+                f"at {self.threshold_slider.value()}% confidence"
+            )
+
+    def _on_detection_thread_finished(self):
+        self._detect_thread = None
+        self._detect_worker = None
+
+    def _set_scanning(self, scanning):
+        self._scanning = scanning
+        for widget in (self.btn_select_folder, self.btn_refresh, self.btn_pick_models, self.model_combo):
+            widget.setEnabled(not scanning)
+        self.cascade_checkbox.setEnabled(not scanning and os.path.exists(self.classifier_path))
+        self.dedup_checkbox.setEnabled(not scanning)
+        self.btn_watch.setEnabled(not scanning)
+        self.btn_run_detection.setEnabled(True)
+        self.btn_run_detection.setText("⏹ Cancel Detection" if scanning else "🚀 Run Detection")
+        self.detect_progress.setVisible(scanning)
+        if scanning:
+            # Indeterminate until the first progress report arrives
+            self.detect_progress.setRange(0, 0)
+        has_items = self.thumbnail_model.rowCount() > 0
+        self.btn_exclude_selected.setEnabled(not scanning and has_items)
+        self.btn_move_all.setEnabled(not scanning and has_items)
+
+    def _cancel_detection(self):
+        if self._detect_worker is not None:
+            self._detect_worker.stop()
+        if self._detect_thread is not None:
+            self._detect_thread.quit()
+            self._detect_thread.wait()
 
     def show_detected_thumbnails(self):
         self._cancel_thumbnail_loading()
-        self.thumbnail_list.clear()
-
-        filepaths = [p for p in self.detected_images if p not in self.excluded_images]
+        self.thumbnail_model.clear()
+        self.thumbnail_model.set_confidences(
+            self.detect_result.get("image_confidences") if isinstance(self.detect_result, dict) else None
+        )
+        self.thumbnail_model.append_paths([p for p in self.detected_images if p not in self.excluded_images])
 
-        # Show controls now; enable after first item arrives
         self.btn_exclude_selected.setVisible(True)
         self.btn_move_all.setVisible(True)
-        self.btn_exclude_selected.setEnabled(False)
-        self.btn_move_all.setEnabled(False)
-
-        self._thumb_thread = QThread()
-        self._thumb_worker = ThumbnailWorker()
-        self._thumb_worker.moveToThread(self._thumb_thread)
-        self._thumb_thread.started.connect(lambda: self._thumb_worker.load_from_files(filepaths))
-        self._thumb_worker.imageLoaded.connect(self._on_thumbnail_loaded)
-        self._thumb_worker.finished.connect(self._thumb_thread.quit)
-        self._thumb_worker.finished.connect(self._thumb_worker.deleteLater)
-        self._thumb_thread.finished.connect(self._on_thumbnail_finished)
-        self._thumb_thread.finished.connect(self._thumb_thread.deleteLater)
-        self._thumb_thread.start()
+        self.organize_combo.setVisible(True)
+        self._update_action_buttons()
 
     def exclude_selected(self):
-        selected_items = list(self.thumbnail_list.selectedItems())
-        if not selected_items:
+        selected_paths = self.thumbnail_list.selected_paths()
+        if not selected_paths:
             return
-        for item in selected_items:
-            path = item.data(Qt.ItemDataRole.UserRole)
-            self.excluded_images.add(path)
-        self.show_detected_thumbnails()
-        remaining = self.thumbnail_list.count()
-        self.status_bar.showMessage(f"🗂️ Excluded {len(selected_items)}. Remaining to move: {remaining}")
+        self.excluded_images.update(selected_paths)
+        self.thumbnail_model.remove_paths(selected_paths)
+        self._update_action_buttons()
+        remaining = self.thumbnail_model.rowCount()
+        self.status_bar.showMessage(f"🗂️ Excluded {len(selected_paths)}. Remaining to move: {remaining}")
 
     def move_detected(self):
+        from src.detection.detection_module import move_detected_images
+
         if not self.folder_path or not self.detected_images:
             return
         remaining = [p for p in self.detected_images if p not in self.excluded_images]
@@ -611,11 +1061,21 @@ class WhiteboardApp(QMainWindow):
         self._overlay.show_overlay("Moving images…")
         QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
         try:
-            moved = move_detected_images(remaining, self.folder_path)
+            mode = self.organize_combo.currentData()
+            moved = move_detected_images(remaining, self.folder_path, mode)
+            if mode != "move":
+                # Originals stay put, so keep reviewing; another click re-syncs the album
+                where = "album.txt" if mode == "manifest" else "'Whiteboards' folder"
+                self.status_bar.showMessage(f"🔗 {moved} images now in the {where}")
+                self._toast.show_toast(f"Organized {moved} images.")
+                return
             self.status_bar.showMessage(f"📦 Moved {moved} images to 'Whiteboards' folder")
             self._toast.show_toast(f"Moved {moved} images.")
-            # Refresh both the folder view and detected results
-            self.load_thumbnails(self.folder_path)
+            # Back to the folder view; only the moved files leave it, nothing is re-listed or re-decoded
+            gone = {p for p in remaining if not os.path.exists(p)}
+            self.thumbnail_model.forget(gone)
+            self._folder_paths = [p for p in self._folder_paths if p not in gone]
+            self.show_folder_thumbnails()
         except Exception as e:
             self.status_bar.showMessage(f"❌ Move failed: {e}")
             self._toast.show_toast("Move failed.")
@@ -623,39 +1083,62 @@ class WhiteboardApp(QMainWindow):
             QApplication.restoreOverrideCursor()
             self._overlay.hide_overlay()
 
-    def _on_thumbnail_loaded(self, filepath, image):
-        pixmap = QPixmap.fromImage(image)
-        filename = os.path.basename(filepath)
-        # Append confidence if available
-        conf_map = None
-        if isinstance(self.detect_result, dict):
-            conf_map = self.detect_result.get("image_confidences")
-        label_text = filename
-        if conf_map and filepath in conf_map:
-            conf_pct = int(round(conf_map[filepath] * 100))
-            label_text = f"{filename}\nConfidence: {conf_pct}%"
-        item = QListWidgetItem(QIcon(pixmap), label_text)
-        item.setData(Qt.ItemDataRole.UserRole, filepath)
-        self.thumbnail_list.addItem(item)
-
-        has_items = self.thumbnail_list.count() > 0
-        if self.btn_exclude_selected.isVisible():
+    def _on_organize_mode_changed(self):
+        labels = {
+            "move": "📦 Move Into Whiteboards ",
+            "link": "🔗 Link Into Whiteboards ",
+            "manifest": "📝 Save Whiteboards Album ",
+        }
+        self.btn_move_all.setText(labels[self.organize_combo.currentData()])
+
+    def _on_paths_listed(self, filepaths):
+        self._folder_paths.extend(filepaths)
+        self.thumbnail_model.append_paths(filepaths)
+        self._update_action_buttons()
+
+    def show_folder_thumbnails(self):
+        """Switch back to the folder view, reusing the last listing when it is complete."""
+        if not self._folder_listed:
+            self.load_thumbnails(self.folder_path)
+            return
+        self._cancel_thumbnail_loading()
+        self.thumbnail_model.clear()
+        self.thumbnail_model.set_confidences(None)
+        self.thumbnail_model.append_paths(self._folder_paths)
+        self.btn_exclude_selected.setVisible(False)
+        self.btn_move_all.setVisible(False)
+        self.organize_combo.setVisible(False)
+
+    def _update_action_buttons(self):
+        has_items = self.thumbnail_model.rowCount() > 0
+        if self.btn_exclude_selected.isVisible() and not self._scanning:
             self.btn_exclude_selected.setEnabled(has_items)
             self.btn_move_all.setEnabled(has_items)
 
     def _on_thumbnail_finished(self):
-        self._thumb_thread = None
-        self._thumb_worker = None
+        self._folder_lister.deleteLater()
+        self._folder_lister = None
+        self._folder_listed = True
 
     def _cancel_thumbnail_loading(self):
-        if self._thumb_worker is not None:
-            self._thumb_worker.stop()
-        if self._thumb_thread is not None:
-            self._thumb_thread.quit()
-            self._thumb_thread.wait(100)
+        if self._folder_lister is not None:
+            self._folder_lister.stop()
+            self._folder_lister.deleteLater()
+            self._folder_lister = None
 
     def closeEvent(self, event):
+        # A warm-up cannot be interrupted; let it finish, but start nothing after it
+        self._after_warmup = []
+        for thread in (self._warmup_thread, self._models_thread):
+            if thread is not None:
+                thread.quit()
+                thread.wait()
+        self._cancel_detection()
+        self._cancel_watch()
         self._cancel_thumbnail_loading()
+        self.thumbnail_model.clear()
+        # Let in-flight decodes finish before Qt tears the pool down
+        QThreadPool.globalInstance().waitForDone()
         super().closeEvent(event)
 
 
@@ -669,11 +1152,21 @@ class WhiteboardApp(QMainWindow):
         anim.setEndValue(1.0)
         anim.setEasingCurve(QEasingCurve.Type.OutCubic)
         anim.start()
+        # Runs once the first frame has been painted
+        QTimer.singleShot(0, self._after_first_paint)
+
+    def _after_first_paint(self):
+        if self._startup_timer is not None:
+            self._startup_timer.mark("first paint")
+        # Model listing, then warm-up of the selected model, happen in the background
+        self._populate_models()
 
     def refresh_images(self):
         if self.folder_path is None:
             self._toast.show_toast("No folder selected.")
             return
+        # Photos edited or replaced since they were shown get decoded again
+        self.thumbnail_model.drop_stale_thumbnails()
         # If detection results are showing (exclude/move buttons visible), refresh that view
         if self.btn_exclude_selected.isVisible():
             self.show_detected_thumbnails()
@@ -688,7 +1181,7 @@ if __name__ == "__main__":
     def launch_whiteboard_gui():
         existing = QApplication.instance()
         app = existing if existing is not None else QApplication(sys.argv)
-        window = WhiteboardApp()
+        window = WhiteboardApp(StartupTimer())
         window.run()
         return app.exec()
 
@@ -0,0 +1,525 @@
+import os
+import threading
+from collections import OrderedDict
+from PyQt6.QtWidgets import QListView, QAbstractItemView
+from PyQt6.QtGui import QPixmap, QImage, QImageReader, QColor
+from PyQt6.QtCore import (
+    Qt, QSize, QObject, pyqtSignal, QThreadPool, QTimer, QBuffer, QIODevice, QAbstractListModel, QModelIndex, QPoint
+)
+
+from src.detection.scanner import iter_image_files
+from src.detection.thumbnail_cache import get_thumbnail_cache
+
+THUMBNAIL_SIZE = 150
+# Decoded thumbnails and listed paths are handed to the UI in batches at most this often
+THUMBNAIL_DELIVERY_MS = 50
+# Decoded pixmaps kept in memory; off-screen ones are evicted least recently used first
+DEFAULT_PIXMAP_BUDGET = 256 * 1024 * 1024
+
+_thumbnail_cache_failed = False
+
+
+def thumbnail_cache():
+    """Shared on-disk thumbnail cache, or None when the cache directory is unusable."""
+    global _thumbnail_cache_failed
+    if _thumbnail_cache_failed:
+        return None
+    try:
+        return get_thumbnail_cache()
+    except OSError as e:
+        _thumbnail_cache_failed = True
+        print(f"⚠️ Thumbnail cache unavailable: {e}")
+        return None
+
+
+def _encode_thumbnail(image):
+    buffer = QBuffer()
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    # Photos compress far better as JPEG; keep PNG for images with transparency
+    if image.hasAlphaChannel():
+        image.save(buffer, "PNG")
+    else:
+        image.save(buffer, "JPG", 90)
+    return bytes(buffer.data())
+
+
+def read_thumbnail_image(path, width, height):
+    cache = thumbnail_cache()
+    if cache is not None:
+        data = cache.get(path, (width, height))
+        if data is not None:
+            image = QImage.fromData(data)
+            if not image.isNull():
+                return image
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    # Compute scaled size while keeping aspect ratio
+    size = reader.size()
+    if size.isValid() and not size.isEmpty():
+        # QSize.scaled in PyQt6 does not accept a TransformationMode; provide only aspect ratio mode
+        scaled = size.scaled(width, height, Qt.AspectRatioMode.KeepAspectRatio)
+        reader.setScaledSize(scaled)
+    image = reader.read()
+    if image.isNull():
+        return None
+    if cache is not None:
+        cache.put(path, (width, height), _encode_thumbnail(image))
+    return image
+
+
+def file_signature(path):
+    """(mtime, size) of ``path``, or None if it is gone."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class _PoolJob:
+    """State shared between one batching QObject and the pool threads working for it."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stopped = False
+        self.results = []
+        self.done = False
+
+
+class FolderLister(QObject):
+    """
+    Lists a folder's images on ``QThreadPool.globalInstance()``.
+
+    Paths are handed to the UI in folder order, as lists collected by a timer
+    every ``THUMBNAIL_DELIVERY_MS``, so a big folder does not flood the event
+    loop. ``stop()`` abandons the listing.
+    """
+    pathsFound = pyqtSignal(list)
+    finished = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._job = _PoolJob()
+        self._timer = QTimer(self)
+        self._timer.setInterval(THUMBNAIL_DELIVERY_MS)
+        self._timer.timeout.connect(self._deliver)
+
+    def stop(self):
+        with self._job.lock:
+            self._job.stopped = True
+        self._timer.stop()
+
+    def list_folder(self, folder):
+        self._timer.start()
+        QThreadPool.globalInstance().start(lambda: self._list(self._job, folder))
+
+    @staticmethod
+    def _list(job, folder):
+        for path in iter_image_files(folder):
+            with job.lock:
+                if job.stopped:
+                    return
+                job.results.append(path)
+        with job.lock:
+            job.done = True
+
+    def _deliver(self):
+        with self._job.lock:
+            batch, self._job.results = self._job.results, []
+            done = self._job.done
+        if batch:
+            self.pathsFound.emit(batch)
+        if done:
+            self._timer.stop()
+            self.finished.emit()
+
+
+class ThumbnailDecoder(QObject):
+    """
+    Decodes requested thumbnails on ``QThreadPool.globalInstance()`` (one thread per core).
+
+    Results arrive as lists of (path, QImage or None, file signature) every
+    ``THUMBNAIL_DELIVERY_MS``; the signature is the (mtime, size) the image was decoded at.
+    Each task first asks ``is_wanted(path)`` and skips images that scrolled out
+    of range while queued; skipped paths that are wanted again are re-queued.
+    """
+    imagesDecoded = pyqtSignal(list)
+
+    def __init__(self, is_wanted, parent=None):
+        super().__init__(parent)
+        self._is_wanted = is_wanted
+        self._job = _PoolJob()
+        self._pending = set()
+        self._timer = QTimer(self)
+        self._timer.setInterval(THUMBNAIL_DELIVERY_MS)
+        self._timer.timeout.connect(self._deliver)
+
+    def request(self, paths):
+        pool = QThreadPool.globalInstance()
+        for path in paths:
+            if path not in self._pending:
+                self._pending.add(path)
+                # Bind the job now: after stop() swaps it, queued tasks must see theirs as stopped
+                pool.start(lambda path=path, job=self._job: self._decode(job, self._is_wanted, path))
+        if self._pending and not self._timer.isActive():
+            self._timer.start()
+
+    def stop(self):
+        """Abandon every queued and running request."""
+        with self._job.lock:
+            self._job.stopped = True
+        self._job = _PoolJob()
+        self._pending.clear()
+        self._timer.stop()
+
+    @staticmethod
+    def _decode(job, is_wanted, path):
+        if job.stopped:
+            return
+        if not is_wanted(path):
+            with job.lock:
+                job.results.append((path, False, None))
+            return
+        signature = file_signature(path)
+        image = read_thumbnail_image(path, THUMBNAIL_SIZE, THUMBNAIL_SIZE)
+        with job.lock:
+            job.results.append((path, image, signature))
+
+    def _deliver(self):
+        with self._job.lock:
+            results, self._job.results = self._job.results, []
+        decoded = []
+        retry = []
+        for path, image, signature in results:
+            self._pending.discard(path)
+            if image is not False:
+                decoded.append((path, image, signature))
+            elif self._is_wanted(path):
+                # Came back into range after the task skipped it
+                retry.append(path)
+        if retry:
+            self.request(retry)
+        if decoded:
+            self.imagesDecoded.emit(decoded)
+        if not self._pending:
+            self._timer.stop()
+
+
+class PixmapCache:
+    """
+    LRU of decoded thumbnails bounded by their pixel memory.
+
+    Keyed by path; each entry remembers the file signature it was decoded at
+    so ``stale_paths`` can tell which files changed on disk since.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_PIXMAP_BUDGET):
+        self.max_bytes = int(max_bytes)
+        self._pixmaps = OrderedDict()
+        self._bytes = 0
+
+    @staticmethod
+    def _size(pixmap):
+        return pixmap.width() * pixmap.height() * max(1, pixmap.depth() // 8)
+
+    def get(self, path):
+        entry = self._pixmaps.get(path)
+        if entry is None:
+            return None
+        self._pixmaps.move_to_end(path)
+        return entry[0]
+
+    def put(self, path, pixmap, signature=None):
+        self.discard(path)
+        self._pixmaps[path] = (pixmap, signature)
+        self._bytes += self._size(pixmap)
+        while self._bytes > self.max_bytes and len(self._pixmaps) > 1:
+            _, (evicted, _) = self._pixmaps.popitem(last=False)
+            self._bytes -= self._size(evicted)
+
+    def discard(self, path):
+        entry = self._pixmaps.pop(path, None)
+        if entry is not None:
+            self._bytes -= self._size(entry[0])
+
+    def stale_paths(self):
+        """Cached paths whose file was modified, replaced or removed since it was decoded."""
+        return [path for path, (_, signature) in self._pixmaps.items() if file_signature(path) != signature]
+
+    def clear(self):
+        self._pixmaps.clear()
+        self._bytes = 0
+
+    def resident_bytes(self):
+        return self._bytes
+
+    def __len__(self):
+        return len(self._pixmaps)
+
+
+class ThumbnailModel(QAbstractListModel):
+    """
+    Image paths shown in the thumbnail grid.
+
+    Rows are plain paths; thumbnails are decoded only when a row is painted or
+    lies within one screen of the visible rows (see ``set_visible_rows``), and
+    kept in a ``PixmapCache`` so scrolling a huge folder never holds more than
+    the budget in memory. The cache outlives the rows: switching between the
+    folder and detection views, or re-listing a folder, reuses every thumbnail
+    still cached and only decodes new or changed files. Labels show the filename plus the confidence from the
+    mapping given to ``set_confidences``. The path is exposed as ``UserRole``.
+    """
+
+    def __init__(self, parent=None, pixmap_cache=None):
+        super().__init__(parent)
+        self._paths = []
+        self._rows = {}
+        self._confidences = {}
+        self._pixmaps = pixmap_cache if pixmap_cache is not None else PixmapCache()
+        self._wanted = (0, -1)
+        self._decoder = ThumbnailDecoder(self._is_wanted, self)
+        self._decoder.imagesDecoded.connect(self._on_images_decoded)
+        self._placeholder = QPixmap(THUMBNAIL_SIZE, THUMBNAIL_SIZE)
+        self._placeholder.fill(QColor(255, 255, 255, 10))
+
+    # --- Qt model interface ---
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._paths)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._paths):
+            return None
+        path = self._paths[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            filename = os.path.basename(path)
+            confidence = self._confidences.get(path)
+            if confidence is None:
+                return filename
+            return f"{filename}\nConfidence: {int(round(confidence * 100))}%"
+        if role == Qt.ItemDataRole.DecorationRole:
+            pixmap = self._pixmaps.get(path)
+            if pixmap is None:
+                # Being painted, so it is visible: decode it now
+                self._decoder.request([path])
+                return self._placeholder
+            return pixmap
+        if role == Qt.ItemDataRole.UserRole:
+            return path
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return path
+        return None
+
+    # --- rows ---
+    def paths(self):
+        return list(self._paths)
+
+    def path(self, row):
+        return self._paths[row]
+
+    def clear(self):
+        """Remove every row; decoded thumbnails stay cached for the next rows shown."""
+        self.beginResetModel()
+        self._paths = []
+        self._rows = {}
+        self._decoder.stop()
+        self._wanted = (0, -1)
+        self.endResetModel()
+
+    def append_paths(self, paths):
+        paths = [p for p in paths if p not in self._rows]
+        if not paths:
+            return
+        start = len(self._paths)
+        self.beginInsertRows(QModelIndex(), start, start + len(paths) - 1)
+        for offset, path in enumerate(paths):
+            self._rows[path] = start + offset
+        self._paths.extend(paths)
+        self.endInsertRows()
+
+    def set_paths(self, paths):
+        """
+        Make the rows equal ``paths`` by removing and inserting row ranges,
+        so selection, scroll position and decoded thumbnails of kept rows survive.
+        """
+        keep = set(paths)
+        row = len(self._paths) - 1
+        while row >= 0:
+            if self._paths[row] in keep:
+                row -= 1
+                continue
+            end = row
+            while row > 0 and self._paths[row - 1] not in keep:
+                row -= 1
+            self._remove_rows(row, end)
+            row -= 1
+        current = set(self._paths)
+        if self._paths != [p for p in paths if p in current]:
+            # Kept rows changed order; rebuild (decoded thumbnails are kept)
+            self.beginResetModel()
+            self._paths = list(paths)
+            self.endResetModel()
+        else:
+            start = 0
+            while start < len(paths):
+                if paths[start] in current:
+                    start += 1
+                    continue
+                end = start
+                while end < len(paths) and paths[end] not in current:
+                    end += 1
+                self.beginInsertRows(QModelIndex(), start, end - 1)
+                self._paths[start:start] = paths[start:end]
+                self.endInsertRows()
+                start = end
+        self._reindex()
+
+    def remove_paths(self, paths):
+        rows = sorted((self._rows[p] for p in set(paths) if p in self._rows), reverse=True)
+        for row in rows:
+            self._remove_rows(row, row)
+        if rows:
+            self._reindex()
+
+    def _remove_rows(self, first, last):
+        # Callers re-run _reindex once they are done removing
+        self.beginRemoveRows(QModelIndex(), first, last)
+        del self._paths[first:last + 1]
+        self.endRemoveRows()
+
+    def _reindex(self):
+        self._rows = {path: row for row, path in enumerate(self._paths)}
+
+    # --- labels ---
+    def set_confidences(self, confidences):
+        """Show ``confidences`` ({path: max confidence}) under the filenames; None hides them."""
+        self._confidences = confidences if confidences is not None else {}
+        if self._paths:
+            self.dataChanged.emit(self.index(0), self.index(len(self._paths) - 1),
+                                  [Qt.ItemDataRole.DisplayRole])
+
+    def confidences(self):
+        return self._confidences
+
+    # --- thumbnails ---
+    def set_visible_rows(self, first, last):
+        """Decode the visible rows plus one screen above and below; queued decodes outside are skipped."""
+        if last < first:
+            self._wanted = (0, -1)
+            return
+        margin = last - first + 1
+        first = max(0, first - margin)
+        last = min(len(self._paths) - 1, last + margin)
+        self._wanted = (first, last)
+        self._decoder.request([p for p in self._paths[first:last + 1] if self._pixmaps.get(p) is None])
+
+    def forget(self, paths):
+        """Drop cached thumbnails of ``paths`` (e.g. files that were moved away)."""
+        for path in paths:
+            self._pixmaps.discard(path)
+
+    def drop_stale_thumbnails(self):
+        """
+        Forget thumbnails of files changed on disk since they were decoded and
+        repaint their rows.
+
+        Returns:
+            int: Number of thumbnails dropped
+        """
+        stale = self._pixmaps.stale_paths()
+        self.forget(stale)
+        for path in stale:
+            row = self._rows.get(path)
+            if row is not None:
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+        return len(stale)
+
+    def add_thumbnail(self, path, image, signature):
+        """Use ``image``, decoded elsewhere (e.g. by the detection pipeline), as the thumbnail of ``path``."""
+        self._on_images_decoded([(path, image, signature)])
+
+    def _is_wanted(self, path):
+        # Called from pool threads; a stale answer only costs one decode or one re-request
+        row = self._rows.get(path)
+        first, last = self._wanted
+        return row is not None and first <= row <= last
+
+    def _on_images_decoded(self, decoded):
+        for path, image, signature in decoded:
+            if image is None:
+                # Unreadable: keep the placeholder instead of retrying on every paint
+                self._pixmaps.put(path, self._placeholder, signature)
+            else:
+                self._pixmaps.put(path, QPixmap.fromImage(image), signature)
+            row = self._rows.get(path)
+            if row is None:
+                continue
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+    def resident_bytes(self):
+        return self._pixmaps.resident_bytes()
+
+
+class ThumbnailView(QListView):
+    """Icon grid over a ``ThumbnailModel`` that tells the model which rows are on screen."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setViewMode(QListView.ViewMode.IconMode)
+        self.setIconSize(QSize(THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setMovement(QListView.Movement.Static)
+        # Every cell has the same size, so layout never asks off-screen rows for their data
+        self.setUniformItemSizes(True)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self._visible_timer = QTimer(self)
+        self._visible_timer.setSingleShot(True)
+        self._visible_timer.setInterval(30)
+        self._visible_timer.timeout.connect(self._report_visible_rows)
+        self.verticalScrollBar().valueChanged.connect(self._schedule_visible_rows)
+
+    def setModel(self, model):
+        super().setModel(model)
+        for signal in (model.rowsInserted, model.rowsRemoved, model.modelReset):
+            signal.connect(self._schedule_visible_rows)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._schedule_visible_rows()
+
+    def _schedule_visible_rows(self, *args):
+        self._visible_timer.start()
+
+    def visible_rows(self):
+        """(first, last) rows intersecting the viewport, or (0, -1) when none are."""
+        if self.model() is None or self.model().rowCount() == 0:
+            return 0, -1
+        rect = self.viewport().rect()
+        # Two lines per edge, so an edge falling in the spacing between rows still hits a cell
+        gap = self.spacing() + 1
+        first = self._row_on_line((rect.top(), rect.top() + gap), range(rect.left(), rect.right() + 1, 8))
+        if first is None:
+            return 0, -1
+        last = self._row_on_line((rect.bottom(), rect.bottom() - gap), range(rect.right(), rect.left() - 1, -8))
+        if last is None:
+            # Nothing at the bottom edge: the grid ends inside the viewport
+            last = self.model().rowCount() - 1
+        return first, max(first, last)
+
+    def _row_on_line(self, ys, xs):
+        """Row of the first cell hit along the horizontal lines ``ys``, probing at ``xs``; None if none."""
+        for y in ys:
+            for x in xs:
+                index = self.indexAt(QPoint(x, y))
+                if index.isValid():
+                    return index.row()
+        return None
+
+    def _report_visible_rows(self):
+        model = self.model()
+        if isinstance(model, ThumbnailModel):
+            model.set_visible_rows(*self.visible_rows())
+
+    def selected_paths(self):
+        return [index.data(Qt.ItemDataRole.UserRole) for index in self.selectionModel().selectedRows()]
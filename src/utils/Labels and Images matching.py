@@ -1,13 +1,21 @@
 import os
+import sys
 import shutil
 from pathlib import Path
 
+# Add the project root to Python path so we can import from src.detection
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.detection.scanner import iter_image_files
+
 def move_matching_text_files(images_folder, labels_folder):
     """
     Find all image files in the images folder, then search for matching text files
     in the labels folder and move them to the images folder.
     
-    Supported image formats: .jpg, .jpeg, .png, .bmp, .tiff
+    Supported image formats: see IMAGE_EXTENSIONS in src/detection/scanner.py
     Text files should have the same base name as the image files.
     
     Args:
@@ -27,14 +35,8 @@ def move_matching_text_files(images_folder, labels_folder):
     if not labels_path.exists():
         raise FileNotFoundError(f"Labels folder not found: {labels_folder}")
     
-    # Supported image extensions
-    image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif'}
-    
-    # Find all image files
-    image_files = []
-    for file_path in images_path.iterdir():
-        if file_path.is_file() and file_path.suffix.lower() in image_extensions:
-            image_files.append(file_path)
+    # Find all image files (labels are matched next to the images, so stay at the top level)
+    image_files = [Path(p) for p in iter_image_files(images_path, recursive=False)]
     
     print(f"🔍 Found {len(image_files)} image files in {images_folder}")
     
@@ -1,10 +1,18 @@
 import os
+import sys
 import cv2
 import numpy as np
-import shutil
 from ultralytics import YOLO
 from pathlib import Path
 
+# Add the project root to Python path so we can import from src.detection
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.detection.organizer import organize_files
+from src.detection.scanner import iter_image_files
+
 current_dir = Path(__file__).parent
 project_dir = current_dir.parent.parent
 
@@ -30,25 +38,18 @@ def move_detected_images_to_whiteboards_folder(detected_image_paths, source_fold
     """
     # Create Whiteboards folder path
     whiteboards_folder = os.path.join(source_folder, "Whiteboards")
+    print(f"\n📁 Moving into Whiteboards folder: {whiteboards_folder}")
     
-    # Create the Whiteboards folder if it doesn't exist
-    os.makedirs(whiteboards_folder, exist_ok=True)
-    print(f"\n📁 Created/verified Whiteboards folder: {whiteboards_folder}")
-    
-    moved_count = 0
-    for image_path in detected_image_paths:
-        try:
-            # Get just the filename from the full path
-            filename = os.path.basename(image_path)
-            destination_path = os.path.join(whiteboards_folder, filename)
-            
-            # Move the file
-            shutil.move(image_path, destination_path)
-            print(f"   ✅ Moved: {filename}")
-            moved_count += 1
-            
-        except Exception as e:
-            print(f"   ❌ Failed to move {os.path.basename(image_path)}: {str(e)}")
+    # Journaled moves: same-named files are never overwritten and an interrupted run resumes next time
+    result = organize_files(detected_image_paths, whiteboards_folder)
+    for src, dst in result["moved"]:
+        if src in result["renamed"]:
+            print(f"   ✅ Moved: {os.path.basename(src)} (as {os.path.basename(dst)})")
+        else:
+            print(f"   ✅ Moved: {os.path.basename(src)}")
+    for src, error in result["failed"]:
+        print(f"   ❌ Failed to move {os.path.basename(src)}: {error}")
+    moved_count = len(result["moved"])
     
     print(f"\n📊 Successfully moved {moved_count} out of {len(detected_image_paths)} detected images to Whiteboards folder")
     return moved_count
@@ -66,58 +67,57 @@ print("WHITEBOARD DETECTION ACCURACY REPORT")
 print("=" * 80)
 
 # Iterate over all images in the folder
-for filename in os.listdir(IMAGE_FOLDER):
-    if filename.lower().endswith((".jpg", ".jpeg", ".png", ".bmp")):
-        total_images += 1
-        image_path = os.path.join(IMAGE_FOLDER, filename)
-        
-        # Run prediction
-        results = model.predict(image_path, conf=CONF_THRESHOLD, verbose=False)
+for image_path in iter_image_files(IMAGE_FOLDER):
+    filename = os.path.basename(image_path)
+    total_images += 1
+    
+    # Run prediction
+    results = model.predict(image_path, conf=CONF_THRESHOLD, verbose=False)
+    
+    # Get image dimensions for relative coordinates
+    img = cv2.imread(image_path)
+    if img is not None:
+        img_height, img_width = img.shape[:2]
+    else:
+        img_width, img_height = 640, 640  # fallback dimensions
+    
+    # Check if at least one whiteboard was detected
+    detections = len(results[0].boxes)
+    if detections > 0:
+        detected_count += 1
+        total_detections += detections
+        detected_images.append(image_path)  # Add to detected images list
         
-        # Get image dimensions for relative coordinates
-        img = cv2.imread(image_path)
-        if img is not None:
-            img_height, img_width = img.shape[:2]
-        else:
-            img_width, img_height = 640, 640  # fallback dimensions
+        print(f"\n📸 {filename}")
+        print(f"   ✅ Detections: {detections}")
         
-        # Check if at least one whiteboard was detected
-        detections = len(results[0].boxes)
-        if detections > 0:
-            detected_count += 1
-            total_detections += detections
-            detected_images.append(image_path)  # Add to detected images list
+        # Display details for each detection
+        for i, box in enumerate(results[0].boxes):
+            conf = float(box.conf[0])
+            confidence_scores.append(conf)
             
-            print(f"\n📸 {filename}")
-            print(f"   ✅ Detections: {detections}")
+            # Get bounding box coordinates (xyxy format)
+            x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
             
-            # Display details for each detection
-            for i, box in enumerate(results[0].boxes):
-                conf = float(box.conf[0])
-                confidence_scores.append(conf)
-                
-                # Get bounding box coordinates (xyxy format)
-                x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                
-                # Convert to relative coordinates
-                rel_x1 = x1 / img_width
-                rel_y1 = y1 / img_height
-                rel_x2 = x2 / img_width
-                rel_y2 = y2 / img_height
-                
-                # Calculate bounding box area
-                bbox_area = (x2 - x1) * (y2 - y1)
-                rel_area = bbox_area / (img_width * img_height)
-                
-                print(f"   🎯 Detection {i+1}:")
-                print(f"      Confidence: {conf:.3f}")
-                print(f"      Coordinates: ({x1:.0f}, {y1:.0f}, {x2:.0f}, {y2:.0f})")
-                print(f"      Relative: ({rel_x1:.3f}, {rel_y1:.3f}, {rel_x2:.3f}, {rel_y2:.3f})")
-                print(f"      Area: {bbox_area:.0f} pixels ({rel_area:.1%} of image)")
-        else:
-            undetected_images.append(filename)
-            print(f"\n📸 {filename}")
-            print(f"   ❌ No whiteboards detected")
+            # Convert to relative coordinates
+            rel_x1 = x1 / img_width
+            rel_y1 = y1 / img_height
+            rel_x2 = x2 / img_width
+            rel_y2 = y2 / img_height
+            
+            # Calculate bounding box area
+            bbox_area = (x2 - x1) * (y2 - y1)
+            rel_area = bbox_area / (img_width * img_height)
+            
+            print(f"   🎯 Detection {i+1}:")
+            print(f"      Confidence: {conf:.3f}")
+            print(f"      Coordinates: ({x1:.0f}, {y1:.0f}, {x2:.0f}, {y2:.0f})")
+            print(f"      Relative: ({rel_x1:.3f}, {rel_y1:.3f}, {rel_x2:.3f}, {rel_y2:.3f})")
+            print(f"      Area: {bbox_area:.0f} pixels ({rel_area:.1%} of image)")
+    else:
+        undetected_images.append(filename)
+        print(f"\n📸 {filename}")
+        print(f"   ❌ No whiteboards detected")
 
 # Move detected images to Whiteboards folder
 if detected_images:
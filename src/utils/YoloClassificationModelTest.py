@@ -1,8 +1,16 @@
 import os
-import shutil
+import sys
 from pathlib import Path
 from ultralytics import YOLO
 
+# Add the project root to Python path so we can import from src.detection
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.detection.organizer import organize_files
+from src.detection.scanner import iter_image_files
+
 def classify_and_organize_whiteboards(
     photos_folder, 
     model_path, 
@@ -42,15 +50,11 @@ def classify_and_organize_whiteboards(
         whiteboards_folder = photos_path / "whiteboards"
         whiteboards_folder.mkdir(exist_ok=True)
         print(f"📁 Created whiteboards folder: {whiteboards_folder}")
+    # Moved together after classification, through the journaled organizer
+    whiteboard_paths = []
     
-    # Supported image extensions
-    image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif', '.webp'}
-    
-    # Find all image files
-    image_files = []
-    for file_path in photos_path.iterdir():
-        if file_path.is_file() and file_path.suffix.lower() in image_extensions:
-            image_files.append(file_path)
+    # Find all image files (recursively, skipping the whiteboards output folder)
+    image_files = [Path(p) for p in iter_image_files(photos_path)]
     
     print(f"🔍 Found {len(image_files)} image files to process")
     print(f"🎯 Confidence threshold: {confidence_threshold}")
@@ -89,10 +93,8 @@ def classify_and_organize_whiteboards(
                 whiteboard_files.append(image_file.name)
                 
                 if create_whiteboard_folder:
-                    # Move to whiteboards folder
-                    dest_path = whiteboards_folder / image_file.name
-                    shutil.move(str(image_file), str(dest_path))
-                    print(f"   ✅ WHITEBOARD DETECTED → Moved to whiteboards folder")
+                    whiteboard_paths.append(str(image_file))
+                    print("   ✅ WHITEBOARD DETECTED → Queued for whiteboards folder")
                 else:
                     print(f"   ✅ WHITEBOARD DETECTED → Keeping in place")
             else:
@@ -105,6 +107,18 @@ def classify_and_organize_whiteboards(
             error_files.append(image_file.name)
             print(f"   ⚠️  ERROR processing {image_file.name}: {str(e)}")
     
+    if whiteboard_paths:
+        organized = organize_files(whiteboard_paths, whiteboards_folder)
+        for src, dst in organized["renamed"].items():
+            print(f"   ⚠️  {Path(src).name} already in whiteboards folder → moved as {Path(dst).name}")
+        for src, error in organized["failed"]:
+            # Still in place, so counted as an error rather than a whiteboard in the folder
+            whiteboard_count -= 1
+            whiteboard_files.remove(Path(src).name)
+            error_count += 1
+            error_files.append(Path(src).name)
+            print(f"   ⚠️  ERROR moving {Path(src).name}: {error}")
+    
     # Print summary
     print("\n" + "=" * 60)
     print("📊 CLASSIFICATION SUMMARY")